@@ -1 +1,46 @@
+"""
+qcspgen: QCSP instance generator. The submodules are imported on first use, e.g., ``from qcspgen import Instance``
+only imports ``qcspgen.qcspgen`` and its dependencies (python 3.7+, older versions import them all at once).
+"""
+from __future__ import absolute_import
+import importlib
+import sys
+
 __author__ = 'Chen Jiang Hang'
+__version__ = '0.2'
+
+# public name -> submodule defining it
+_EXPORTS = {
+    "Instance": "qcspgen",
+    "generate_benchmark": "qcspgen",
+    "Vessel": "vessel",
+    "Bay": "bay",
+    "Task": "task",
+    "TaskPool": "task",
+    "Quay": "quay",
+    "QC": "qc",
+    "QCSPGenException": "qcspgen_exception",
+    "AsyncWriter": "writer",
+    "Relation": "relation",
+    "Simulator": "simulator",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+if sys.version_info < (3, 7):
+    # no module __getattr__ (PEP 562)
+    for _name in _EXPORTS:
+        __getattr__(_name)
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 
 
-from qcspgen_exception import QCSPGenException
+from .qcspgen_exception import QCSPGenException
 import functools
 
 
@@ -29,7 +29,7 @@ class Aggregator(object):
         a = Aggregator(str)
         a.append("hello")
         a.append("world")
-        print a.aggregator, a.item_type
+        print(a.aggregation, a.item_type)
 
     :param item_kind: the item type for aggregator's elements
     """
@@ -48,6 +48,23 @@ class Aggregator(object):
         """
         self._aggregation.append(item)
 
+    def extend(self, items):
+        """
+        to add a batch of items for an aggregator, the item types are verified once for the whole batch
+
+        :param items: an iterable of items to be appended
+        :exception: QCSPGenException if any item is not of the item type, in which case no item is added
+        :return: None
+        """
+        self._aggregation.extend(self._verify_batch(items))
+
+    def _verify_batch(self, items):
+        # the batch counterpart of the _verify_type decorator
+        items = list(items)
+        if not all(isinstance(item, self.item_type) for item in items):
+            raise QCSPGenException("- typeError: item is not type {}".format(self.item_type))
+        return items
+
     @_verify_type
     def remove(self, item):
         """
@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+from . import checker
+from . import compat
+from . import sampling
+import math
+import multiprocessing
+
+
+def _processing_times(rng, n, b, c, f):
+    # same cut point construction as Vessel._create_tasks, sorted by decreasing processing time
+    handling_volume = int(f * b * c)
+    cut_points = [(i+1)*c for i in range(handling_volume // c)]
+    cut_points.append(handling_volume)
+    drawn = set(cut_points)
+    while len(cut_points) < n:
+        cut = rng.randint(1, handling_volume - 1)
+        if cut not in drawn:
+            drawn.add(cut)
+            cut_points.append(cut)
+    cut_points.insert(0, 0)
+    cut_points.sort()
+    return sorted((cut_points[i+1] - cut_points[i] for i in range(n)), reverse=True)
+
+
+def _means(rng, b, pattern):
+    # same as Vessel.set_mean
+    if pattern == "cl1":
+        return rng.randint(1, b), -1
+    elif pattern == "cl2":
+        mean1 = rng.randint(1, b)
+        return mean1, mean1 - b // 2 if mean1 > b // 2 else mean1 + b // 2
+    return -1, -1
+
+
+# bays drawn per sample_batch call, the draws of consecutive replications are batched up to this many
+BATCH = 1 << 16
+
+
+def _bay_sampler(b, pattern, means, std):
+    # the exact bay distribution of Vessel.bay_sampler, which the rejection sampler of Vessel draws from as well. Its
+    # uniform draws are the ones of randint(1, b)
+    if pattern == "uni":
+        return sampling.InverseCDFSampler([1.0] * b)
+    weights = sampling.truncated_normal_weights(b, means[0], std)
+    if pattern == "cl2":
+        weights = [(w1 + w2) / 2 for w1, w2 in zip(weights, sampling.truncated_normal_weights(b, means[1], std))]
+    return sampling.InverseCDFSampler(weights)
+
+
+def _place(processing_times, draws, b, c):
+    """
+    same bay selection as Vessel._distribute_tasks on plain lists: a task goes to its drawn bay, or to the nearest bay
+    with enough remaining capacity, searching alternately above and below
+
+    :return: per bay (1-based) the number of tasks and the workload
+    """
+    remaining = [c] * (b + 1)
+    count = [0] * (b + 1)
+    for p, selected in zip(processing_times, draws):
+        bay = selected
+        if remaining[bay] < p:
+            bay = None
+            up = down = True
+            step = 1
+            while step <= b:
+                if up and selected + step <= b:
+                    if remaining[selected + step] >= p:
+                        bay = selected + step
+                        break
+                else:
+                    up = False
+                if down and selected - step > 0:
+                    if remaining[selected - step] >= p:
+                        bay = selected - step
+                        break
+                else:
+                    down = False
+                step += 1
+            if bay is None:
+                continue
+        remaining[bay] -= p
+        count[bay] += 1
+    return count[1:], [c - r for r in remaining[1:]]
+
+
+def _replicate(args):
+    """
+    to run a chunk of replications and to return its accumulators: sums and sums of squares of the per bay count and
+    workload, and per bay histograms of counts and of binned workloads
+    """
+    seed, replications, n, b, c, f, pattern, std, means, fixed_tasks, bins = args
+    rng = compat.Random(seed)
+    sums = dict((key, [[0.0] * b, [0.0] * b]) for key in ("count", "workload"))
+    histograms = {"count": [{} for _ in range(b)], "workload": [[0] * bins for _ in range(b)]}
+    # one sampler per pair of means, there are at most b of them if the means are drawn for every replication
+    samplers = {}
+
+    def sampler(key):
+        if key not in samplers:
+            samplers[key] = _bay_sampler(b, pattern, key, std * b)
+        return samplers[key]
+
+    tasks = _processing_times(rng, n, b, c, f) if fixed_tasks else None
+    # the bays of a block of replications are drawn at once if their distribution does not change
+    fixed = pattern == "uni" or means is not None
+    block = max(1, BATCH // n) if fixed else 1
+    done = 0
+    while done < replications:
+        size = min(block, replications - done)
+        if fixed:
+            bays = sampler(tuple(means or _means(rng, b, pattern))).sample_batch(rng, n * size)
+        for x in range(size):
+            processing_times = tasks or _processing_times(rng, n, b, c, f)
+            draws = bays[x*n:(x+1)*n] if fixed else sampler(_means(rng, b, pattern)).sample_batch(rng, n)
+            count, workload = _place(processing_times, draws, b, c)
+            for key, values in (("count", count), ("workload", workload)):
+                s, s2 = sums[key]
+                for y, v in enumerate(values):
+                    s[y] += v
+                    s2[y] += v * v
+            for y in range(b):
+                histograms["count"][y][count[y]] = histograms["count"][y].get(count[y], 0) + 1
+                histograms["workload"][y][min(bins - 1, workload[y] * bins // c)] += 1
+        done += size
+    return sums, histograms
+
+
+def _z_value(confidence):
+    # two-sided standard normal quantile by bisection on erf
+    lb, ub = 0.0, 10.0
+    for _ in range(100):
+        z = (lb + ub) / 2
+        if math.erf(z / math.sqrt(2)) < confidence:
+            lb = z
+        else:
+            ub = z
+    return (lb + ub) / 2
+
+
+@checker.func_arg_check(n=checker.Rule("number of tasks", "int", "(0,inf)"),
+                        b=checker.Rule("number of bays", "int", "(0,inf)"),
+                        c=checker.Rule("capacity per bay", "int", "(0,inf)"),
+                        f=checker.Rule("handling rate", "float", "[0,1]"),
+                        loc=checker.Rule("task bay distribution pattern", "str", "(uni, cl1, cl2)"),
+                        replications=checker.Rule("number of replications", "int", "(0,inf)"),
+                        sampler=checker.Rule("bay sampler", "str", "(rejection, inverse_cdf)"),
+                        bins=checker.Rule("number of workload histogram bins", "int", "[1,inf)"),
+                        confidence=checker.Rule("confidence level", "float", "(0,1)"))
+def monte_carlo(n, b, c, f, loc, replications, std=0.25, means=None, sampler="rejection", fixed_tasks=False, seed=None,
+                bins=10, confidence=0.95, processes=None):
+    """
+    to estimate, per bay, the distribution of the number of tasks and of the workload that the vessel generator
+    produces. The tasks are sampled and distributed as ``Vessel`` does but on plain lists, without building Vessel,
+    Bay or Task objects, and the replications are split over a process pool. The bays are drawn in batches by the
+    exact samplers of ``sampling``, see ``Vessel.bay_sampler``.
+
+    :param n: number of tasks
+    :param b: number of bays
+    :param c: capacity per bay
+    :param f: handling rate
+    :param loc: task bay distribution pattern, one of uni, cl1, cl2
+    :param replications: number of replications
+    :param std: standard deviation for task distribution as a fraction of the number of bays, see ``Vessel``
+    :param means: fixed means for task distribution, by default drawn for every replication, see ``Vessel.set_mean``
+    :param sampler: bay sampler of ``Vessel``, one of rejection, inverse_cdf. Both draw from the same distribution,
+        so the study draws with inverse_cdf for either.
+    :param fixed_tasks: if True, the same tasks are distributed in every replication
+    :param seed: seed of the replications, the result is reproducible for a given seed and number of processes
+    :param bins: number of workload histogram bins
+    :param confidence: confidence level of the intervals
+    :param processes: the number of worker processes, default is the number of CPUs
+    :return: dict with, for 'count' and 'workload', the per bay 'mean', 'ci' (confidence intervals) and 'histogram'.
+        Count histograms map a number of tasks to its frequency, workload histograms count the replications per bin
+        of width c/bins.
+    """
+    if n > int(f * b * c):
+        raise QCSPGenException("- n=%d tasks cannot be cut from a handling volume of %d" % (n, int(f * b * c)))
+    processes = processes or multiprocessing.cpu_count()
+    seed = compat.Random(seed).randint(0, 2 ** 31)
+    chunks = [(seed + k, replications // processes + (1 if k < replications % processes else 0), n, b, c, f,
+               loc.lower(), std, means, fixed_tasks, bins) for k in range(processes)]
+    chunks = [chunk for chunk in chunks if chunk[1] > 0]
+
+    if len(chunks) > 1:
+        pool = multiprocessing.Pool(len(chunks))
+        try:
+            results = pool.map(_replicate, chunks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_replicate(chunk) for chunk in chunks]
+
+    z = _z_value(confidence)
+    study = {"replications": replications}
+    for key in ("count", "workload"):
+        s = [sum(r[0][key][0][x] for r in results) for x in range(b)]
+        s2 = [sum(r[0][key][1][x] for r in results) for x in range(b)]
+        mean = [v / replications for v in s]
+        std_error = [math.sqrt(max(0.0, v2 / replications - m * m) / max(1, replications - 1))
+                     for v2, m in zip(s2, mean)]
+        if key == "count":
+            histogram = [{} for _ in range(b)]
+            for r in results:
+                for x in range(b):
+                    for k, v in r[1][key][x].items():
+                        histogram[x][k] = histogram[x].get(k, 0) + v
+        else:
+            histogram = [[sum(r[1][key][x][y] for r in results) for y in range(bins)] for x in range(b)]
+        study[key] = {"mean": mean, "ci": [(m - z * e, m + z * e) for m, e in zip(mean, std_error)],
+                      "histogram": histogram}
+    return study
+
+
+if __name__ == "__main__":
+    pass
@@ -1,10 +1,10 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from qcspgen_exception import QCSPGenException
-from task import Task
-from aggregator import Aggregator
-import checker
+from .qcspgen_exception import QCSPGenException
+from .task import Task
+from .aggregator import Aggregator
+from . import checker
 
 
 class Bay(Aggregator):
@@ -23,12 +23,13 @@ class Bay(Aggregator):
     :param index: the index of a bay
     """
 
-    @checker.func_arg_check
+    @checker.func_arg_check(capacity=checker.Rule("bay capacity", "int", "(0,inf)"),
+                            index=checker.Rule("index of a bay", "int", "[1,inf)"))
     def __init__(self, capacity, index):
         """
         init function of bay
-        :param capacity: prefix:``bay capacity`` with type:``int`` in range:``(0,inf)``
-        :param index: prefix:``index of a bay``with type:``int``in range:``[1,inf)``
+        :param capacity: bay capacity, int in (0, inf)
+        :param index: index of a bay, int in [1, inf)
         :return: None
         """
         super(Bay, self).__init__(Task)
@@ -51,6 +52,25 @@ class Bay(Aggregator):
             if self.__remaining_capacity < 0:
                 raise QCSPGenException("- the remaining capacity of a bay must be non-negative!")
 
+    def extend(self, tasks):
+        """
+        overridden method for Aggregator ``extend``, to append a batch of tasks into a bay. The types and the capacity
+        are checked once for the whole batch and the tasks' locations are set without re-validating the bay index.
+
+        :param tasks: an iterable of tasks
+        :exception: QCSPGenException if the tasks exceed the remaining capacity, in which case no task is added
+        :return: None
+        """
+        tasks = self._verify_batch(tasks)
+        workload = sum(t.processing_time for t in tasks)
+        if self.__remaining_capacity < workload:
+            raise QCSPGenException("- the remaining capacity of a bay must be non-negative!")
+        self.aggregation.extend(tasks)
+        for t in tasks:
+            t.place(self.__index)
+        self.__remaining_capacity -= workload
+        self.__aggregate_task_processing_time += workload
+
     def remove(self, *args):
         """
         overridden method for Aggregator ``remove``, to remove a list of tasks from a bay
@@ -0,0 +1,224 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import multiprocessing
+import json
+import os
+from . import reader
+
+
+CATALOG = "bounds.catalog.json"
+
+
+def _workload_bound(p, r):
+    """
+    smallest C such that the QCs, available from their ready times on, offer enough time, i.e.,
+    sum_k max(0, C - r_k) >= sum_i p_i. Without ready times this is the total workload divided by q.
+    """
+    total = sum(p)
+    if not total:
+        return 0.0
+    ready = sorted(r)
+    accumulated = 0
+    for m, rk in enumerate(ready):
+        accumulated += rk
+        bound = float(total + accumulated) / (m + 1)
+        if m + 1 == len(ready) or bound <= ready[m+1]:
+            return bound
+    return float(total)
+
+
+def _heads_and_tails(d, p, arrival):
+    """
+    longest paths through Phi in one forward and one backward pass over a topological order. The head of a task is
+    its earliest start: its predecessors' heads plus processing times `p`, but not before any QC can reach its bay.
+    The tail is the processing time of its successors.
+    """
+    n = d["n"]
+    successors = [[] for _ in range(n + 1)]
+    in_degree = [0] * (n + 1)
+    for i, j in d["Phi"]:
+        successors[i].append(j)
+        in_degree[j] += 1
+
+    order = [i for i in range(1, n + 1) if in_degree[i] == 0]
+    for i in order:
+        for j in successors[i]:
+            in_degree[j] -= 1
+            if in_degree[j] == 0:
+                order.append(j)
+    if len(order) < n:
+        raise QCSPGenException("- precedence set is not acyclic!")
+
+    p = [0] + list(p)
+    head = [0] + [arrival[l] for l in d["l"]]
+    tail = [0] * (n + 1)
+    for i in order:
+        for j in successors[i]:
+            head[j] = max(head[j], head[i] + p[i])
+    for i in reversed(order):
+        for j in successors[i]:
+            tail[i] = max(tail[i], p[j] + tail[j])
+    return head[1:], tail[1:]
+
+
+def lower_bounds(instance):
+    r"""
+    to compute makespan lower bounds of an instance in O(n + \|Phi\| + b*q):
+
+    * `workload`: total workload divided by q, corrected for QC ready times
+    * `bay`: the maximal bay workload, since only one QC can work in a bay at a time
+    * `bay_travel`: the bay workload plus the earliest time a QC can reach the bay from its initial location
+    * `critical_path`: the longest chain through Phi (heads and tails), starting when a QC can reach the chain's bay
+    * `lower_bound`: the maximum of all the above
+
+    With handling efficiencies, every task is counted with its processing time on the fastest QC, p / max(e).
+
+    :param instance: an Instance object or a dict of instance data
+    :exception: QCSPGenException if Phi is not acyclic
+    :return: dict name -> bound
+    """
+    d = reader.as_data(instance)
+    pt = reader.processing_times(d)
+    fastest = pt[min(range(d["q"]), key=lambda k: pt.scale[k])]
+    bay_workload = [0] * (d["b"] + 1)
+    for p, l in zip(fastest, d["l"]):
+        bay_workload[l] += p
+
+    # earliest time a QC can reach a bay, travelling from its initial location after its ready time
+    arrival = [min(r + t * abs(l0 - bay) for r, l0, t in zip(d["r"], d["l0"], d["t"])) for bay in range(d["b"] + 1)]
+
+    head, tail = _heads_and_tails(d, fastest, arrival)
+    bounds = {
+        "workload": _workload_bound(fastest, d["r"]),
+        "bay": max(bay_workload[1:]),
+        "bay_travel": max(arrival[bay] + w for bay, w in enumerate(bay_workload) if bay > 0 and w > 0)
+        if any(bay_workload) else 0,
+        "critical_path": max([h + p + t for h, p, t in zip(head, fastest, tail)] or [0])
+    }
+    bounds["lower_bound"] = max(bounds.values())
+    return bounds
+
+
+def _file_bounds(filename):
+    try:
+        return filename, lower_bounds(reader.read(filename))
+    except reader.FILE_ERRORS as e:
+        return filename, {"error": getattr(e, "message", None) or str(e)}
+
+
+def update_catalog(directory, entries):
+    """
+    to merge lower bounds into the catalog file ``CATALOG`` of a directory
+
+    :param directory: the directory of the instance files
+    :param entries: dict instance file name -> bounds
+    :return: None
+    """
+    filename = os.path.join(directory, CATALOG)
+    catalog = {}
+    if os.path.exists(filename):
+        with open(filename) as f:
+            catalog = json.load(f)
+    catalog.update(entries)
+    temporary = "%s.%d.tmp" % (filename, os.getpid())
+    try:
+        with open(temporary, "w") as f:
+            json.dump(catalog, f, indent=1, sort_keys=True)
+        if os.name == "nt" and os.path.exists(filename):
+            os.remove(filename)
+        # readers never see a partially written catalog
+        os.rename(temporary, filename)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+class Catalog(object):
+    """
+    lower bounds of a batch of instances of one directory, which are merged into its catalog file ``CATALOG`` at
+    once, instead of rewriting the catalog for every instance, for example:
+    ::
+
+        with Catalog(path) as catalog:
+            for k, instance in enumerate(instances):
+                instance.generate(path, "QCSP_%d.json" % k, style="json", lower_bounds=catalog)
+
+    :param directory: the directory of the instance files
+    """
+
+    def __init__(self, directory="."):
+        self.directory = directory
+        self.entries = {}
+
+    def add(self, name, bounds):
+        """
+        to record the lower bounds of an instance file, see ``lower_bounds()``
+
+        :param name: the instance file name within the directory
+        :param bounds: dict name -> bound
+        :return: None
+        """
+        self.entries[name] = bounds
+
+    def write(self):
+        """
+        to merge the recorded lower bounds into the catalog file, see ``update_catalog()``
+
+        :return: None
+        """
+        if self.entries:
+            update_catalog(self.directory, self.entries)
+            self.entries = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        # the bounds of the instances generated so far are kept
+        self.write()
+
+
+def read_catalog(directory):
+    """
+    to read the lower bounds catalog of a directory
+
+    :param directory: the directory of the instance files
+    :return: dict instance file name -> bounds
+    """
+    with open(os.path.join(directory, CATALOG)) as f:
+        return json.load(f)
+
+
+def annotate(paths, processes=None):
+    """
+    to compute the lower bounds of all instance files of the given files/directories with a process pool, and to store
+    them in the catalog of the directory each file is in
+
+    :param paths: a file/directory name or a list of them
+    :param processes: the number of worker processes, default is the number of CPUs
+    :return: dict filename -> bounds
+    """
+    files = reader.find(paths)
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = dict(pool.map(_file_bounds, files,
+                                chunksize=max(1, len(files) // (4 * (processes or multiprocessing.cpu_count())))))
+    finally:
+        pool.close()
+        pool.join()
+
+    directories = {}
+    for filename, b in results.items():
+        directory, name = os.path.split(filename)
+        directories.setdefault(directory, {})[name] = b
+    for directory, entries in directories.items():
+        update_catalog(directory, entries)
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    annotate(sys.argv[1:] or ".")
@@ -2,11 +2,10 @@
 # -*- coding: utf-8 -*-
 
 
-from qcspgen_exception import QCSPGenException
+from .qcspgen_exception import QCSPGenException
+from . import compat
 import re
-import inspect
 import functools
-import itertools
 
 
 def verify_type(data, t, prefix=""):
@@ -66,7 +65,7 @@ def verify_numerical_type(data, t=(int, float), lb=0.0, ub=float('inf'), prefix=
         message += "- %s not in range (%.1f, %.1f]" % (prefix, lb, ub)
     elif not left_tight and not right_tight and not lb < data < ub:
         message += "- %s not in range (%.1f, %.1f)" % (prefix, lb, ub)
-    if message is not "":
+    if message != "":
         raise QCSPGenException(message)
 
     return data
@@ -99,13 +98,13 @@ class Interval(object):
     right_symbol = ')'
 
     # left symbol, left interval value, right interval value, right symbol
-    DIGIT_PATTERN = re.compile(r'([[(])(.*),(.*)([])])')
+    DIGIT_PATTERN = re.compile(r'([\[(])(.*),(.*)([\])])')
 
     def __init__(self, doc):
         self.left_symbol, a, b, self.right_symbol = Interval.DIGIT_PATTERN.search(doc.strip()).groups()
-        if self.left_symbol is '[':
+        if self.left_symbol == '[':
             self.left_tight = True
-        if self.right_symbol is ']':
+        if self.right_symbol == ']':
             self.right_tight = True
         try:
             self.left = float(a)
@@ -131,25 +130,97 @@ class Interval(object):
             return False
         return True
 
+    def compile(self):
+        """
+        to compile the interval into a function, which is faster than ``check_range()``
+
+        :return: function data -> True if data is in the interval
+        """
+        left, right = self.left, self.right
+        if self.left_tight and self.right_tight:
+            return lambda data: left <= data <= right
+        elif self.left_tight:
+            return lambda data: left <= data < right
+        elif self.right_tight:
+            return lambda data: left < data <= right
+        return lambda data: left < data < right
+
     def __str__(self):
         return ''.join([self.left_symbol, '%.1f, %.1f' % (self.left, self.right), self.right_symbol])
 
 
-class ArgElement(object):
+class Rule(object):
+    """
+    compiled check of one argument: its type and its range. Rules are either declared explicitly, e.g.,
+    ``Rule("task index", "int", "(0,inf)")``, or parsed from a docstring by ``ArgElement``.
+
+    :param prefix: the description of the argument used in error messages
+    :param types: the accepted type names, e.g., "int, float" or ["int", "float"]. float also accepts int.
+    :param data_range: the accepted range, an interval like "[0, inf)" for numerical types, otherwise a tuple of \
+    choices like "(uni, cl1, cl2)"
+    """
+
+    def __init__(self, prefix="", types=None, data_range=None):
+        super(Rule, self).__init__()
+        self.prefix = prefix
+        self.type = Rule.split(types) if isinstance(types, str) else types
+        self.range = data_range
+        if isinstance(data_range, str):
+            self.range = Interval(data_range) if self.is_numeric() else Rule.split(data_range.strip()[1:-1])
+        self._compile()
+
+    def _compile(self):
+        # the accepted type names as a set, and the range as a membership test
+        self.__names = None
+        if self.type:
+            self.__names = frozenset(self.type) | (frozenset(("int",)) if "float" in self.type else frozenset())
+        self.__in_range = None
+        if isinstance(self.range, Interval):
+            self.__in_range = self.range.compile()
+        elif self.range:
+            choices = frozenset(self.range)
+            self.__in_range = choices.__contains__
+
+    @staticmethod
+    def split(t):
+        return [a.strip() for a in t.split(',')]
+
+    def is_numeric(self):
+        if 'int' in self.type or 'float' in self.type:
+            return True
+        return False
+
+    def check(self, data):
+        """
+        to check a value against the rule
+
+        :param data: the value to be checked
+        :return: the error message, empty if the value is valid
+        """
+        if self.__names is not None and type(data).__name__ not in self.__names:
+            # a range cannot be compared to a value of another type
+            return "- data {} should be {}\n".format(self.prefix, self.type)
+        if self.__in_range is not None and not self.__in_range(data):
+            return "- %s not in range %s\n" % (self.prefix, self.range)
+        return ""
+
+    def __str__(self):
+        return ' '.join([self.prefix, str(self.type), str(self.range)])
+
+
+class ArgElement(Rule):
     """
     class to analyze docstring of functions/classes in order to make sure variable prefix/range/type are correct.
     For example, ':param index: prefix:``index of a bay``with type:``int``in range:``[1,inf)``' is an element of
     _ArgElement, which needs to be checked in functions
     """
     name = None
-    prefix = ""
-    type = None
-    range = None
     to_consider = True
 
     PATTERN_TEMPLATE = r':param {0}:.*{1}:``(.*?)``'
 
     def __init__(self, name, doc):
+        super(ArgElement, self).__init__()
         prefix_pattern = re.compile(ArgElement.PATTERN_TEMPLATE.format(name, 'prefix'))
         range_pattern = re.compile(ArgElement.PATTERN_TEMPLATE.format(name, 'range'))
         type_pattern = re.compile(ArgElement.PATTERN_TEMPLATE.format(name, 'type'))
@@ -176,65 +247,73 @@ class ArgElement(object):
 
         if self.type is None and self.range is None:
             self.to_consider = False
-
-    @staticmethod
-    def split(t):
-        return [a.strip() for a in t.split(',')]
-
-    def is_numeric(self):
-        if 'int' in self.type or 'float' in self.type:
-            return True
-        return False
+        self._compile()
 
     def __str__(self):
         return ' '.join([self.name, ':', self.prefix, str(self.type), str(self.range)])
 
 
-def func_arg_check(func):
-    """
-    a decoration function to do argument properties check!
-    Note that if docstring of func is empty then no checking will be conducted.
-
-    :param func: function
-    :return: a wrapper
-    """
-
-    doc_str = func.__doc__
-
+def _parse_docstring(doc_str):
+    # argument name -> ArgElement for the documented arguments with a type or a range
     arg_elements = dict()
     for m in re.compile(r':param (.*?):').findall(doc_str):
         b = ArgElement(m, doc_str)
         if b.to_consider:
             arg_elements.update({m: b})
+    return arg_elements
+
+
+def _compile(func, rules):
+    """
+    to compile the rules of a function into a list of (name, position, has default, rule): the position of the
+    argument in positional calls (None for keyword only arguments and kwargs) and whether it has a default value
+    """
+    argspec = compat.getargspec(func)
+    with_default = argspec.args[len(argspec.args) - len(argspec.defaults or ()):]
+    return [(name, argspec.args.index(name) if name in argspec.args else None, name in with_default, rule)
+            for name, rule in sorted(rules.items())]
+
+
+def func_arg_check(func=None, **rules):
+    """
+    a decoration function to do argument properties check! The rules are either given explicitly, e.g.,
+    ::
+
+        @checker.func_arg_check(value=checker.Rule("task index", "int", "(0,inf)"))
+        def f(value):
+            pass
+
+    or, by using the decorator without arguments, parsed from the docstring of func. Note that if docstring of func is
+    empty then no checking will be conducted. The rules are compiled at the first call of func, so that decorating
+    (i.e., importing) is cheap, and explicit rules never need the docstring to be parsed. Arguments that are not given
+    and fall back to their default values are not checked.
+
+    :param func: function
+    :param rules: argument name -> Rule
+    :return: a wrapper, or a decorator if func is not given
+    """
+    if func is None:
+        return lambda f: func_arg_check(f, **rules)
+
+    # compiled rules, filled at the first call
+    compiled = []
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        if not compiled:
+            compiled.append(_compile(func, rules or _parse_docstring(func.__doc__ or "")))
         message = ""
-        argspect = inspect.getargspec(func)
-        for a in arg_elements.iterkeys():
-            try:
-                data = args[argspect.args.index(a)]
-            except (ValueError, IndexError):
-                try:
-                    data = kwargs[a]
-                except KeyError:
-                    try:
-                        # it's value may appear as default
-                        used_defaults = argspect.defaults[len(argspect.defaults)-len(argspect.args)+len(args):]
-                        data = list(itertools.chain(args, used_defaults))[argspect.args.index(a)]
-                    except:
-                        raise QCSPGenException("- Compulsory kwarg %s is missing!" % a)
-
-            if arg_elements[a].type:
-                if not('float' in arg_elements[a].type and type(data).__name__ in ('float', 'int') or
-                        type(data).__name__ in arg_elements[a].type):
-                    message += "- data {} should be {}\n".format(arg_elements[a].prefix, arg_elements[a].type)
-
-            if arg_elements[a].range:
-                if (arg_elements[a].is_numeric() and not arg_elements[a].range.check_range(data)) or \
-                        (not arg_elements[a].is_numeric() and data not in arg_elements[a].range):
-                    message += "- %s not in range %s\n" % (arg_elements[a].prefix, arg_elements[a].range)
-        if message is not "":
+        for name, position, has_default, rule in compiled[0]:
+            if position is not None and position < len(args):
+                data = args[position]
+            elif name in kwargs:
+                data = kwargs[name]
+            elif has_default:
+                continue
+            else:
+                raise QCSPGenException("- Compulsory kwarg %s is missing!" % name)
+            message += rule.check(data)
+        if message != "":
             raise QCSPGenException(message)
         return func(*args, **kwargs)
     return wrapper
@@ -0,0 +1,217 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+from .qcspgen_exception import QCSPGenException
+import argparse
+import os
+import sys
+
+
+EXTENSION = {"opl": ".txt", "json": ".json"}
+
+
+def _number(text):
+    # ints stay ints, so that e.g. travel times are written as 1 and not as 1.0
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _generate(args):
+    from .qcspgen import Instance
+    from .writer import AsyncWriter
+    grid = {"n": args.n, "b": args.b, "c": args.c, "f": args.f, "d": args.d, "g": args.g, "loc": args.loc,
+            "q": args.q, "t": args.t, "ready_time": args.ready_time, "safety_margin": args.safety_margin}
+    grid = dict((k, v[0] if len(v) == 1 else v) for k, v in grid.items())
+    if args.output == "-":
+        # instances go one after the other to stdout, e.g., into a solver's stdin
+        counter = 0
+        for counter, (_, _, text) in enumerate(Instance.iter_generate(grid, args.seed, style=args.style, phi=args.phi,
+                                                                      workers=args.workers), 1):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        print("%d instances generated" % counter, file=sys.stderr)
+        return 0
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+
+    with AsyncWriter(threads=args.threads) as writer:
+        for counter, (params, seed, text) in enumerate(Instance.iter_generate(grid, args.seed, style=args.style,
+                                                                              phi=args.phi, workers=args.workers)):
+            name = args.name.format(counter=counter + 1, seed=seed, **params) + EXTENSION[args.style]
+            writer.submit(os.path.join(args.output, name), text)
+    print("%d instance files generated in %s" % (writer.statistics["files"], args.output))
+    return 0
+
+
+def _benchmark(args):
+    from .qcspgen import generate_benchmark
+    from .writer import AsyncWriter
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+    current = os.getcwd()
+    os.chdir(args.output)
+    try:
+        with AsyncWriter(threads=args.threads) as writer:
+            generate_benchmark(writer=writer)
+    finally:
+        os.chdir(current)
+    print("%d instance files generated in %s" % (writer.statistics["files"], args.output))
+    return 0
+
+
+def _validate(args):
+    from . import validator
+    report = validator.validate_corpus(args.paths, processes=args.processes)
+    for name in sorted(report):
+        for v in report[name]:
+            print("%s: [%s] %s" % (name, v.kind, v.message))
+    invalid = sum(1 for v in report.values() if v)
+    print("%d files checked, %d invalid" % (len(report), invalid))
+    return 1 if invalid else 0
+
+
+def _bounds(args):
+    from . import bounds
+    results = bounds.annotate(args.paths, processes=args.processes)
+    for name in sorted(results):
+        print("%s: %r" % (name, results[name].get("lower_bound", results[name].get("error"))))
+    return 0
+
+
+def _solve(args):
+    from . import heuristic
+    results = heuristic.solve_corpus(args.paths, processes=args.processes)
+    for name in sorted(results):
+        print("%s: %r" % (name, results[name]))
+    return 1 if any(makespan is None for makespan in results.values()) else 0
+
+
+def _dedup(args):
+    from . import fingerprint
+    clusters = fingerprint.duplicates(args.paths, processes=args.processes)
+    for cluster in clusters:
+        print(" ".join(cluster))
+    print("%d clusters of equivalent instances" % len(clusters))
+    return 1 if clusters else 0
+
+
+def _run(args):
+    from . import harness
+    try:
+        results = harness.run_corpus(args.solver, args.paths, results=args.results, processes=args.processes,
+                                     timeout=args.timeout, objective=args.objective or harness.OBJECTIVE,
+                                     affinity=not args.no_affinity)
+    except KeyboardInterrupt:
+        print("interrupted, run the same command again to resume", file=sys.stderr)
+        return 130
+    statuses = {}
+    for row in results.values():
+        statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+    print("%d runs in %s: %s" % (len(results), args.results,
+                                 ", ".join("%d %s" % (statuses[k], k) for k in sorted(statuses))))
+    return 0 if set(statuses) <= {"ok"} else 1
+
+
+def _serve(args):
+    from .service import InstanceService
+    service = InstanceService(args.host, args.port, cache_size=args.cache_size, cache_dir=args.cache_dir,
+                              workers=args.workers, timeout=args.timeout, quiet=args.quiet)
+    print("serving instances on http://%s:%d" % service.address, file=sys.stderr)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def parser():
+    """
+    to build the command line parser of the ``qcspgen`` command
+
+    :return: an argparse.ArgumentParser
+    """
+    p = argparse.ArgumentParser(prog="qcspgen", description="QCSP instance generator")
+    commands = p.add_subparsers(dest="command")
+    commands.required = True
+
+    g = commands.add_parser("generate", help="generate the instances of a parameter grid, a parameter given several "
+                                             "values is varied")
+    g.add_argument("-n", type=int, nargs="+", required=True, help="number of tasks")
+    g.add_argument("-b", type=int, nargs="+", required=True, help="number of bays")
+    g.add_argument("-c", type=int, nargs="+", required=True, help="capacity per bay")
+    g.add_argument("-f", type=_number, nargs="+", default=[0.5], help="handling rate")
+    g.add_argument("-d", type=_number, nargs="+", default=[1.0], help="precedence density")
+    g.add_argument("-g", type=_number, nargs="+", default=[0.0], help="non-simultaneity density")
+    g.add_argument("--loc", nargs="+", default=["uni"], choices=("uni", "cl1", "cl2"),
+                   help="task bay distribution pattern")
+    g.add_argument("-q", type=int, nargs="+", required=True, help="number of QCs")
+    g.add_argument("-t", type=_number, nargs="+", default=[1], help="QC travel time per bay")
+    g.add_argument("--ready-time", type=_number, nargs="+", default=[0], help="QC ready time")
+    g.add_argument("-s", "--safety-margin", type=int, nargs="+", default=[1], help="safety margin")
+    g.add_argument("--seed", type=int, nargs="+", default=[1], help="random number seeds, one instance per seed")
+    g.add_argument("--style", default="json", choices=("opl", "json"), help="output file style")
+    g.add_argument("--phi", default="raw", choices=("raw", "reduced", "closed"), help="form of the precedence set")
+    g.add_argument("--name", default="QCSP_{counter}",
+                   help="file name pattern without extension, e.g., QCSP_{n}_{b}_{seed}")
+    g.add_argument("-o", "--output", default=".", help="output directory, - to write the instances to stdout")
+    g.add_argument("--workers", type=int, default=0, help="number of generator processes")
+    g.add_argument("--threads", type=int, default=1, help="number of writer threads")
+    g.set_defaults(run=_generate)
+
+    b = commands.add_parser("benchmark", help="generate the benchmark sets A-G")
+    b.add_argument("-o", "--output", default=".", help="output directory")
+    b.add_argument("--threads", type=int, default=1, help="number of writer threads")
+    b.set_defaults(run=_benchmark)
+
+    for name, run, text in (("validate", _validate, "validate instance files"),
+                            ("bounds", _bounds, "compute makespan lower bounds into the bounds catalogs"),
+                            ("solve", _solve, "solve instance files with the reference heuristic"),
+                            ("dedup", _dedup, "find instance files that only differ by task labels within bays")):
+        c = commands.add_parser(name, help=text)
+        c.add_argument("paths", nargs="*", default=["."], help="instance files or directories")
+        c.add_argument("--processes", type=int, default=None, help="number of worker processes")
+        c.set_defaults(run=run)
+
+    r = commands.add_parser("run", help="run a solver on instance files, runs already in the results table are skipped")
+    r.add_argument("solver", help="solver command, {instance} is replaced by the instance file name, otherwise the "
+                                  "instance is written to the solver's stdin")
+    r.add_argument("paths", nargs="*", default=["."], help="instance files or directories")
+    r.add_argument("--results", default="results.csv", help="csv file of the results table")
+    r.add_argument("--timeout", type=float, default=None, help="time limit per run in seconds")
+    r.add_argument("--objective", default=None, help="regular expression of the objective value in the solver output")
+    r.add_argument("--processes", type=int, default=None, help="number of solvers run at the same time")
+    r.add_argument("--no-affinity", action="store_true", help="do not pin every solver run to one CPU")
+    r.set_defaults(run=_run)
+
+    s = commands.add_parser("serve", help="serve instances over HTTP, e.g., GET /instance?n=10&b=10&c=200&q=2&seed=1")
+    s.add_argument("--host", default="127.0.0.1", help="host name or address to listen on")
+    s.add_argument("--port", type=int, default=8080, help="port to listen on")
+    s.add_argument("--cache-size", type=int, default=256, help="maximal number of cached instances")
+    s.add_argument("--cache-dir", default=None, help="cache the instances in this directory instead of in memory")
+    s.add_argument("--workers", type=int, default=None, help="number of generator processes")
+    s.add_argument("--timeout", type=float, default=60, help="seconds to wait for the generation of an instance")
+    s.add_argument("--quiet", action="store_true", help="do not log the requests")
+    s.set_defaults(run=_serve)
+    return p
+
+
+def main(argv=None):
+    """
+    entry point of the ``qcspgen`` command
+
+    :param argv: the command line arguments, default is sys.argv[1:]
+    :return: the exit status
+    """
+    args = parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except QCSPGenException as e:
+        print(e.message, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
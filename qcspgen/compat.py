@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import random
+
+
+class Random(random.Random):
+    """
+    random number generator which draws integers exactly as python 2.7 does, i.e., ``randint``, ``randrange``,
+    ``choice`` and ``shuffle`` scale ``random()`` instead of drawing random bits as python 3 does. Together with the
+    unchanged seeding of integer seeds and ``gauss``, instances generated with python 3 are identical to the ones
+    generated with python 2 for the same seed, e.g., the benchmark corpus.
+    """
+
+    def _randbelow(self, n, *args, **kwargs):
+        # the python 2.7 randrange: int(random() * n), unless n exceeds the 53 bit resolution of random()
+        if n >= 1 << 53:
+            return super(Random, self)._randbelow(n, *args, **kwargs)
+        return int(self.random() * n)
+
+    def choice(self, seq):
+        # python 2.7 does not pass choice through _randbelow
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, x, random=None):
+        # the python 2.7 shuffle, python 3.11 dropped the random argument
+        random = random or self.random
+        for i in reversed(range(1, len(x))):
+            j = int(random() * (i + 1))
+            x[i], x[j] = x[j], x[i]
+
+
+class ModuleRandom(Random):
+    """
+    generator which draws from the state of the ``random`` module, with the python 2.7 integer draws of ``Random``.
+    Seeding it seeds the ``random`` module and vice versa, so code that calls ``random.seed()`` before building a
+    vessel gets the same instances as before, on python 2 and 3.
+    """
+
+    # python 3 replaces the _randbelow of subclasses that override random()
+    _randbelow = Random._randbelow
+
+    def __init__(self):
+        # the state is the one of the random module, which is not reseeded here
+        self.gauss_next = None
+
+    def random(self):
+        return random.random()
+
+    def seed(self, *args, **kwargs):
+        random.seed(*args, **kwargs)
+
+    def gauss(self, mu, sigma):
+        return random.gauss(mu, sigma)
+
+    def getstate(self):
+        return random.getstate()
+
+    def setstate(self, state):
+        random.setstate(state)
+
+
+# the generator used by Vessel and Instance without an own generator, i.e., the random module, seeded by
+# Instance.seed() or random.seed(). It is shared by all the threads, instances are only reentrant with their own
+# generator, see Instance.from_parameters()
+shared_random = ModuleRandom()
+
+
+def getargspec(func):
+    """
+    ``inspect.getargspec`` on python 2 and its replacement ``inspect.getfullargspec`` on python 3
+
+    :param func: a function
+    :return: an argspec with at least the fields args, varargs and defaults
+    """
+    try:
+        return inspect.getfullargspec(func)
+    except AttributeError:
+        return inspect.getargspec(func)
+
+
+if __name__ == "__main__":
+    pass
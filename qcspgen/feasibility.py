@@ -0,0 +1,205 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .validator import Violation
+import bisect
+from . import interference
+from . import reader
+
+
+# relative tolerance of processing time checks, p / e is rarely exact in floating point
+TOLERANCE = 1e-9
+
+
+def _check_assignment(d, crane, start, completion):
+    violations = []
+    pt = reader.processing_times(d)
+    if not len(crane) == len(start) == len(completion) == d["n"]:
+        return [Violation("assignment", "crane, start and completion should have %d entries" % d["n"])]
+    ranges = interference.crane_ranges(d["b"], d["q"], d["s"], d["l0"])
+    for i in range(d["n"]):
+        if not 1 <= crane[i] <= d["q"]:
+            violations.append(Violation("assignment", "task %d is assigned to QC %r out of [1, %d]" %
+                                        (i+1, crane[i], d["q"])))
+            continue
+        first, last = ranges[crane[i]-1]
+        if not first <= d["l"][i] <= last:
+            violations.append(Violation("reach", "task %d in bay %d is out of the range [%d, %d] of QC %d" %
+                                        (i+1, d["l"][i], first, last, crane[i])))
+        if completion[i] - start[i] < pt[crane[i]-1][i] - TOLERANCE * max(1, abs(completion[i])):
+            violations.append(Violation("processing_time", "task %d is processed from %r to %r, shorter than %r" %
+                                        (i+1, start[i], completion[i], pt[crane[i]-1][i])))
+    return violations
+
+
+def _check_precedence(d, start, completion):
+    return [Violation("precedence", "task %d completes at %r after task %d starts at %r" %
+                      (i, completion[i-1], j, start[j-1]))
+            for i, j in d["Phi"] if completion[i-1] > start[j-1]]
+
+
+def _check_non_simultaneity(d, start, completion):
+    return [Violation("non_simultaneity", "tasks %d [%r, %r] and %d [%r, %r] overlap" %
+                      (i, start[i-1], completion[i-1], j, start[j-1], completion[j-1]))
+            for i, j in d["Psi"] if max(start[i-1], start[j-1]) < min(completion[i-1], completion[j-1])]
+
+
+def _check_travel(d, crane, start, completion):
+    violations = []
+    sequences = [[] for _ in range(d["q"])]
+    for i in sorted(range(d["n"]), key=lambda x: (start[x], completion[x])):
+        sequences[crane[i]-1].append(i)
+
+    for k, seq in enumerate(sequences):
+        t = d["t"][k]
+        c, h = d["r"][k], d["l0"][k]
+        previous = None
+        for i in seq:
+            earliest = c + t * abs(d["l"][i] - h)
+            if start[i] < earliest:
+                if previous is None:
+                    violations.append(Violation("ready_time", "QC %d cannot reach task %d at %r before %r" %
+                                                (k+1, i+1, start[i], earliest)))
+                else:
+                    violations.append(Violation("travel", "QC %d cannot start task %d at %r before %r after task %d" %
+                                                (k+1, i+1, start[i], earliest, previous+1)))
+            c, h, previous = max(c, completion[i]), d["l"][i], i
+    return violations
+
+
+def _check_interference(d, crane, start, completion):
+    """
+    time-ordered sweep over the intervals in which the QCs have to be at a bay, i.e., their tasks and their initial
+    locations until their ready times. Such intervals of QCs v < w at bays x and y need the QCs to move apart by
+    x - y + (s+1)(w-v) bays in between if that is positive, which takes at least that many times the largest travel
+    time of the QCs v..w, since the QCs in between have to move as well. If this holds for all pairs of intervals,
+    the QCs have paths along the quay that never violate the safety margin. Intervals that overlap need a distance of
+    (s+1)(w-v), which is additive, so a QC is checked against its nearest busy neighbors only, as in process. Ended
+    intervals are checked by keeping per QC pair the one that requires the latest start.
+    """
+    violations = []
+    q, gap = d["q"], d["s"] + 1
+    slowest = interference.slowest_travel_times(d["t"])
+    # intervals (start, completion, bay, QC, task), task None for an initial location
+    pins = [(min(0, d["r"][k]), d["r"][k], d["l0"][k], k, None) for k in range(q)]
+    pins.extend((start[i], completion[i], d["l"][i], crane[i] - 1, i) for i in range(d["n"]))
+    events = []
+    for x, pin in enumerate(pins):
+        events.append((pin[0], 1, x))
+        if pin[1] > pin[0]:
+            events.append((pin[1], 0, x))
+    # at equal times, intervals are completed before new ones are started
+    events.sort()
+
+    def name(pin):
+        return "initial location" if pin[4] is None else "task %d" % (pin[4] + 1)
+
+    # latest[v][w]: for the ended intervals of QC v, the largest completion + slowest * bay if v < w, else
+    # completion - slowest * bay, and the interval
+    latest = [[None] * q for _ in range(q)]
+    busy = []
+    bay = {}
+    task = {}
+
+    def complete(x):
+        a, b, y, v, _ = pins[x]
+        for w in range(q):
+            if w != v:
+                value = b + slowest[v][w] * (y if v < w else -y)
+                if latest[v][w] is None or value > latest[v][w][0]:
+                    latest[v][w] = (value, x)
+
+    for time, starting, x in events:
+        a, b, y, k, i = pins[x]
+        if not starting:
+            if task.get(k) == x:
+                busy.pop(bisect.bisect_left(busy, k))
+                del bay[k], task[k]
+            complete(x)
+            continue
+
+        for v in range(q):
+            if v == k or latest[v][k] is None:
+                continue
+            value, z = latest[v][k]
+            bound = value + slowest[v][k] * ((k - v) * gap - y if v < k else y + (v - k) * gap)
+            if a < bound - TOLERANCE * max(1, abs(bound)):
+                violations.append(Violation("interference",
+                                            "QC %d cannot be at bay %d (%s) at %r before %r, when QC %d has moved "
+                                            "far enough from bay %d (%s)" % (k+1, y, name(pins[x]), a, bound, v+1,
+                                                                             pins[z][2], name(pins[z]))))
+
+        position = bisect.bisect_left(busy, k)
+        # overlapping intervals of one QC are reported by _check_travel, the QC keeps the earlier one
+        same = int(position < len(busy) and busy[position] == k)
+        for neighbor in busy[position-1:position] + busy[position+same:position+same+1]:
+            if (y - bay[neighbor]) * (k - neighbor) < gap * (k - neighbor) ** 2:
+                violations.append(Violation("interference",
+                                            "at %r QC %d (%s, bay %d) and QC %d (%s, bay %d) are closer than safety "
+                                            "margin %r" % (time, k+1, name(pins[x]), y, neighbor+1,
+                                                           name(pins[task[neighbor]]), bay[neighbor], d["s"])))
+        if b > a and not same:
+            busy.insert(position, k)
+            bay[k] = y
+            task[k] = x
+        elif b <= a:
+            complete(x)
+    return violations
+
+
+def check(instance, crane, start, completion=None):
+    r"""
+    to verify a QCSP solution against an instance in O(n log n + nq + \|Phi\| + \|Psi\|). The following is checked:
+
+    * every task is assigned to a QC 1..q and is processed at least its processing time on that QC, i.e., p / e
+    * every task lies in the range of its QC, see ``interference.crane_ranges()``
+    * precedence pairs in Phi and non-simultaneity pairs in Psi
+    * QC ready times and travel times `t` between consecutive tasks of the same QC, starting at `l0`
+    * interference: the QCs can move along the quay of ``interference.quay_extent()`` so that they never pass each
+      other and QCs k < k' always keep a distance of at least (s+1)(k'-k) bays, where every QC is at its initial
+      location `l0` until its ready time and at the bay of its tasks while processing them
+
+    A task with zero processing time occupies no time, so it never overlaps with another task, but its QC has to be
+    at its bay at its start time.
+
+    :param instance: an Instance object or a dict of instance data
+    :param crane: for every task, the 1-based index of the QC processing it
+    :param start: for every task, its start time
+    :param completion: for every task, its completion time, by default start time plus processing time on its QC
+    :return: a list of Violation tuples, empty if the solution is feasible
+    """
+    d = reader.as_data(instance)
+    if completion is None and len(start) == len(crane) == d["n"]:
+        pt = reader.processing_times(d)
+        # tasks of invalid QCs are reported by _check_assignment
+        completion = [s + (pt[k-1][i] if 1 <= k <= d["q"] else d["p"][i]) for i, (s, k) in enumerate(zip(start, crane))]
+    violations = _check_assignment(d, crane, start, completion or [])
+    if any(v.kind == "assignment" for v in violations):
+        return violations
+
+    violations.extend(_check_precedence(d, start, completion))
+    violations.extend(_check_non_simultaneity(d, start, completion))
+    violations.extend(_check_travel(d, crane, start, completion))
+    violations.extend(_check_interference(d, crane, start, completion))
+    return violations
+
+
+def check_sequences(instance, sequences, start, completion=None):
+    """
+    same as ``check()`` for solutions given as one task sequence per QC, e.g., as used by ``simulator.Simulator``
+
+    :param instance: an Instance object or a dict of instance data
+    :param sequences: a list of q task sequences, one per QC, with 1-based task indices
+    :param start: for every task, its start time
+    :param completion: for every task, its completion time, by default start time plus processing time on its QC
+    :return: a list of Violation tuples, empty if the solution is feasible
+    """
+    crane = [0] * len(start)
+    for k, seq in enumerate(sequences):
+        for i in seq:
+            crane[i-1] = k + 1
+    return check(instance, crane, start, completion)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import hashlib
+import json
+import multiprocessing
+from . import precedence
+from . import reader
+
+
+def _number(x):
+    # 7 and 7.0 are the same processing time, ready time, ...
+    return float(x)
+
+
+def _refine(colors, adjacency):
+    """
+    color refinement (1-dimensional Weisfeiler-Lehman): the color of a task is repeatedly replaced by the rank of its
+    color together with the sorted colors of its neighbors in every relation, until the number of colors is stable.
+    Ranks are taken over the sorted signatures, so the colors do not depend on the task labels.
+
+    :param colors: the initial color of every task
+    :param adjacency: a list of relations, each a list of neighbor lists per task
+    :return: the stable color of every task
+    """
+    while True:
+        signatures = [(colors[i],) + tuple(tuple(sorted(colors[j] for j in neighbors[i])) for neighbors in adjacency)
+                      for i in range(len(colors))]
+        rank = dict((s, k) for k, s in enumerate(sorted(set(signatures))))
+        refined = [rank[s] for s in signatures]
+        if len(rank) == len(set(colors)):
+            return refined
+        colors = refined
+
+
+def canonical_form(instance):
+    """
+    to compute a representation of an instance that does not depend on how the tasks of a bay are labeled. Tasks are
+    identified by their stable colors under refinement with Phi (in transitive reduction, so the precedence form does
+    not matter) and Psi, starting from their bay and processing time. QCs keep their labels since they are ordered
+    along the quay. Missing handling efficiencies and due dates count as 1 and -1.
+
+    :param instance: an Instance object or a dict of instance data
+    :exception: QCSPGenException if Phi contains a cycle
+    :return: a json string
+    """
+    d = reader.as_data(instance)
+    n = d["n"]
+    phi = precedence.transitive_reduction(d["Phi"])
+    successors, predecessors, partners = [[[] for _ in range(n)] for _ in range(3)]
+    for i, j in phi:
+        successors[i-1].append(j-1)
+        predecessors[j-1].append(i-1)
+    for i, j in d["Psi"]:
+        partners[i-1].append(j-1)
+        partners[j-1].append(i-1)
+
+    tasks = [(d["l"][i], _number(d["p"][i])) for i in range(n)]
+    initial = dict((task, k) for k, task in enumerate(sorted(set(tasks))))
+    colors = _refine([initial[task] for task in tasks], [successors, predecessors, partners])
+
+    return json.dumps({
+        "n": n,
+        "b": d["b"],
+        "q": d["q"],
+        "s": d["s"],
+        "cranes": [[_number(x) for x in d.get(key) or [default] * d["q"]]
+                   for key, default in (("r", 0), ("l0", 0), ("t", 1), ("e", 1), ("due", -1))],
+        "tasks": sorted((colors[i],) + tasks[i] for i in range(n)),
+        "Phi": sorted((colors[i-1], colors[j-1]) for i, j in phi),
+        "Psi": sorted(tuple(sorted((colors[i-1], colors[j-1]))) for i, j in d["Psi"])
+    }, sort_keys=True, separators=(",", ":"))
+
+
+def fingerprint(instance):
+    """
+    to compute a fingerprint of an instance that is the same for instances which only differ by the labels of the
+    tasks within the bays (or by the form of Phi), see ``canonical_form()``. Color refinement can, in rare cases, give
+    the same fingerprint to instances that are not equivalent; compare their canonical forms to make sure.
+
+    :param instance: an Instance object or a dict of instance data
+    :exception: QCSPGenException if Phi contains a cycle
+    :return: a hex digest
+    """
+    return hashlib.sha1(canonical_form(instance).encode("utf-8")).hexdigest()
+
+
+def fingerprint_file(filename):
+    """
+    to read an instance file and to compute its fingerprint
+
+    :param filename: the instance file name
+    :return: (filename, fingerprint), the fingerprint is None if the file cannot be read
+    """
+    try:
+        return filename, fingerprint(reader.read(filename))
+    except (QCSPGenException, IOError, KeyError, TypeError, ValueError):
+        return filename, None
+
+
+def duplicates(paths, processes=None):
+    """
+    to find the clusters of equivalent instance files among the given files/directories. The fingerprints are
+    computed by a process pool and grouped in a dict, so the time is linear in the number of files. Files that cannot
+    be read are ignored, see ``validator.validate_corpus()`` to find them.
+
+    :param paths: a file/directory name or a list of them
+    :param processes: the number of worker processes, default is the number of CPUs
+    :return: sorted list of clusters, i.e., sorted lists of at least two file names with the same fingerprint
+    """
+    files = reader.find(paths)
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = pool.map(fingerprint_file, files,
+                           chunksize=max(1, len(files) // (4 * (processes or multiprocessing.cpu_count()))))
+    finally:
+        pool.close()
+        pool.join()
+
+    clusters = {}
+    for filename, digest in results:
+        if digest is not None:
+            clusters.setdefault(digest, []).append(filename)
+    return sorted(sorted(c) for c in clusters.values() if len(c) > 1)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import csv
+import multiprocessing
+import os
+import re
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import timeit
+from . import reader
+
+
+# placeholder of the instance file name in a solver command
+PLACEHOLDER = "{instance}"
+# columns of the results table
+COLUMNS = ("instance", "status", "exit_code", "wall_time", "objective")
+# default pattern of the objective value in the solver output, the last match counts
+OBJECTIVE = r"(?i)(?:objective|makespan)[^0-9+\-\n]*([-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)"
+
+# the solver process a worker is waiting for, see _terminate()
+_solver = None
+
+
+def _kill(process, killed):
+    # the solver runs in its own process group, so that its child processes are killed as well
+    killed.append(True)
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except OSError:
+        pass
+
+
+def run_solver(command, filename, timeout=None, objective=OBJECTIVE):
+    """
+    to run a solver on an instance file. The command is run without a shell; the placeholder ``PLACEHOLDER`` in the
+    command is replaced by the file name, and if there is none, the instance is written to the solver's stdin.
+
+    :param command: the solver command, a string (split like a shell command line) or a list of arguments
+    :param filename: the instance file name
+    :param timeout: the time limit in seconds, the solver is killed when it is exceeded, default is no limit
+    :param objective: the regular expression whose first group is the objective value in the solver output (stdout
+        and stderr), the last match counts
+    :return: dict with the ``COLUMNS``, status is 'ok', 'failed' (non-zero exit code), 'timeout' or 'error' (the
+        solver could not be started), objective is None if it is not found
+    """
+    if isinstance(command, str):
+        command = shlex.split(command)
+    arguments = [c.replace(PLACEHOLDER, filename) for c in command]
+    stdin = None
+    if arguments == command:
+        with open(filename, "rb") as f:
+            stdin = f.read()
+    result = {"instance": filename, "status": "error", "exit_code": None, "wall_time": None, "objective": None}
+
+    started = timeit.default_timer()
+    try:
+        process = subprocess.Popen(arguments, stdin=subprocess.PIPE if stdin is not None else None,
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   preexec_fn=os.setsid if os.name == "posix" else None)
+    except OSError:
+        return result
+    global _solver
+    _solver = process
+    killed = []
+    timer = threading.Timer(timeout, _kill, (process, killed)) if timeout else None
+    if timer:
+        timer.start()
+    try:
+        output = process.communicate(stdin)[0]
+    except BaseException:
+        _kill(process, killed)
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        _solver = None
+    result["wall_time"] = round(timeit.default_timer() - started, 3)
+    result["exit_code"] = process.returncode
+    if killed:
+        result["status"] = "timeout"
+    else:
+        result["status"] = "ok" if process.returncode == 0 else "failed"
+
+    values = re.findall(objective, output.decode("utf-8", "replace"))
+    if values:
+        result["objective"] = float(values[-1])
+    return result
+
+
+def _terminate(signum, frame):
+    # a terminated worker takes its solver along, which is not in the worker's process group
+    if _solver is not None:
+        _kill(_solver, [])
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+def _pin(cpus):
+    # pool initializer: every worker takes the next CPU and keeps its solvers on it, solvers inherit the affinity.
+    # Ctrl-C is left to the parent, which terminates the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if os.name == "posix":
+        signal.signal(signal.SIGTERM, _terminate)
+    cpu = cpus.get()
+    if cpu is not None:
+        os.sched_setaffinity(0, [cpu])
+
+
+def _run_job(job):
+    command, filename, timeout, objective = job
+    return run_solver(command, filename, timeout, objective)
+
+
+def _next(rows):
+    # waits with a timeout are interruptible by Ctrl-C on python 2
+    while True:
+        try:
+            return rows.next(timeout=60)
+        except multiprocessing.TimeoutError:
+            pass
+
+
+def read_results(filename):
+    """
+    to read a results table
+
+    :param filename: the csv file name
+    :return: dict instance file name -> row as returned by ``run_solver()``, an empty dict if the file does not exist
+    """
+    if not os.path.exists(filename):
+        return {}
+    rows = {}
+    with open(filename) as f:
+        for row in csv.DictReader(f):
+            for key, kind in (("exit_code", int), ("wall_time", float), ("objective", float)):
+                row[key] = kind(row[key]) if row.get(key) else None
+            rows[row["instance"]] = row
+    return rows
+
+
+def run_corpus(command, paths, results="results.csv", processes=None, timeout=None, objective=OBJECTIVE,
+               affinity=True):
+    """
+    to run a solver on all instance files of the given files/directories with a process pool, see ``run_solver()``.
+    Every run is appended to the results table as soon as it is done, and the instances already in the table are
+    skipped, so an interrupted run over a corpus resumes where it stopped (delete the rows of failed runs to rerun
+    them). Example, with a solver that reads the instance from stdin and prints ``makespan = 42``:
+    ::
+
+        harness.run_corpus("./solver --threads 1", "benchmarks/set_b", results="set_b.csv", processes=4, timeout=60)
+
+    :param command: the solver command, see ``run_solver()``
+    :param paths: a file/directory name or a list of them
+    :param results: the csv file name of the results table, with the ``COLUMNS``
+    :param processes: the number of solvers run at the same time, default is the number of CPUs
+    :param timeout: the time limit per run in seconds, default is no limit
+    :param objective: the regular expression of the objective value, see ``run_solver()``
+    :param affinity: if True and the platform supports it, every worker and its solvers are pinned to one CPU, so
+        that concurrent runs do not compete for the same core
+    :exception: QCSPGenException if a path does not exist or the objective pattern is invalid
+    :return: dict instance file name -> row of the results table, including the earlier runs
+    """
+    try:
+        re.compile(objective)
+    except re.error as e:
+        raise QCSPGenException("- invalid objective pattern %r: %s" % (objective, e))
+    # a missing file would be recorded as a failed run and then skipped by every resumed run
+    missing = [path for path in ([paths] if isinstance(paths, str) else paths) if not os.path.exists(path)]
+    if missing:
+        raise QCSPGenException("- instance files or directories %s do not exist" % missing)
+    done = read_results(results)
+    files = [f for f in reader.find(paths) if f not in done]
+    processes = processes or multiprocessing.cpu_count()
+
+    cpus = multiprocessing.Queue()
+    available = sorted(os.sched_getaffinity(0)) if affinity and hasattr(os, "sched_getaffinity") else [None]
+    for k in range(processes):
+        cpus.put(available[k % len(available)])
+
+    new = not os.path.exists(results) or os.path.getsize(results) == 0
+    pool = multiprocessing.Pool(processes, _pin, (cpus,))
+    try:
+        with open(results, "a") as f:
+            table = csv.DictWriter(f, COLUMNS, lineterminator="\n")
+            if new:
+                table.writeheader()
+            rows = pool.imap_unordered(_run_job, [(command, filename, timeout, objective) for filename in files])
+            for _ in files:
+                row = _next(rows)
+                table.writerow(row)
+                f.flush()
+                done[row["instance"]] = row
+    finally:
+        pool.terminate()
+        pool.join()
+    return done
+
+
+if __name__ == "__main__":
+    for name, row in sorted(run_corpus(sys.argv[1], sys.argv[2:] or ".").items()):
+        print("%s: %s %s" % (name, row["status"], row["objective"]))
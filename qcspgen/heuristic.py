@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import heapq
+import json
+import multiprocessing
+from . import interference
+from . import reader
+
+
+SUFFIX = ".sol.json"
+
+
+def partition_bays(d):
+    """
+    to split the bays 1..b into q contiguous zones of about the same workload, zone k is served by QC k and lies in
+    its range of ``interference.crane_ranges()``
+
+    :param d: dict of instance data
+    :exception: QCSPGenException if some bays are in no QC's range
+    :return: list of q (first bay, last bay) tuples, a zone may be empty (first bay > last bay)
+    """
+    ranges = interference.crane_ranges(d["b"], d["q"], d["s"], d["l0"])
+    workload = [0] * (d["b"] + 1)
+    for p, l in zip(d["p"], d["l"]):
+        workload[l] += p
+    total = float(sum(workload))
+
+    zones = []
+    first = 1
+    accumulated = 0
+    for k in range(1, d["q"]):
+        target = total * k / d["q"]
+        last = first - 1
+        if ranges[k][0] - 1 > ranges[k-1][1]:
+            raise QCSPGenException("- bays %d..%d are out of reach of the QCs!" %
+                                   (ranges[k-1][1] + 1, ranges[k][0] - 1))
+        # extend the zone while that brings the cumulative workload closer to the target, or the next QC cannot
+        # reach the next bay
+        while last < ranges[k-1][1] and (last + 1 < ranges[k][0] or
+                                         abs(accumulated + workload[last+1] - target) <= abs(accumulated - target)):
+            last += 1
+            accumulated += workload[last]
+        zones.append((first, last))
+        first = last + 1
+    zones.append((first, d["b"]))
+    return zones
+
+
+def _task_order(d):
+    # topological order of Phi, ties broken by bay and index, i.e., a sweep from bay 1 to bay b
+    successors = [[] for _ in range(d["n"] + 1)]
+    in_degree = [0] * (d["n"] + 1)
+    for i, j in d["Phi"]:
+        successors[i].append(j)
+        in_degree[j] += 1
+    heap = [(d["l"][i-1], i) for i in range(1, d["n"] + 1) if in_degree[i] == 0]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        _, i = heapq.heappop(heap)
+        order.append(i)
+        for j in successors[i]:
+            in_degree[j] -= 1
+            if in_degree[j] == 0:
+                heapq.heappush(heap, (d["l"][j-1], j))
+    if len(order) < d["n"]:
+        raise QCSPGenException("- precedence set is not acyclic!")
+    return order
+
+
+def _list_schedule(d, sequences):
+    """
+    to schedule the task sequences of the QCs one task at a time, always the QC that can start its next task first.
+    The task starts at the earliest time at which no scheduled task of Psi overlaps and the QCs have the time to move
+    apart from the scheduled tasks and initial locations of the other QCs, see ``feasibility.check()``.
+    """
+    n, q = d["n"], d["q"]
+    l = [0] + list(d["l"])
+    # processing times on the QC of every sequence
+    p = [[0] + list(row) for row in reader.processing_times(d).materialize()]
+    gap = d["s"] + 1
+    slowest = interference.slowest_travel_times(d["t"])
+    predecessors = [[] for _ in range(n + 1)]
+    for i, j in d["Phi"]:
+        predecessors[j].append(i)
+    partners = [[] for _ in range(n + 1)]
+    for i, j in d["Psi"]:
+        partners[i].append(j)
+        partners[j].append(i)
+
+    start, end = [None] * (n + 1), [None] * (n + 1)
+    clock, here = list(d["r"]), list(d["l0"])
+    position = [0] * q
+    # intervals (start, completion, bay) in which every QC is at a bay
+    pins = [[(min(0, d["r"][k]), d["r"][k], d["l0"][k])] for k in range(q)]
+
+    def earliest(k, i, s):
+        # open intervals of start times that conflict with a scheduled task or interval of another QC
+        e = p[k][i]
+        conflicts = [(start[j] - e, end[j]) for j in partners[i] if start[j] is not None and e > 0 and end[j] > start[j]]
+        for w in range(q):
+            if w != k:
+                for a, b, x in pins[w]:
+                    distance = (x - l[i] + (k - w) * gap) if w < k else (l[i] - x + (w - k) * gap)
+                    if distance > 0:
+                        separation = slowest[w][k] * distance
+                        conflicts.append((a - separation - e, b + separation))
+        for a, b in sorted(conflicts):
+            if a >= s:
+                break
+            s = max(s, b)
+        return s
+
+    for _ in range(n):
+        best = None
+        for k in range(q):
+            if position[k] == len(sequences[k]):
+                continue
+            i = sequences[k][position[k]]
+            if any(start[j] is None for j in predecessors[i]):
+                continue
+            s = max([clock[k] + d["t"][k] * abs(l[i] - here[k])] + [end[j] for j in predecessors[i]])
+            if best is None or s < best[0]:
+                best = (s, k, i)
+        if best is None:
+            raise QCSPGenException("- task sequences contradict the precedence set Phi!")
+        s, k, i = best
+        s = earliest(k, i, s)
+        start[i], end[i] = s, s + p[k][i]
+        pins[k].append((start[i], end[i], l[i]))
+        clock[k], here[k] = end[i], l[i]
+        position[k] += 1
+    return start[1:], end[1:]
+
+
+def solve(instance):
+    """
+    reference heuristic for the QCSP: the bays are partitioned into q zones of balanced workload (see
+    ``partition_bays()``), every QC sweeps through its zone in one direction, and the resulting task sequences are
+    list scheduled so that Phi, Psi, QC travel times and the safety margin are respected. Both sweep directions are
+    tried and the better schedule is kept. The solution is feasible in the sense of ``feasibility.check()``.
+
+    :param instance: an Instance object or a dict of instance data
+    :exception: QCSPGenException if Phi is not acyclic or some bays are out of reach of the QCs
+    :return: dict with the keys 'makespan', 'sequences', 'crane', 'start' and 'completion'
+    """
+    d = reader.as_data(instance)
+    zones = partition_bays(d)
+    zone_of_bay = [0] * (d["b"] + 1)
+    for k, (first, last) in enumerate(zones):
+        for bay in range(first, last + 1):
+            zone_of_bay[bay] = k
+
+    forward = _task_order(d)
+    best = None
+    for order in (forward, _reverse_sweep(d, forward)):
+        sequences = [[] for _ in range(d["q"])]
+        for i in order:
+            sequences[zone_of_bay[d["l"][i-1]]].append(i)
+        start, completion = _list_schedule(d, sequences)
+        makespan = max(completion) if completion else 0
+        if best is None or makespan < best["makespan"]:
+            crane = [0] * d["n"]
+            for k, seq in enumerate(sequences):
+                for i in seq:
+                    crane[i-1] = k + 1
+            best = {"makespan": makespan, "sequences": sequences, "crane": crane, "start": start,
+                    "completion": completion}
+    return best
+
+
+def _reverse_sweep(d, order):
+    # the same topological order within every bay, but bays visited from b down to 1
+    rank = dict((i, x) for x, i in enumerate(order))
+    return sorted(order, key=lambda i: (-d["l"][i-1], rank[i]))
+
+
+def solve_file(filename):
+    """
+    to solve an instance file and to write the solution next to it, i.e., into the file name + ``SUFFIX``
+
+    :param filename: the instance file name
+    :return: (filename, makespan), the makespan is None if the instance could not be solved
+    """
+    try:
+        solution = solve(reader.read(filename))
+    except reader.FILE_ERRORS:
+        return filename, None
+    with open(filename + SUFFIX, "w") as f:
+        json.dump(solution, f)
+    return filename, solution["makespan"]
+
+
+def solve_corpus(paths, processes=None):
+    """
+    to solve all instance files of the given files/directories with a process pool, see ``solve_file()``
+
+    :param paths: a file/directory name or a list of them
+    :param processes: the number of worker processes, default is the number of CPUs
+    :return: dict filename -> makespan
+    """
+    files = reader.find(paths)
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = pool.map(solve_file, files,
+                           chunksize=max(1, len(files) // (4 * (processes or multiprocessing.cpu_count()))))
+    finally:
+        pool.close()
+        pool.join()
+    return dict(results)
+
+
+if __name__ == "__main__":
+    import sys
+    for name, makespan in sorted(solve_corpus(sys.argv[1:] or ".").items()):
+        print("%s: %r" % (name, makespan))
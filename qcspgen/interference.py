@@ -0,0 +1,185 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+from . import checker
+
+
+# the QCs may move beside the vessel by this share of its bays, ``Instance`` places the first QC up to that far out
+MARGIN = 0.25
+
+
+def quay_extent(b, l0=None):
+    """
+    to get the part of the quay the QCs move on. QCs may leave the vessel by ``MARGIN`` times its number of bays on
+    either side, and further if they start further out, but never beyond.
+
+    :param b: the number of bays
+    :param l0: the initial locations of the QCs
+    :return: (first position, last position)
+    """
+    margin = int(MARGIN * b)
+    l0 = list(l0 or [])
+    return min([1 - margin] + l0), max([b + margin] + l0)
+
+
+@checker.func_arg_check(b=checker.Rule("number of bays", "int", "(0,inf)"),
+                        q=checker.Rule("number of QCs", "int", "(0,inf)"),
+                        s=checker.Rule("safety margin", "int", "[0,inf)"))
+def crane_ranges(b, q, s, l0=None):
+    """
+    to compute the bays every QC can serve. QCs cannot pass each other and two QCs k < k' keep a distance of at least
+    (s+1)(k'-k) bays, so on the quay extent [lo, hi] of ``quay_extent()``, QC k needs room for the k-1 QCs on its left
+    and the q-k QCs on its right and can only be at the positions [lo+(k-1)(s+1), hi-(q-k)(s+1)]. Its range is the
+    bays 1..b among them, which is empty, i.e., first > last, if the quay is too short for q QCs.
+
+    :param b: the number of bays
+    :param q: the number of QCs
+    :param s: the safety margin
+    :param l0: the initial locations of the QCs, see ``quay_extent()``
+    :return: list of q (first bay, last bay) ranges, for the QCs 1..q
+    """
+    lo, hi = quay_extent(b, l0)
+    return [(max(1, lo + k * (s + 1)), min(b, hi - (q - 1 - k) * (s + 1))) for k in range(q)]
+
+
+@checker.func_arg_check(b=checker.Rule("number of bays", "int", "(0,inf)"),
+                        q=checker.Rule("number of QCs", "int", "(0,inf)"),
+                        s=checker.Rule("safety margin", "int", "[0,inf)"))
+def eligible_cranes(locations, b, q, s, l0=None):
+    """
+    to compute the QCs every task can be served by, i.e., the QCs whose range of ``crane_ranges()`` holds the bay of
+    the task. Since the ranges shift by s+1 bays from one QC to the next, these QCs are an interval as well: on the
+    quay extent [lo, hi], QC k reaches bay x for q-(hi-x)//(s+1) <= k <= 1+(x-lo)//(s+1).
+
+    :param locations: the bays of the tasks
+    :param b: the number of bays
+    :param q: the number of QCs
+    :param s: the safety margin
+    :param l0: the initial locations of the QCs, see ``quay_extent()``
+    :exception: QCSPGenException if a task is not located in a bay 1..b
+    :return: list of (first QC, last QC) ranges, one per task, empty (first > last) if no QC reaches the task
+    """
+    lo, hi = quay_extent(b, l0)
+    per_bay = [(max(1, q - (hi - x) // (s + 1)), min(q, 1 + (x - lo) // (s + 1))) for x in range(1, b + 1)]
+    ranges = []
+    for x in locations:
+        if not 1 <= x <= b:
+            raise QCSPGenException("- task location %r is not a bay in [1, %d]" % (x, b))
+        ranges.append(per_bay[x - 1])
+    return ranges
+
+
+def slowest_travel_times(t):
+    """
+    to get the largest travel time per bay of every range of QCs. QCs v < w can only move apart as fast as the
+    slowest QC among v..w, since the QCs in between have to move along.
+
+    :param t: the travel times per bay of the QCs
+    :return: q x q list, entry [v][w] is the largest travel time of the QCs v+1..w+1 (0-based v and w)
+    """
+    slowest = [[0] * len(t) for _ in t]
+    for v in range(len(t)):
+        for w in range(v, len(t)):
+            slowest[v][w] = slowest[w][v] = max(t[w], slowest[v][w-1] if w > v else 0)
+    return slowest
+
+
+class SeparationTable(object):
+    """
+    minimum time separation between two tasks that are processed one after the other by different QCs: if task i at
+    bay x_i is processed by QC v and task j at bay x_j by QC w > v, QC w can only start j after i is completed and the
+    QCs have moved apart to the distance (s+1)(w-v), i.e., by max(0, x_i - x_j + (s+1)(w-v)) bays. This distance only
+    depends on the bay difference x_i - x_j and the QC gap w - v, so the table stores one row of 2b-1 bay differences
+    per QC gap 1..q-1 instead of a value per task pair and QC pair. Rows are computed on their first access. The time
+    is the distance times the largest travel time of the QCs v..w, which all have to move, see
+    ``slowest_travel_times()``. Example:
+    ::
+
+        table = SeparationTable(b=10, q=3, s=1, t=[1, 1, 2])
+        table.separation(4, 1, 5, 2)  # task at bay 4 on QC 1, then task at bay 5 on QC 2: 1 bay, i.e., 1 time unit
+
+    :param b: prefix:``number of bays``, type:``int``, range:``(0, inf)``
+    :param q: prefix:``number of QCs``, type:``int``, range:``(0, inf)``
+    :param s: prefix:``safety margin``, type:``int``, range:``[0, inf)``
+    :param t: the travel time per bay, one value for all the QCs or a list of q values
+    """
+
+    @checker.func_arg_check(b=checker.Rule("number of bays", "int", "(0,inf)"),
+                            q=checker.Rule("number of QCs", "int", "(0,inf)"),
+                            s=checker.Rule("safety margin", "int", "[0,inf)"))
+    def __init__(self, b, q, s, t=1):
+        super(SeparationTable, self).__init__()
+        self.__b = b
+        self.__q = q
+        self.__s = s
+        self.__t = list(t) if isinstance(t, (list, tuple)) else [t] * q
+        if len(self.__t) != q:
+            raise QCSPGenException("- %d travel times are given for %d QCs" % (len(self.__t), q))
+        self.__rows = [None] * q
+
+    def _row(self, gap):
+        row = self.__rows[gap]
+        if row is None:
+            margin = (self.__s + 1) * gap
+            row = [max(0, delta + margin) for delta in range(1 - self.__b, self.__b)]
+            self.__rows[gap] = row
+        return row
+
+    def bays(self, delta, gap):
+        """
+        to get the distance the QCs have to move apart between two tasks
+
+        :param delta: the bay difference x_i - x_j of the earlier task i and the later task j
+        :param gap: the QC gap w - v of the QC v of task i and the QC w of task j, negative if w < v
+        :exception: QCSPGenException if the bay difference or the QC gap is out of range
+        :return: the distance in bays, 0 for the same QC
+        """
+        if not (abs(delta) < self.__b and abs(gap) < self.__q):
+            raise QCSPGenException("- bay difference %r or QC gap %r is out of range" % (delta, gap))
+        if gap == 0:
+            return 0
+        if gap < 0:
+            delta, gap = -delta, -gap
+        return self._row(gap)[delta + self.__b - 1]
+
+    def separation(self, x_i, v, x_j, w):
+        """
+        to get the minimum time between the completion of task i and the start of task j
+
+        :param x_i: the bay of the earlier task i
+        :param v: the 1-based index of the QC of task i
+        :param x_j: the bay of the later task j
+        :param w: the 1-based index of the QC of task j
+        :return: the separation time
+        """
+        return self.bays(x_i - x_j, w - v) * max(self.__t[min(v, w) - 1:max(v, w)])
+
+    def rows(self):
+        """
+        to compute all the rows, e.g., for export
+
+        :return: list of q-1 rows, row g-1 holds the distances in bays of QC gap g for the bay differences 1-b..b-1
+        """
+        return [self._row(gap) for gap in range(1, self.__q)]
+
+    @staticmethod
+    def from_data(instance):
+        """
+        to build the table of an instance
+
+        :param instance: an Instance object or a dict of instance data
+        :return: a SeparationTable
+        """
+        from . import reader
+        d = reader.as_data(instance)
+        return SeparationTable(d["b"], d["q"], d["s"], d["t"])
+
+    def __str__(self):
+        return "SeparationTable: b={}, q={}, s={}, t={}".format(self.__b, self.__q, self.__s, self.__t)
+
+    __repr__ = __str__
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,133 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+
+
+def _components(arcs):
+    """
+    to split a set of arcs into weakly connected components. Since precedence pairs are generated within bays, every
+    component is contained in a single bay, which keeps the bitsets below as small as the bays themselves.
+
+    :param arcs: a list of (i, j) pairs
+    :return: a list of node lists, one per component
+    """
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for i, j in arcs:
+        parent.setdefault(i, i)
+        parent.setdefault(j, j)
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[rj] = ri
+
+    groups = {}
+    for x in parent:
+        groups.setdefault(find(x), []).append(x)
+    return [sorted(g) for g in groups.values()]
+
+
+def _topological_order(nodes, successors):
+    """
+    Kahn's algorithm on one component, smallest label first so that GGEN style arcs (i < j) keep the index order
+
+    :param nodes: the nodes of the component
+    :param successors: dict node -> set of successors
+    :exception: QCSPGenException if the arcs contain a cycle
+    :return: the nodes in topological order
+    """
+    import heapq
+    in_degree = dict.fromkeys(nodes, 0)
+    for u in nodes:
+        for v in successors.get(u, ()):
+            in_degree[v] += 1
+    heap = [u for u in nodes if in_degree[u] == 0]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        u = heapq.heappop(heap)
+        order.append(u)
+        for v in successors.get(u, ()):
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                heapq.heappush(heap, v)
+    if len(order) != len(nodes):
+        raise QCSPGenException("- precedence set is not acyclic!")
+    return order
+
+
+def _reachability(arcs):
+    """
+    to compute, component by component, the descendant bitset of every node together with the arcs of the transitive
+    reduction. Nodes are numbered by topological position, so a node's bitset only spans its own component.
+
+    :param arcs: a list of (i, j) pairs
+    :return: a list of (order, reach, reduced) per component where reach[k] is the bitset of descendants of order[k]
+    """
+    successors = {}
+    for i, j in arcs:
+        successors.setdefault(i, set()).add(j)
+
+    result = []
+    for nodes in _components(arcs):
+        order = _topological_order(nodes, successors)
+        position = dict((u, k) for k, u in enumerate(order))
+        reach = [0] * len(order)
+        reduced = []
+        for k in range(len(order) - 1, -1, -1):
+            u = order[k]
+            covered = 0
+            # successors in topological order: an arc (u, v) is transitive iff v is a descendant of an earlier successor
+            for pv in sorted(position[v] for v in successors.get(u, ())):
+                if not (covered >> pv) & 1:
+                    reduced.append((u, order[pv]))
+                    covered |= (1 << pv) | reach[pv]
+            reach[k] = covered
+        result.append((order, reach, reduced))
+    return result
+
+
+def transitive_reduction(arcs):
+    """
+    to compute the transitive reduction of an acyclic set of arcs, i.e., the smallest subset of arcs with the same
+    transitive closure. For a complete bay (d=1.0) this is the chain of consecutive tasks.
+
+    :param arcs: a list of (i, j) pairs
+    :exception: QCSPGenException if the arcs contain a cycle
+    :return: sorted list of (i, j) pairs
+    """
+    reduced = []
+    for _, _, r in _reachability(arcs):
+        reduced.extend(r)
+    return sorted(reduced)
+
+
+def transitive_closure(arcs):
+    """
+    to compute the transitive closure of an acyclic set of arcs
+
+    :param arcs: a list of (i, j) pairs
+    :exception: QCSPGenException if the arcs contain a cycle
+    :return: sorted list of (i, j) pairs
+    """
+    closed = []
+    for order, reach, _ in _reachability(arcs):
+        for k, bits in enumerate(reach):
+            u = order[k]
+            while bits:
+                low = bits & -bits
+                closed.append((u, order[low.bit_length() - 1]))
+                bits ^= low
+    return sorted(closed)
+
+
+if __name__ == "__main__":
+    pass
@@ -1,17 +1,17 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-import checker
+from . import checker
 
 
 class QC(object):
     """
     quay crane class
 
-    * `ID`: is a class attribute to count how may quay cranes has been created
     * `PROPERTY`: is a tuple of the available instance attributes for a quay crane object
+
+    :param index: the index of the quay crane within its quay, set by ``Quay``
     """
-    ID = 1
     PROPERTY = (
         "ready_time",
         "due_date",
@@ -21,15 +21,14 @@ class QC(object):
         "index"
     )
 
-    def __init__(self):
+    def __init__(self, index=-1):
         super(QC, self).__init__()
         self.__ready_time = 0.0
         self.__due_date = -1
         self.__initial_location = -1
         self.__t = 1
         self.__handling_efficiency_factor = 1.0
-        self.__index = QC.ID
-        QC.ID += 1
+        self.__index = index
 
     @property
     def ready_time(self):
@@ -41,12 +40,12 @@ class QC(object):
         return self.__ready_time
 
     @ready_time.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(value=checker.Rule("ready time", "int, float", "[0,inf)"))
     def ready_time(self, value):
         """
         setter for ready time
 
-        :param value: prefix:``ready time``, type:``int, float``, range:``[0, inf)``
+        :param value: ready time, int or float in [0, inf)
         """
         self.__ready_time = value
 
@@ -60,12 +59,12 @@ class QC(object):
         return self.__due_date
 
     @due_date.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(value=checker.Rule("due date", "int, float", "[0,inf)"))
     def due_date(self, value):
         """
         setter for due date
 
-        :param value: prefix:``due date``, type:``int, float``, range:``[0, inf)``
+        :param value: due date, int or float in [0, inf)
         """
         self.__due_date = value
 
@@ -79,12 +78,12 @@ class QC(object):
         return self.__initial_location
 
     @initial_location.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(value=checker.Rule("initial location", "int", "(-inf,inf)"))
     def initial_location(self, value):
         """
         setter for location
 
-        :param value: prefix:``initial location``, type:``int``, range:``(-inf, inf)``
+        :param value: initial location, int in (-inf, inf)
         :return: location
         """
         self.__initial_location = value
@@ -99,12 +98,12 @@ class QC(object):
         return self.__t
 
     @t.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(value=checker.Rule("reciprocal of speed", "int, float", "[0,inf)"))
     def t(self, value):
         """
         setter for reciprocal of speed
 
-        :param value: prefix:``reciprocal of speed``, type:``int, float``, range:``[0, inf)``
+        :param value: reciprocal of speed, int or float in [0, inf)
         """
         self.__t = value
 
@@ -118,12 +117,12 @@ class QC(object):
         return self.__handling_efficiency_factor
 
     @handling_efficiency_factor.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(value=checker.Rule("handling efficiency", "int, float", "[0,inf)"))
     def handling_efficiency_factor(self, value):
         """
         setter for quay crane handling efficiency
 
-        :param value: prefix:``handling efficiency``, type:``int, float``, range:``[0, inf)``
+        :param value: handling efficiency, int or float in [0, inf)
         """
         self.__handling_efficiency_factor = value
 
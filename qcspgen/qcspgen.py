@@ -1,13 +1,20 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from vessel import Vessel
-from quay import Quay
-from qcspgen_exception import QCSPGenException
-import checker
-import random
+from __future__ import print_function
+from .vessel import Vessel
+from .quay import Quay
+from .qc import QC
+from .qcspgen_exception import QCSPGenException
+from . import checker
+from . import compat
+import io
 import itertools
-import template
+from . import template
+from . import relation
+from . import bounds
+from . import interference
+from . import fingerprint
 
 
 class Instance(object):
@@ -24,27 +31,37 @@ class Instance(object):
     :param safety_margin: prefix:``safety margin between two consecutive QCs``,type:``int``,range:``[0, inf)``
     :param vessel: prefix:``vessel for an instance``, type:``Vessel``
     :param quay: prefix:``quay for an instance``, type:``Quay``
-    :param kwargs: other options, e.g., 'fixed', which means that the initial location of QCs are given by kwargs['fixed']
+    :param kwargs: other options, e.g., 'fixed', which means that the initial location of QCs are given by \
+    kwargs['fixed'], or 'rng', the random number generator for the initial locations of QCs, by default the generator \
+    of the vessel
     :return: None
     """
 
+    STYLE = ("opl", "json")
+    VESSEL_PARAMETERS = ("n", "b", "c", "f", "loc", "d", "g", "std", "means", "sampler")
+
     @staticmethod
     def seed(sd=None):
         """
-        function to change the seed of random functions used in this module
+        function to change the seed of random functions used in this module, i.e., of the ``random`` module, so
+        ``random.seed(sd)`` has the same effect. The shared generator is module state, so vessels and instances built
+        without their own generator (`rng`) are not reentrant; use ``from_parameters()`` or pass `rng` to build
+        instances concurrently.
 
         :param sd: a random number seed
         """
-        random.seed(sd)
+        compat.shared_random.seed(sd)
 
-    @checker.func_arg_check
+    @checker.func_arg_check(safety_margin=checker.Rule("safety margin between two consecutive QCs", "int", "[0,inf)"),
+                            vessel=checker.Rule("vessel for an instance", "Vessel"),
+                            quay=checker.Rule("quay for an instance", "Quay"))
     def __init__(self, safety_margin, vessel, quay, **kwargs):
         """
         initialization function for Instance class
 
-        :param safety_margin: prefix:``safety margin between two consecutive QCs``,type:``int``,range:``[0, inf)``
-        :param vessel: prefix:``vessel for an instance``, type:``Vessel``
-        :param quay: prefix:``quay for an instance``, type:``Quay``
+        :param safety_margin: safety margin between two consecutive QCs, int in [0, inf)
+        :param vessel: vessel for an instance, Vessel
+        :param quay: quay for an instance, Quay
         :param kwargs: other options, e.g., 'fixed', which means that the initial location of QCs are given by kwargs['fixed']
         :return: None
         """
@@ -52,6 +69,8 @@ class Instance(object):
         self.__safety_margin = safety_margin
         self.__vessel = vessel
         self.__quay = quay
+        self.__reachability = None
+        self.__separation = None
 
         if "fixed" in kwargs:
             if isinstance(kwargs["fixed"], (list, tuple)) and len(kwargs["fixed"]) == len(self.quay.size):
@@ -65,7 +84,7 @@ class Instance(object):
             else:
                 raise QCSPGenException("- kwargs['fixed'] should be list/tuple with length=%d" % self.quay.size)
         else:
-            self._set_qcs_l0_randomly()
+            self._set_qcs_l0_randomly(kwargs.get("rng") or vessel.rng)
 
     @property
     def vessel(self):
@@ -79,44 +98,256 @@ class Instance(object):
     def safety_margin(self):
         return self.__safety_margin
 
-    def _set_qcs_l0_randomly(self):
+    def _set_qcs_l0_randomly(self, rng):
         factor = 2
-        delta = int(0.25 * self.vessel.bay_size)
-        shift = random.randint(-1*delta, delta)
+        # the quay extends this far beside the vessel, see interference.quay_extent()
+        delta = int(interference.MARGIN * self.vessel.bay_size)
+        shift = rng.randint(-1*delta, delta)
         l0 = [1 + shift] * self.quay.size
         for i in range(1, self.quay.size):
-            l0[i] = l0[i-1] + random.randint(self.safety_margin + 1, factor * (self.safety_margin + 1))
+            l0[i] = l0[i-1] + rng.randint(self.safety_margin + 1, factor * (self.safety_margin + 1))
 
         for i, q in enumerate(self.quay.qcs):
             q.initial_location = l0[i]
 
-    def generate(self, path=".", name="QCSP.txt", style="opl"):
+    def data(self, phi="raw"):
+        """
+        to collect the instance data written by ``generate()``
+
+        :param phi: the form of the precedence set Phi, see ``Vessel.PRECEDENCE_FORM``
+        :return: dict of instance data
+        """
+        return {
+            "n": self.vessel.task_size,
+            "b": self.vessel.bay_size,
+            "t_index": [i+1 for i in range(self.vessel.task_size)],
+            "p": [t.processing_time for t in self.vessel.tasks],
+            "l": [t.location for t in self.vessel.tasks],
+            "Phi": self.vessel.precedence_set(phi),
+            "Psi": self.vessel.non_simultaneity,
+            "q": self.quay.size,
+            "q_index": [i+1 for i in range(self.quay.size)],
+            "r": [qc.ready_time for qc in self.quay.qcs],
+            "l0": [qc.initial_location for qc in self.quay.qcs],
+            "t": [qc.t for qc in self.quay.qcs],
+            "s": self.safety_margin,
+            "e": [qc.handling_efficiency_factor for qc in self.quay.qcs],
+            "due": [qc.due_date for qc in self.quay.qcs]
+        }
+
+    def reachability(self):
+        """
+        to get the bays every QC can serve and the QCs every task can be served by, computed once per instance from
+        the initial locations of the QCs, see ``interference.crane_ranges()`` and ``interference.eligible_cranes()``
+
+        :return: dict with 'crane_range', the (first bay, last bay) of every QC, and 'eligible', the (first QC, \
+        last QC) of every task
+        """
+        if self.__reachability is None:
+            b, q, s = self.vessel.bay_size, self.quay.size, self.safety_margin
+            l0 = [qc.initial_location for qc in self.quay.qcs]
+            self.__reachability = {
+                "crane_range": interference.crane_ranges(b, q, s, l0),
+                "eligible": interference.eligible_cranes([t.location for t in self.vessel.tasks], b, q, s, l0)
+            }
+        return self.__reachability
+
+    def separation_table(self):
+        """
+        to get the minimum separation times of tasks processed one after the other by different QCs, computed once
+        per instance, see ``interference.SeparationTable``
+
+        :return: a SeparationTable
+        """
+        if self.__separation is None:
+            self.__separation = interference.SeparationTable(self.vessel.bay_size, self.quay.size,
+                                                             self.safety_margin, [qc.t for qc in self.quay.qcs])
+        return self.__separation
+
+    def lower_bounds(self):
+        """
+        to compute makespan lower bounds of the instance, see ``bounds.lower_bounds()``
+
+        :return: dict name -> bound
         """
-        to generate output file by given file style
+        return bounds.lower_bounds(self)
+
+    def fingerprint(self):
+        """
+        to compute a fingerprint that is the same for instances which only differ by the labels of the tasks within
+        the bays, see ``fingerprint.fingerprint()``
+
+        :return: a hex digest
+        """
+        return fingerprint.fingerprint(self)
+
+    def generate(self, path=".", name="QCSP.txt", style="opl", phi="raw", relations=False, lower_bounds=False,
+                 writer=None, crane_data=None, reachability=False, separation=False):
+        """
+        to generate output file by given file style. Nothing is printed, see ``dump()`` and ``dumps()`` to serialize
+        the instance to a pipe, a socket or in memory instead.
 
         :param path: to specify the path of the generated file
         :param name: the name of the generated file
         :param style: the style of the generated file, currelty supported file stypes are 'opl' and 'json'
+        :param phi: the form of the precedence set Phi, i.e., 'raw', 'reduced' or 'closed'
+        :param relations: if True, Phi and Psi are also written in CSR/bitset form to the file name + '.rel.json', \
+        which can be read back by ``relation.load()``
+        :param lower_bounds: if True, the makespan lower bounds are recorded in the bounds catalog of `path`, or \
+        a ``bounds.Catalog`` which records them for a batch of instances and writes the catalog once
+        :param writer: a ``writer.AsyncWriter`` to hand the instance file to, instead of writing it in this thread
+        :param crane_data: whether the handling efficiencies and due dates of the QCs are written, see ``dumps()``
+        :param reachability: if True, the bay ranges of the QCs and the QC ranges of the tasks are written as well
+        :param separation: if True, the separation table of the QCs is written as well
         """
         import os
         filename = path + os.path.sep + name
-        n = self.vessel.task_size
-        b = self.vessel.bay_size
-        t_index = [i+1 for i in range(self.vessel.task_size)]
-        p = [t.processing_time for t in self.vessel.tasks]
-        l = [t.location for t in self.vessel.tasks]
-        Phi = self.vessel.precedence
-        Psi = self.vessel.non_simultaneity
-        q = self.quay.size
-        q_index = [i+1 for i in range(self.quay.size)]
-        r = [qc.ready_time for qc in self.quay.qcs]
-        l0 = [qc.initial_location for qc in self.quay.qcs]
-        t = [qc.t for qc in self.quay.qcs]
-        s = self.safety_margin
-
-        with open(filename, "w") as f:
-            f.write(getattr(self, "_%s_format" % style)(locals()))
-        print "Instance file %s (style: %s) has been generated!" % (name, style)
+
+        text = self.dumps(style, phi, crane_data=crane_data, reachability=reachability, separation=separation)
+        if writer is None:
+            with open(filename, "w") as f:
+                f.write(text)
+        else:
+            writer.submit(filename, text)
+        if relations:
+            relation.dump({"Phi": self.vessel.precedence_relation(phi),
+                           "Psi": self.vessel.non_simultaneity_relation()}, filename + ".rel.json")
+        if isinstance(lower_bounds, bounds.Catalog):
+            lower_bounds.add(name, self.lower_bounds())
+        elif lower_bounds:
+            bounds.update_catalog(path, {name: self.lower_bounds()})
+
+    def dump(self, fp, style="opl", phi="raw", **options):
+        """
+        to write the serialized instance to a text or binary file object, e.g., ``sys.stdout`` or the stdin of a solver
+        subprocess, or to a socket, without a file round trip, for example:
+        ::
+
+            solver = subprocess.Popen(["solver", "-"], stdin=subprocess.PIPE)
+            instance.dump(solver.stdin, style="opl")
+            solver.stdin.close()
+
+        :param fp: a file object with a ``write()`` method, or a socket; binary ones get utf-8 encoded bytes
+        :param style: the style of the output, i.e., 'opl' or 'json'
+        :param phi: the form of the precedence set Phi, i.e., 'raw', 'reduced' or 'closed'
+        :param options: the options `crane_data`, `reachability` and `separation` of ``dumps()``
+        :return: None
+        """
+        text = self.dumps(style, phi, **options)
+        if hasattr(fp, "sendall"):
+            fp.sendall(text.encode("utf-8"))
+        elif isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in str(getattr(fp, "mode", "")):
+            fp.write(text.encode("utf-8"))
+        elif isinstance(fp, io.TextIOBase) and isinstance(text, bytes):
+            # python 2: io text streams only take unicode
+            fp.write(text.decode("utf-8"))
+        else:
+            fp.write(text)
+
+    def dumps(self, style="opl", phi="raw", crane_data=None, reachability=False, separation=False, encoding=None):
+        """
+        to serialize the instance in memory, i.e., the content ``generate()`` writes to a file
+
+        :param style: the style of the output, i.e., 'opl' or 'json'
+        :param phi: the form of the precedence set Phi, i.e., 'raw', 'reduced' or 'closed'
+        :param crane_data: if True, the handling efficiencies `e` and due dates `due` of the QCs are written as well, \
+        see ``reader.ProcessingTimes`` for the per QC processing times. By default, they are only written if a QC has \
+        an efficiency other than 1 or a due date, so instances of identical QCs keep the original format.
+        :param reachability: if True, the bay range `crane_range` of every QC and the QC range `eligible` of every \
+        task are written as well, see ``reachability()``
+        :param separation: if True, the rows of the separation table are written as `separation` as well, see \
+        ``separation_table()``
+        :param encoding: if given, e.g., 'utf-8', the serialized instance is returned as bytes in this encoding
+        :return: the serialized instance
+        """
+        checker.verify_is_in(style, Instance.STYLE)
+        data = self.data(phi)
+        if crane_data is None:
+            crane_data = any(e != 1 for e in data["e"]) or any(due != -1 for due in data["due"])
+        data["crane_data"] = crane_data
+        data["reachability"] = reachability
+        if reachability:
+            data.update(self.reachability())
+        data["separation"] = self.separation_table().rows() if separation else None
+        text = getattr(self, "_%s_format" % style)(data)
+        return text.encode(encoding) if encoding else text
+
+    @staticmethod
+    def from_parameters(seed=None, **params):
+        """
+        to build an instance from one flat set of parameters with its own random number generator, for example:
+        ::
+
+            Instance.from_parameters(seed=1, n=10, b=10, c=200, f=0.5, d=1.0, g=0.0, loc="uni", q=2, t=1,
+                                     ready_time=0, safety_margin=1)
+
+        :param seed: a random number seed, the instance is the same as after ``Instance.seed(seed)`` with the \
+        shared generator, but building it does not touch the shared state, so it is safe to call concurrently
+        :param params: the vessel parameters ``VESSEL_PARAMETERS``, the number of QCs `q`, the QC properties \
+        ``QC.PROPERTY`` and the `safety_margin`
+        :exception: QCSPGenException
+        :return: an instance
+        """
+        unknown = set(params) - set(Instance.VESSEL_PARAMETERS + QC.PROPERTY + ("q", "safety_margin"))
+        if unknown:
+            raise QCSPGenException("- unknown instance parameters: %s" % ", ".join(sorted(unknown)))
+        checker.compulsory_kwargs(params, ("q", "safety_margin"))
+
+        rng = compat.Random(seed)
+        v = Vessel(rng=rng, **dict((k, params[k]) for k in Instance.VESSEL_PARAMETERS if k in params))
+        qu = Quay(params["q"], **dict((k, params[k]) for k in QC.PROPERTY if k in params))
+        return Instance(safety_margin=params["safety_margin"], vessel=v, quay=qu, rng=rng)
+
+    @staticmethod
+    def iter_generate(grid, seeds, style=None, phi="raw", workers=0, read_ahead=None):
+        """
+        to lazily generate the instances of a parameter grid, one seed after another for every parameter set, e.g.:
+        ::
+
+            grid = {"n": [10, 15], "b": 10, "c": 200, "f": 0.5, "d": 1.0, "g": 0.0, "loc": "uni", "q": 2,
+                    "t": 1, "ready_time": 0, "safety_margin": 1}
+            for params, seed, text in Instance.iter_generate(grid, range(1, 11), style="json", workers=4):
+                solver.solve(text)
+
+        Only the instances in flight are kept in memory. With workers, the next `read_ahead` instances are generated
+        by a process pool while the current one is consumed; the output and its order do not depend on the number of
+        workers. Patterns of ``sampling.register_distribution()`` must be registered in the workers as well.
+
+        :param grid: dict parameter -> value or list of values (see ``from_parameters()``), whose cartesian product \
+        is generated, or a list of such dicts. Per QC values are given as tuples, e.g., "ready_time": (0, 2)
+        :param seeds: an iterable of random number seeds
+        :param style: if None, Instance objects are yielded, otherwise instances serialized in this style
+        :param phi: the form of the precedence set Phi for serialized instances
+        :param workers: the number of worker processes, 0 to generate in the calling process
+        :param read_ahead: the maximal number of instances in flight, default is twice the number of workers
+        :return: a generator of (parameter dict, seed, instance or serialized instance) tuples
+        """
+        if style is not None:
+            checker.verify_is_in(style, Instance.STYLE)
+        jobs = ((params, sd, style, phi) for params in _expand_grid(grid) for sd in seeds)
+
+        if not workers:
+            for job in jobs:
+                yield job[0], job[1], _generate_job(job)
+            return
+
+        import collections
+        import multiprocessing
+        read_ahead = read_ahead or 2 * workers
+        pool = multiprocessing.Pool(workers)
+        try:
+            pending = collections.deque()
+            for job in jobs:
+                pending.append((job, pool.apply_async(_generate_job, (job,))))
+                if len(pending) >= read_ahead:
+                    job, result = pending.popleft()
+                    yield job[0], job[1], result.get()
+            while pending:
+                job, result = pending.popleft()
+                yield job[0], job[1], result.get()
+        finally:
+            pool.terminate()
+            pool.join()
 
     @staticmethod
     def _opl_format(data):
@@ -141,6 +372,14 @@ class Instance(object):
         data["r"] = opl_array(data["r"])
         data["l0"] = opl_array(data["l0"])
         data["t"] = opl_array(data["t"])
+        data["cranes"] = template.OPL_CRANES.format(e=opl_array(data["e"]), due=opl_array(data["due"])) \
+            if data["crane_data"] else ""
+        data["ranges"] = template.OPL_RANGES.format(crane_range=opl_array(opl_array(a) for a in data["crane_range"]),
+                                                    eligible=opl_array(opl_array(a) for a in data["eligible"])) \
+            if data["reachability"] else ""
+        data["separation"] = template.OPL_SEPARATION.format(
+            separation=opl_array(opl_array(row) for row in data["separation"])) \
+            if data["separation"] is not None else ""
 
         return template.OPL_TEMPLATE.format(**data)
 
@@ -165,92 +404,81 @@ class Instance(object):
         data["r"] = json_array(data["r"])
         data["l0"] = json_array(data["l0"])
         data["t"] = json_array(data["t"])
+        data["cranes"] = template.JSON_CRANES.format(e=json_array(data["e"]), due=json_array(data["due"])) \
+            if data["crane_data"] else ""
+        data["ranges"] = template.JSON_RANGES.format(crane_range=json_array_2d(data["crane_range"]),
+                                                     eligible=json_array_2d(data["eligible"])) \
+            if data["reachability"] else ""
+        data["separation"] = template.JSON_SEPARATION.format(
+            separation=json_array(json_array(row) for row in data["separation"])) \
+            if data["separation"] is not None else ""
 
         return template.JSON_TEMPLATE.format(**data)
 
 
-def generate_benchmark():
+def _expand_grid(grid):
+    # a parameter grid is a dict of values/lists of values, or a list of such grids
+    if not isinstance(grid, dict):
+        for g in grid:
+            for params in _expand_grid(g):
+                yield params
+        return
+    keys = sorted(grid)
+    values = [grid[k] if isinstance(grid[k], list) else [grid[k]] for k in keys]
+    for combination in itertools.product(*values):
+        yield dict(zip(keys, combination))
+
+
+def _generate_job(job):
+    params, sd, style, phi = job
+    instance = Instance.from_parameters(seed=sd, **params)
+    return instance if style is None else instance.dumps(style, phi)
+
+
+# the benchmark sets of generate_benchmark()
+BENCHMARK_SETS = ("A", "B", "C", "D", "E", "F", "G")
+
+
+def benchmark_set(name):
+    """
+    to get the parameters of the instances of a benchmark set, in the order of their file numbers, e.g., the instance
+    of file QCSP_Set_B_12.json is ``Instance.from_parameters(seed=seed, **params)`` of ``benchmark_set("B")[11]``
+
+    :param name: the benchmark set, one of ``BENCHMARK_SETS``
+    :exception: QCSPGenException
+    :return: list of (parameter dict, seed) pairs
+    """
+    checker.verify_is_in(name, BENCHMARK_SETS)
+    vessel = {"n": 50, "b": 15, "c": 400, "f": 0.5, "d": 1.0, "g": 0.0, "loc": "uni"}
+    if name == "A":
+        grid = [dict(vessel, n=n, b=10, c=200, q=2) for n in range(10, 41, 5)]
+    elif name == "B":
+        grid = [dict(vessel, n=n, q=4) for n in range(45, 71, 5)]
+    elif name == "C":
+        grid = [dict(vessel, n=n, b=20, c=600, q=6) for n in range(75, 101, 5)]
+    elif name == "D":
+        grid = [dict(vessel, b=10, f=f, loc=loc, q=4)
+                for f, loc in itertools.product([0.2, 0.8], ["cl1", "cl2", "uni"])]
+    elif name == "E":
+        grid = [dict(vessel, d=d, q=4) for d in [0.80, 0.85, 0.90, 0.95, 1.0]]
+    elif name == "F":
+        grid = [dict(vessel, d=1, q=q) for q in range(2, 7)]
+    else:
+        grid = [dict(vessel, d=1, q=4, safety_margin=s) for s in range(0, 5)]
+    return [(dict({"t": 1, "ready_time": 0, "safety_margin": 1}, **params), j) for params in grid for j in range(1, 11)]
+
+
+def generate_benchmark(writer=None):
     """
     function to generate benchmarks ABCDEFG
 
+    :param writer: an optional ``writer.AsyncWriter`` which writes the instance files in the background
     :return: None
     """
-    # set A
-    counter = 1
-    for n in range(10, 41, 5):
-        for j in range(1, 11):
-            Instance.seed(j)
-            v = Vessel(b=10, c=200, f=0.5, d=1.0, g=0.0, n=n, loc="uni")
-            qu = Quay(2, t=1, ready_time=0)
-            instance = Instance(safety_margin=1, vessel=v, quay=qu)
-            instance.generate(style="json", name="QCSP_Set_A_{}.json".format(counter))
-            counter += 1
-
-    # set B
-    counter = 1
-    for n in range(45, 71, 5):
-        for j in range(1, 11):
-            Instance.seed(j)
-            v = Vessel(b=15, c=400, f=0.5, d=1.0, g=0.0, n=n, loc="uni")
-            qu = Quay(4, t=1, ready_time=0)
-            instance = Instance(safety_margin=1, vessel=v, quay=qu)
-            instance.generate(style="json", name="QCSP_Set_B_{}.json".format(counter))
-            counter += 1
-
-    # set C
-    counter = 1
-    for n in range(75, 101, 5):
-        for j in range(1, 11):
-            Instance.seed(j)
-            v = Vessel(b=20, c=600, f=0.5, d=1.0, g=0.0, n=n, loc="uni")
-            qu = Quay(6, t=1, ready_time=0)
-            instance = Instance(safety_margin=1, vessel=v, quay=qu)
-            instance.generate(style="json", name="QCSP_Set_C_{}.json".format(counter))
-            counter += 1
-
-    # set D
-    counter = 1
-    for f, loc in itertools.product([0.2, 0.8], ["cl1", "cl2", "uni"]):
-        for j in range(1, 11):
-            Instance.seed(j)
-            v = Vessel(b=10, c=400, f=f, d=1.0, g=0.0, n=50, loc=loc)
-            qu = Quay(4, t=1, ready_time=0)
-            instance = Instance(safety_margin=1, vessel=v, quay=qu)
-            instance.generate(style="json", name="QCSP_Set_D_{}.json".format(counter))
-            counter += 1
-
-    # set E
-    counter = 1
-    for d in [0.80, 0.85, 0.90, 0.95, 1.0]:
-        for j in range(1, 11):
-            Instance.seed(j)
-            v = Vessel(b=15, c=400, f=0.5, d=d, g=0.0, n=50, loc="uni")
-            qu = Quay(4, t=1, ready_time=0)
-            instance = Instance(safety_margin=1, vessel=v, quay=qu)
-            instance.generate(style="json", name="QCSP_Set_E_{}.json".format(counter))
-            counter += 1
-
-    # set F
-    counter = 1
-    for q in range(2, 7):
-        for j in range(1, 11):
-            Instance.seed(j)
-            v = Vessel(b=15, c=400, f=0.5, d=1, g=0.0, n=50, loc="uni")
-            qu = Quay(q, t=1, ready_time=0)
-            instance = Instance(safety_margin=1, vessel=v, quay=qu)
-            instance.generate(style="json", name="QCSP_Set_F_{}.json".format(counter))
-            counter += 1
-
-    # set G
-    counter = 1
-    for s in range(0, 5):
-        for j in range(1, 11):
-            Instance.seed(j)
-            v = Vessel(b=15, c=400, f=0.5, d=1, g=0.0, n=50, loc="uni")
-            qu = Quay(4, t=1, ready_time=0)
-            instance = Instance(safety_margin=s, vessel=v, quay=qu)
-            instance.generate(style="json", name="QCSP_Set_G_{}.json".format(counter))
-            counter += 1
+    for name in BENCHMARK_SETS:
+        for counter, (params, sd) in enumerate(benchmark_set(name), 1):
+            instance = Instance.from_parameters(seed=sd, **params)
+            instance.generate(style="json", name="QCSP_Set_{}_{}.json".format(name, counter), writer=writer)
 
 if __name__ == "__main__":
     try:
@@ -266,36 +494,18 @@ if __name__ == "__main__":
         # instance.generate(style="json", name="test.json")
 
         # v = Vessel(b=15, c=400, f=0.5, d=1, g=0.0, loc='uni', n=50)
-        # import copy
-        # bay_size = 20
-        # vessel_size = 100
-        # Instance.seed("hello")
-        # v_0 = Vessel(b=bay_size, c=600, f=0.5, d=1.0, g=0.0, n=200, loc="uni")
-        #
-        # vessels = []
-        # for n in range(vessel_size):
-        #     v = Vessel(tasks=copy.deepcopy(v_0.tasks), b=bay_size, c=600, f=0.5, d=1.0, g=0.0, n=100, loc="uni",
-        #                means=(10.0, 15.0))
-        #     vessels.append(v.bays)
-        #
-        # number = bay_size * [0]
-        # weight = bay_size * [0]
-        # for v in vessels:
-        #     for b in range(bay_size):
-        #         number[b] += len(v[b].tasks)
-        #         weight[b] += v[b].aggregate_task_processing_time
-        #
-        # number = map(lambda x: x*1.0/vessel_size, number)
-        # weight = map(lambda x: x*1.0/vessel_size, weight)
-        #
-        # print ["{:.2f}".format(n) for n in number]
-        # print ["{:.2f}".format(w) for w in weight]
+
+        # average number of clusters and workload per bay, see analysis.monte_carlo
+        # from qcspgen import analysis
+        # study = analysis.monte_carlo(n=200, b=20, c=600, f=0.5, loc="cl2", replications=100000, seed="hello",
+        #                              means=(10, 15), fixed_tasks=True)
+        # print ["{:.2f}".format(n) for n in study["count"]["mean"]]
+        # print ["{:.2f}".format(w) for w in study["workload"]["mean"]]
         #
         # import matplotlib.pyplot as plt
         #
-        # plt.bar(range(bay_size), weight)
-        # # plt.plot(number)
+        # plt.bar(range(20), study["workload"]["mean"])
         # plt.show()
         pass
-    except QCSPGenException, e:
+    except QCSPGenException as e:
         e.display()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 
+from __future__ import print_function
 import traceback
 
 
@@ -12,7 +13,7 @@ class QCSPGenException(Exception):
     :param message: the message of the exception
     """
     def __init__(self, message):
-        super(QCSPGenException, self).__init__()
+        super(QCSPGenException, self).__init__(message)
         self.message = message
 
     @staticmethod
@@ -30,5 +31,5 @@ class QCSPGenException(Exception):
 
         :return: None
         """
-        print QCSPGenException.traceback()
-        print self.message
+        print(QCSPGenException.traceback())
+        print(self.message)
@@ -1,10 +1,10 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from qc import QC
-from qcspgen_exception import QCSPGenException
-from aggregator import Aggregator
-import checker
+from .qc import QC
+from .qcspgen_exception import QCSPGenException
+from .aggregator import Aggregator
+from . import checker
 
 
 class Quay(Aggregator):
@@ -13,29 +13,30 @@ class Quay(Aggregator):
     supply the number of quay cranes, n (n>0) and quay cranes' properties that you would like to set. For example:
     ::
         qu = Quay(4, t=1, ready_time=[1, 2, 3, 4], due_date=[3, 4, 5, 6])
-        print qu
+        print(qu)
 
     Note that if a property of a quay crane is identical for all quay cranes in the quay, you can squeeze the argument
     list into one value.
 
+    The quay cranes are indexed 1..n within the quay.
+
     :param n: the number of quay cranes of the quay
     :param kwargs: properties of quay cranes
 
     """
 
-    @checker.func_arg_check
+    @checker.func_arg_check(n=checker.Rule("number of QCs", "int", "(0,inf)"))
     def __init__(self, n, **kwargs):
         """
         initialization function of a quay
 
-        :param n: prefix:``number of QCs``, type:``int``, range:``(0, inf)``
+        :param n: number of QCs, int in (0, inf)
         :param kwargs: properties of quay cranes
         :return: None
         """
         super(Quay, self).__init__(QC)
 
-        for i in range(n):
-            super(Quay, self).append(QC())
+        self.extend(QC(i + 1) for i in range(n))
 
         for p in QC.PROPERTY:
             if p in kwargs.keys():
@@ -0,0 +1,168 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import json
+import os
+import re
+
+
+FIELDS = ("n", "b", "p", "l", "Phi", "Psi", "q", "r", "l0", "t", "s")
+# only written by ``Instance.dumps()`` if needed or asked for: handling efficiencies and due dates of heterogeneous
+# cranes, bay ranges of the cranes and crane ranges of the tasks, and the crane separation table
+OPTIONAL_FIELDS = ("e", "due", "crane_range", "eligible", "separation")
+EXTENSIONS = (".json", ".txt", ".dat")
+# files written next to instances, e.g., by ``Instance.generate(relations=True)``, ``bounds.annotate()`` or
+# ``heuristic.solve_corpus()``
+SIDECARS = (".rel.json", ".catalog.json", ".sol.json")
+# errors of reading an instance file or of processing a malformed one, e.g., a bay out of range, which the corpus
+# tools report per file instead of aborting the corpus
+FILE_ERRORS = (QCSPGenException, IOError, LookupError, TypeError, ValueError)
+
+_OPL_COMMENT = re.compile(r'/\*.*?\*/|//[^\n]*', re.S)
+_OPL_ASSIGNMENT = re.compile(r'(\w+)\s*=\s*([^;]*);')
+
+
+def _opl_loads(text):
+    data = {}
+    for key, value in _OPL_ASSIGNMENT.findall(_OPL_COMMENT.sub("", text)):
+        value = value.replace("<", "[").replace(">", "]").replace("{", "[").replace("}", "]")
+        data[key] = json.loads(value)
+    return data
+
+
+def loads(text):
+    """
+    to parse an instance written by ``Instance.generate()`` in either 'json' or 'opl' style
+
+    :param text: content of an instance file
+    :exception: QCSPGenException
+    :return: dict with the keys in ``FIELDS``, where Phi and Psi are lists of (i, j) tuples
+    """
+    try:
+        data = json.loads(text) if text.lstrip().startswith("{") else _opl_loads(text)
+    except ValueError as e:
+        raise QCSPGenException("- instance cannot be parsed: %s" % e)
+
+    for k in FIELDS:
+        if k not in data:
+            raise QCSPGenException("- instance field %s is missing!" % k)
+    data["Phi"] = [tuple(a) for a in data["Phi"]]
+    data["Psi"] = [tuple(a) for a in data["Psi"]]
+    return data
+
+
+def read(filename):
+    """
+    to read an instance file
+
+    :param filename: the instance file name
+    :exception: QCSPGenException
+    :return: dict of instance data, see ``loads()``
+    """
+    with open(filename) as f:
+        return loads(f.read())
+
+
+def as_data(instance):
+    """
+    to accept either an ``Instance`` object or instance data, e.g., the output of ``read()``
+
+    :param instance: an Instance object or a dict of instance data
+    :return: dict of instance data
+    """
+    if isinstance(instance, dict):
+        return instance
+    return instance.data()
+
+
+class ProcessingTimes(object):
+    """
+    q x n view of the processing times of the tasks on every QC, i.e., p_i / e_k on a QC k with handling efficiency
+    e_k. Only p and the per QC efficiencies are stored: the row of a QC is computed on its first access and then kept,
+    and all the QCs with efficiency 1 share the list p itself. Example:
+    ::
+
+        d = reader.read("QCSP_1.json")
+        pt = reader.ProcessingTimes(d["p"], d.get("e", [1] * d["q"]))
+        pt[k][i]  # processing time of task i+1 on QC k+1
+
+    :param p: the processing times of the tasks
+    :param e: the handling efficiencies of the QCs
+    """
+
+    def __init__(self, p, e):
+        super(ProcessingTimes, self).__init__()
+        self.__p = list(p)
+        self.__e = list(e)
+        self.__rows = {}
+
+    def __getitem__(self, k):
+        row = self.__rows.get(k)
+        if row is None:
+            e = self.__e[k]
+            if e == 1:
+                row = self.__p
+            elif e > 0:
+                row = [float(x) / e for x in self.__p]
+            else:
+                # a QC without handling efficiency cannot process any work
+                row = [float("inf") if x else 0 for x in self.__p]
+            self.__rows[k] = row
+        return row
+
+    def __len__(self):
+        return len(self.__e)
+
+    def materialize(self):
+        """
+        to compute all the rows
+
+        :return: list of q lists of n processing times
+        """
+        return [self[k] for k in range(len(self))]
+
+    @property
+    def scale(self):
+        """
+        getter for the per QC scale of the processing times
+
+        :return: list of 1 / e_k
+        """
+        return [1.0 / e if e > 0 else float("inf") for e in self.__e]
+
+
+def processing_times(instance):
+    """
+    to get the per QC processing times of an instance, which are p on every QC if the instance has no handling
+    efficiencies
+
+    :param instance: an Instance object or a dict of instance data
+    :return: a ProcessingTimes view
+    """
+    d = as_data(instance)
+    return ProcessingTimes(d["p"], d.get("e") or [1] * d["q"])
+
+
+def find(paths):
+    """
+    to list the instance files of the given files and directories (directories are searched recursively)
+
+    :param paths: a file/directory name or a list of them
+    :return: sorted list of file names
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, f) for f in names
+                             if os.path.splitext(f)[1] in EXTENSIONS and not f.endswith(SIDECARS))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,213 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+from array import array
+import base64
+import json
+
+
+class Relation(object):
+    """
+    compressed representation of a binary relation over tasks 1..n, e.g., the precedence set Phi or the
+    non-simultaneity set Psi. The relation is kept twice:
+
+    * in CSR form (`indptr`, `indices`), so that the neighbors of a task are a contiguous sorted slice
+    * as a packed bitset matrix (one row of ``row_bytes`` bytes per task), so that membership is a single byte lookup
+
+    example:
+    ::
+
+        phi = Relation(5, [(1, 2), (2, 3)])
+        print((1, 2) in phi, list(phi.neighbors(2)))
+
+    :param n: number of tasks
+    :param pairs: a list of (i, j) pairs with 1 <= i, j <= n
+    :param symmetric: if True, (i, j) also relates j to i, which is the case for Psi
+    """
+
+    def __init__(self, n, pairs, symmetric=False):
+        super(Relation, self).__init__()
+        self.__n = n
+        self.__symmetric = symmetric
+        self.__bits = None
+
+        rows = [[] for _ in range(n)]
+        for i, j in pairs:
+            if not (1 <= i <= n and 1 <= j <= n):
+                raise QCSPGenException("- pair (%d, %d) is out of range [1, %d]" % (i, j, n))
+            rows[i-1].append(j)
+            if symmetric:
+                rows[j-1].append(i)
+
+        self.__indptr = array('l', [0])
+        self.__indices = array('l')
+        for r in rows:
+            self.__indices.extend(sorted(set(r)))
+            self.__indptr.append(len(self.__indices))
+
+    @property
+    def n(self):
+        """
+        getter for the number of tasks
+
+        :return: number of tasks
+        """
+        return self.__n
+
+    @property
+    def symmetric(self):
+        """
+        getter for symmetry
+
+        :return: True if the relation is stored in both directions
+        """
+        return self.__symmetric
+
+    @property
+    def indptr(self):
+        """
+        getter for CSR row pointers, the neighbors of task i are ``indices[indptr[i-1]:indptr[i]]``
+
+        :return: row pointers of length n+1
+        """
+        return self.__indptr
+
+    @property
+    def indices(self):
+        """
+        getter for CSR column indices
+
+        :return: the concatenated sorted neighbor lists
+        """
+        return self.__indices
+
+    @property
+    def row_bytes(self):
+        """
+        getter for the number of bytes per row of the bitset matrix
+
+        :return: bytes per row
+        """
+        return (self.__n + 7) // 8
+
+    @property
+    def bits(self):
+        """
+        getter for the packed bitset matrix, built on first use. Bit j-1 of row i-1 is set iff (i, j) is related.
+
+        :return: bytearray of n*row_bytes bytes
+        """
+        if self.__bits is None:
+            width = self.row_bytes
+            bits = bytearray(self.__n * width)
+            for i in range(self.__n):
+                offset = i * width
+                for j in self.__indices[self.__indptr[i]:self.__indptr[i+1]]:
+                    bits[offset + ((j-1) >> 3)] |= 1 << ((j-1) & 7)
+            self.__bits = bits
+        return self.__bits
+
+    @property
+    def size(self):
+        """
+        getter for the number of stored (directed) pairs
+
+        :return: number of stored pairs
+        """
+        return len(self.__indices)
+
+    def neighbors(self, i):
+        """
+        to get the tasks related to task i
+
+        :param i: task index
+        :return: sorted array of task indices
+        """
+        return self.__indices[self.__indptr[i-1]:self.__indptr[i]]
+
+    def degree(self, i):
+        """
+        to get the number of tasks related to task i
+
+        :param i: task index
+        :return: number of neighbors
+        """
+        return self.__indptr[i] - self.__indptr[i-1]
+
+    def pairs(self):
+        """
+        to iterate over all the stored (i, j) pairs row by row
+
+        :return: a generator of pairs
+        """
+        for i in range(1, self.__n + 1):
+            for j in self.neighbors(i):
+                yield i, j
+
+    def __contains__(self, pair):
+        i, j = pair
+        if not (1 <= i <= self.__n and 1 <= j <= self.__n):
+            return False
+        return bool(self.bits[(i-1) * self.row_bytes + ((j-1) >> 3)] >> ((j-1) & 7) & 1)
+
+    def to_dict(self):
+        """
+        to convert the relation into a json serializable dict
+
+        :return: dict with CSR arrays and the base64 encoded bitset matrix
+        """
+        return {
+            "n": self.__n,
+            "symmetric": self.__symmetric,
+            "indptr": self.__indptr.tolist(),
+            "indices": self.__indices.tolist(),
+            "bits": base64.b64encode(bytes(self.bits)).decode("ascii")
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """
+        to restore a relation from ``to_dict()`` output without rebuilding it from pairs
+
+        :param data: dict produced by ``to_dict()``
+        :return: a relation
+        """
+        r = Relation(data["n"], [], data["symmetric"])
+        r.__indptr = array('l', data["indptr"])
+        r.__indices = array('l', data["indices"])
+        if "bits" in data:
+            r.__bits = bytearray(base64.b64decode(data["bits"]))
+        return r
+
+    def __str__(self):
+        return "Relation n={0} pairs={1} symmetric={2}".format(self.__n, self.size, self.__symmetric)
+
+    __repr__ = __str__
+
+
+def dump(relations, filename):
+    """
+    to write named relations, e.g., {"Phi": ..., "Psi": ...}, into a json file
+
+    :param relations: dict name -> relation
+    :param filename: the output file name
+    :return: None
+    """
+    with open(filename, "w") as f:
+        json.dump(dict((k, r.to_dict()) for k, r in relations.items()), f)
+
+
+def load(filename):
+    """
+    to read relations written by ``dump()``
+
+    :param filename: the input file name
+    :return: dict name -> relation
+    """
+    with open(filename) as f:
+        return dict((k, Relation.from_dict(d)) for k, d in json.load(f).items())
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,278 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import bisect
+import math
+
+
+def _normal_mass(a, b):
+    """
+    probability that a standard normal variable falls into [a, b), computed on the tail side of the interval so that
+    bays far from the mean keep their (small) probability instead of cancelling to 0
+    """
+    if a >= 0:
+        return 0.5 * (math.erfc(a / math.sqrt(2)) - math.erfc(b / math.sqrt(2)))
+    if b <= 0:
+        return 0.5 * (math.erfc(-b / math.sqrt(2)) - math.erfc(-a / math.sqrt(2)))
+    return 1.0 - 0.5 * (math.erfc(-a / math.sqrt(2)) + math.erfc(b / math.sqrt(2)))
+
+
+def truncated_normal_weights(size, mean, std):
+    """
+    to compute the bay probabilities of ``Vessel.sample_gauss``: a gaussian sample truncated to an int (towards zero)
+    and redrawn until it is in [1, size]. Bay k is drawn for samples in [k, k+1), so its probability is the normal
+    mass of [k, k+1) divided by the mass of [1, size+1).
+
+    :param size: the number of bays
+    :param mean: mean of the gaussian distribution
+    :param std: std of the gaussian distribution
+    :exception: QCSPGenException if no bay can be drawn
+    :return: list of the probabilities of the bays 1..size
+    """
+    if std > 0:
+        weights = [_normal_mass((k - mean) / float(std), (k + 1 - mean) / float(std)) for k in range(1, size + 1)]
+    else:
+        weights = [1.0 if k == int(mean) else 0.0 for k in range(1, size + 1)]
+    total = sum(weights)
+    if not total > 0:
+        raise QCSPGenException("- no bay in [1, %d] can be drawn with mean %r and std %r" % (size, mean, std))
+    return [w / total for w in weights]
+
+
+class InverseCDFSampler(object):
+    """
+    exact sampler of a discrete distribution over the bays 1..size by inversion of its cumulative distribution: one
+    uniform number and a binary search per draw, whatever the distribution. Example, the bay distribution of ``cl2``
+    with means 3 and 8:
+    ::
+
+        weights = [(w1 + w2) / 2 for w1, w2 in zip(truncated_normal_weights(10, 3, 2.5),
+                                                   truncated_normal_weights(10, 8, 2.5))]
+        bays = InverseCDFSampler(weights).sample_batch(random.Random(1), 100)
+
+    :param weights: the non-negative weights of the bays 1..size, not necessarily normalized
+    """
+    def __init__(self, weights):
+        super(InverseCDFSampler, self).__init__()
+        self.__cumulative = []
+        total = 0.0
+        for w in weights:
+            if w < 0:
+                raise QCSPGenException("- bay weights must be non-negative!")
+            total += w
+            self.__cumulative.append(total)
+        if not total > 0:
+            raise QCSPGenException("- at least one bay weight must be positive!")
+        self.__last = max(k for k, w in enumerate(weights) if w > 0)
+
+    def sample(self, rng):
+        """
+        to draw a bay
+
+        :param rng: the random number generator
+        :return: a bay in 1..size
+        """
+        # bays of zero weight are never drawn, min() guards against rounding at the end of the table
+        return min(bisect.bisect_right(self.__cumulative, rng.random() * self.__cumulative[-1]), self.__last) + 1
+
+    def sample_batch(self, rng, n):
+        """
+        to draw n bays
+
+        :param rng: the random number generator
+        :param n: the number of draws
+        :return: a list of n bays in 1..size
+        """
+        cumulative, total, last = self.__cumulative, self.__cumulative[-1], self.__last
+        random, search = rng.random, bisect.bisect_right
+        return [min(search(cumulative, random() * total), last) + 1 for _ in range(n)]
+
+    @property
+    def size(self):
+        """
+        getter for the number of bays
+
+        :return: the number of bays
+        """
+        return len(self.__cumulative)
+
+
+class AliasSampler(object):
+    """
+    sampler of a discrete distribution over the bays 1..size by Walker's alias method (Vose's construction): the table
+    is built in O(size) once, then every draw takes one uniform number and O(1) time. Example:
+    ::
+
+        sampler = AliasSampler([3, 1, 0, 1, 5])
+        bays = sampler.sample_batch(random.Random(1), 100)
+
+    :param weights: the non-negative weights of the bays 1..size, not necessarily normalized
+    """
+    def __init__(self, weights):
+        super(AliasSampler, self).__init__()
+        weights = [float(w) for w in weights]
+        if any(w < 0 for w in weights):
+            raise QCSPGenException("- bay weights must be non-negative!")
+        total = sum(weights)
+        if not total > 0:
+            raise QCSPGenException("- at least one bay weight must be positive!")
+        size = len(weights)
+        scaled = [w * size / total for w in weights]
+        self.__probability = [1.0] * size
+        self.__alias = list(range(size))
+        small = [k for k, w in enumerate(scaled) if w < 1.0]
+        large = [k for k, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.__probability[s] = scaled[s]
+            self.__alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # what is left is 1 up to rounding, except for bays of zero weight that must never be drawn
+        for k in small + large:
+            self.__probability[k] = 1.0 if weights[k] > 0 else 0.0
+            if not weights[k] > 0:
+                self.__alias[k] = max(range(size), key=lambda x: weights[x])
+
+    def sample(self, rng):
+        """
+        to draw a bay
+
+        :param rng: the random number generator
+        :return: a bay in 1..size
+        """
+        return self.sample_batch(rng, 1)[0]
+
+    def sample_batch(self, rng, n):
+        """
+        to draw n bays
+
+        :param rng: the random number generator
+        :param n: the number of draws
+        :return: a list of n bays in 1..size
+        """
+        probability, alias, size = self.__probability, self.__alias, len(self.__probability)
+        random = rng.random
+        bays = []
+        for _ in range(n):
+            u = random() * size
+            k = min(int(u), size - 1)
+            bays.append((k if u - k < probability[k] else alias[k]) + 1)
+        return bays
+
+    @property
+    def size(self):
+        """
+        getter for the number of bays
+
+        :return: the number of bays
+        """
+        return len(self.__probability)
+
+
+def rescale_profile(weights, size):
+    """
+    to stretch or shrink a bay weight profile to another number of bays. The profile is seen as a step function over
+    the length of the vessel and bay k of the result gets the weight on [(k-1)/size, k/size).
+
+    :param weights: the weights of the profile's bays
+    :param size: the number of bays of the result
+    :return: list of size weights with the same total
+    """
+    m = len(weights)
+    if m == size:
+        return list(weights)
+    result = []
+    for k in range(size):
+        # the bay covers [k*m/size, (k+1)*m/size) in profile bays
+        left, right = float(k * m) / size, float((k + 1) * m) / size
+        w = 0.0
+        x = int(left)
+        while x < m and x < right:
+            w += weights[x] * (min(right, x + 1) - max(left, x))
+            x += 1
+        result.append(w)
+    return result
+
+
+# name -> weight profile, sampler object or factory, see register_distribution
+_DISTRIBUTIONS = {}
+
+
+def register_distribution(name, distribution):
+    """
+    to register a task bay distribution pattern, which can then be used as ``Vessel(loc=name, ...)``. The
+    distribution is one of
+
+    * a weight profile, i.e., a list of non-negative per bay weights, e.g., taken from real stowage data. It is
+      rescaled to the number of bays of a vessel (see ``rescale_profile()``) and sampled by an ``AliasSampler``.
+    * a sampler object with a method ``sample_batch(rng, n)`` returning n bays in 1..b
+    * a function vessel -> weight profile or sampler object, called once per vessel, for distributions that depend on
+      the vessel parameters
+
+    Example:
+    ::
+
+        sampling.register_distribution("bow_heavy", [8, 6, 5, 4, 3, 3, 2, 2, 1, 1])
+        v = Vessel(b=20, c=600, f=0.5, d=1.0, g=0.0, n=50, loc="bow_heavy")
+
+    The registry is module state of the process: register patterns before starting threads that generate instances,
+    and in every worker process, e.g., in a pool initializer, since workers started with *spawn* (the default on
+    Windows and macOS, also for ``Instance.iter_generate(workers=...)``) do not see the registrations of the parent.
+
+    :param name: the pattern name, not one of ``Vessel.BAY_DISTRIBUTION_PATTERN``
+    :param distribution: a weight profile, a sampler object or a function vessel -> either of them
+    :exception: QCSPGenException
+    :return: None
+    """
+    from .vessel import Vessel
+    name = name.lower()
+    if name in Vessel.BAY_DISTRIBUTION_PATTERN:
+        raise QCSPGenException("- %s is a built-in task bay distribution pattern" % name)
+    if not (callable(distribution) or hasattr(distribution, "sample_batch")):
+        AliasSampler(distribution)
+    _DISTRIBUTIONS[name] = distribution
+
+
+def unregister_distribution(name):
+    """
+    to remove a registered task bay distribution pattern
+
+    :param name: the pattern name
+    :return: None
+    """
+    _DISTRIBUTIONS.pop(name.lower(), None)
+
+
+def distributions():
+    """
+    getter for the registered pattern names
+
+    :return: sorted list of pattern names
+    """
+    return sorted(_DISTRIBUTIONS)
+
+
+def distribution_sampler(name, vessel):
+    """
+    to build the sampler of a registered pattern for a vessel
+
+    :param name: the pattern name
+    :param vessel: the vessel whose tasks are distributed
+    :exception: QCSPGenException if the pattern is not registered
+    :return: an object with a method ``sample_batch(rng, n)``
+    """
+    try:
+        distribution = _DISTRIBUTIONS[name]
+    except KeyError:
+        raise QCSPGenException("- task bay distribution pattern %s is not registered" % name)
+    if callable(distribution) and not hasattr(distribution, "sample_batch"):
+        distribution = distribution(vessel)
+    if hasattr(distribution, "sample_batch"):
+        return distribution
+    return AliasSampler(rescale_profile(distribution, vessel.bay_size))
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,394 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import collections
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+
+
+CONTENT_TYPE = {"json": "application/json", "opl": "text/plain"}
+
+
+class MemoryCache(object):
+    """
+    thread safe LRU cache of serialized instances
+
+    :param size: the maximal number of cached instances
+    """
+
+    def __init__(self, size=256):
+        super(MemoryCache, self).__init__()
+        self.size = size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        to look up an instance and to mark it as recently used
+
+        :param key: the cache key
+        :return: the serialized instance, None if it is not cached
+        """
+        with self._lock:
+            text = self._entries.pop(key, None)
+            if text is not None:
+                self._entries[key] = text
+            return text
+
+    def put(self, key, text):
+        """
+        to cache an instance, evicting the least recently used one if the cache is full
+
+        :param key: the cache key
+        :param text: the serialized instance
+        :return: None
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = text
+            while len(self._entries) > self.size:
+                self._evict(self._entries.popitem(last=False)[0])
+
+    def _evict(self, key):
+        pass
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache(MemoryCache):
+    """
+    LRU cache of serialized instances in a directory, one file per instance, which survives restarts of the service
+    and can be shared by services on one machine. Only the keys are kept in memory; the recency order is restored
+    from the file modification times.
+
+    :param directory: the cache directory
+    :param size: the maximal number of cached instances
+    """
+
+    SUFFIX = ".cache"
+
+    def __init__(self, directory, size=4096):
+        super(DiskCache, self).__init__(size)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        names = [f for f in os.listdir(directory) if f.endswith(DiskCache.SUFFIX)]
+        for f in sorted(names, key=lambda x: os.path.getmtime(os.path.join(directory, x))):
+            self._entries[f[:-len(DiskCache.SUFFIX)]] = True
+        # the directory may have been filled by a service with a larger cache
+        while len(self._entries) > self.size:
+            self._evict(self._entries.popitem(last=False)[0])
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key + DiskCache.SUFFIX)
+
+    def get(self, key):
+        key = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        if super(DiskCache, self).get(key) is None:
+            return None
+        try:
+            with open(self._filename(key), "rb") as f:
+                text = f.read().decode("utf-8")
+            os.utime(self._filename(key), None)
+            return text
+        except (IOError, OSError):
+            return None
+
+    def put(self, key, text):
+        key = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        temporary = "%s.%d.%d.tmp" % (self._filename(key), os.getpid(), threading.current_thread().ident)
+        try:
+            with open(temporary, "wb") as f:
+                f.write(text.encode("utf-8"))
+            os.rename(temporary, self._filename(key))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        super(DiskCache, self).put(key, True)
+
+    def _evict(self, key):
+        try:
+            os.remove(self._filename(key))
+        except OSError:
+            pass
+
+
+class _Latency(object):
+    # count, total and a window of the latest request latencies for percentiles
+
+    def __init__(self, window=1000):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.window = collections.deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.window.append(seconds)
+
+    def summary(self):
+        latest = sorted(self.window)
+
+        def percentile(x):
+            return 1000 * latest[min(len(latest) - 1, int(x * len(latest)))] if latest else 0.0
+        return {"count": self.count, "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+                "p50_ms": percentile(0.5), "p95_ms": percentile(0.95), "max_ms": 1000 * self.maximum}
+
+
+def _normalize(value):
+    # 1 and 1.0 are the same parameter value, and thus the same instance and cache entry
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(x) for x in value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _check_volume(params):
+    # the vessel cuts n tasks from its handling volume f*b*c and would look for more cuts forever
+    try:
+        volume = int(params["f"] * params["b"] * params["c"])
+    except (KeyError, TypeError, ValueError):
+        # left to the generation to report
+        return
+    if isinstance(params.get("n"), int) and params["n"] > volume:
+        raise QCSPGenException("- n=%d tasks cannot be cut from a handling volume of %d" % (params["n"], volume))
+
+
+def _value(text):
+    # numbers stay numbers, ints stay ints, comma separated values are per QC tuples
+    if "," in text:
+        return tuple(_value(x) for x in text.split(","))
+    for t in (int, float):
+        try:
+            return t(text)
+        except ValueError:
+            pass
+    return text
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = dict((k, _value(v[-1])) for k, v in parse_qs(url.query).items())
+        self._respond(url.path, query)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8") or "{}")
+            query = dict((k, tuple(v) if isinstance(v, list) else v) for k, v in body.items())
+        except (ValueError, AttributeError):
+            self._send(400, "text/plain", "- request body is not a json object\n")
+            return
+        self._respond(url.path, query)
+
+    def _respond(self, path, query):
+        status, content_type, text = self.server.service.handle(path, query)
+        self._send(status, content_type, text)
+
+    def _send(self, status, content_type, text):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        if not self.server.service.quiet:
+            BaseHTTPRequestHandler.log_message(self, *args)
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class InstanceService(object):
+    """
+    local HTTP service which generates instances on demand, with only the standard library. Repeated requests are
+    served from an LRU cache (in memory, or on disk with `cache_dir`), misses are generated by a process pool, and
+    concurrent requests for the same instance wait for one generation. Requests:
+
+    * ``GET /instance?n=10&b=10&c=200&f=0.5&d=1.0&g=0.0&loc=uni&q=2&t=1&ready_time=0&safety_margin=1&seed=1``: the
+      instance of ``Instance.from_parameters()``; per QC values are comma separated, e.g., ``ready_time=0,2``, and
+      numbers are taken by value, e.g., ``seed=1`` and ``seed=1.0`` are the same instance
+    * ``GET /benchmark/B/12``: the instance of file QCSP_Set_B_12.json, see ``qcspgen.benchmark_set()``
+    * ``POST /instance`` with the parameters as a json object
+    * ``GET /metrics``: the numbers of requests, cache hits, misses and errors, and the latencies of hits and misses
+
+    The optional parameters `style` ('json' by default or 'opl') and `phi` ('raw', 'reduced' or 'closed') select the
+    output. Invalid parameters are answered with status 400 and the error message, and generations that take longer
+    than `timeout` with status 504. Example:
+    ::
+
+        service = InstanceService(port=8080, workers=4, cache_dir="/var/cache/qcspgen")
+        service.serve_forever()
+
+        # curl "http://localhost:8080/benchmark/A/1?style=opl"
+
+    :param host: the host name or address to listen on
+    :param port: the port to listen on, 0 for any free port (see `address`)
+    :param cache_size: the maximal number of cached instances
+    :param cache_dir: if given, instances are cached in this directory instead of in memory
+    :param workers: the number of generator processes, default is the number of CPUs
+    :param timeout: the seconds a request waits for the generation of an instance
+    :param quiet: if False, every request is logged to stderr
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, cache_size=256, cache_dir=None, workers=None, timeout=60,
+                 quiet=True):
+        super(InstanceService, self).__init__()
+        self.cache = DiskCache(cache_dir, cache_size) if cache_dir else MemoryCache(cache_size)
+        self.timeout = timeout
+        self.quiet = quiet
+        self.__pool = multiprocessing.Pool(workers)
+        self.__lock = threading.Lock()
+        self.__in_flight = {}
+        self.__counts = {"requests": 0, "hits": 0, "misses": 0, "errors": 0}
+        self.__latency = {"hit": _Latency(), "miss": _Latency()}
+        self.__server = _Server((host, port), _Handler)
+        self.__server.service = self
+
+    @property
+    def address(self):
+        """
+        getter for the address the service listens on
+
+        :return: (host, port)
+        """
+        return self.__server.server_address[:2]
+
+    def serve_forever(self):
+        """
+        to serve requests until ``shutdown()`` is called
+
+        :return: None
+        """
+        try:
+            self.__server.serve_forever()
+        finally:
+            self.__server.server_close()
+            self.__pool.terminate()
+            self.__pool.join()
+
+    def shutdown(self):
+        """
+        to stop ``serve_forever()`` from another thread
+
+        :return: None
+        """
+        self.__server.shutdown()
+
+    def handle(self, path, query):
+        """
+        to answer a request
+
+        :param path: the request path
+        :param query: dict of the request parameters
+        :return: (http status, content type, body)
+        """
+        from .qcspgen import benchmark_set
+        started = time.time()
+        with self.__lock:
+            self.__counts["requests"] += 1
+        parts = [p for p in path.split("/") if p]
+        if parts == ["metrics"]:
+            return 200, CONTENT_TYPE["json"], json.dumps(self.metrics(), sort_keys=True)
+
+        style = query.pop("style", "json")
+        phi = query.pop("phi", "raw")
+        try:
+            if parts == ["instance"]:
+                seed = _normalize(query.pop("seed", None))
+                params = dict((k, _normalize(v)) for k, v in query.items())
+                _check_volume(params)
+            elif len(parts) == 3 and parts[0] == "benchmark":
+                instances = benchmark_set(parts[1].upper())
+                if not 1 <= int(parts[2]) <= len(instances):
+                    return self._error(404, "- set %s has the instances 1..%d" % (parts[1].upper(), len(instances)))
+                params, seed = instances[int(parts[2]) - 1]
+            else:
+                return self._error(404, "- unknown path %s" % path)
+            if style not in CONTENT_TYPE:
+                raise QCSPGenException("- style %r is not in %r" % (style, tuple(CONTENT_TYPE)))
+            text, hit = self._instance(params, seed, style, phi)
+        except (QCSPGenException, TypeError, ValueError) as e:
+            return self._error(400, getattr(e, "message", None) or str(e))
+        except multiprocessing.TimeoutError:
+            return self._error(504, "- the instance is not generated within %r seconds" % self.timeout)
+
+        with self.__lock:
+            self.__counts["hits" if hit else "misses"] += 1
+            self.__latency["hit" if hit else "miss"].add(time.time() - started)
+        return 200, CONTENT_TYPE[style], text
+
+    def _error(self, status, message):
+        with self.__lock:
+            self.__counts["errors"] += 1
+        return status, "text/plain", message.rstrip("\n") + "\n"
+
+    def _instance(self, params, seed, style, phi):
+        """
+        to get an instance from the cache, or to generate it in the pool; concurrent misses of one instance share the
+        same generation
+
+        :exception: multiprocessing.TimeoutError if the generation takes longer than `timeout`
+        :return: (serialized instance, True if it was cached)
+        """
+        from .qcspgen import _generate_job
+        key = json.dumps([sorted(params.items()), seed, style, phi])
+        text = self.cache.get(key)
+        if text is not None:
+            return text, True
+        with self.__lock:
+            result = self.__in_flight.get(key)
+            owner = result is None
+            if owner:
+                result = self.__pool.apply_async(_generate_job, ((params, seed, style, phi),))
+                self.__in_flight[key] = result
+        try:
+            text = result.get(self.timeout)
+            if owner:
+                self.cache.put(key, text)
+        finally:
+            if owner:
+                with self.__lock:
+                    del self.__in_flight[key]
+        return text, False
+
+    def metrics(self):
+        """
+        getter for the service metrics
+
+        :return: dict with the numbers of 'requests', cache 'hits', 'misses' and 'errors', the 'cached' instances, \
+        the generations 'in_flight' and per 'hit'/'miss' the latency count, mean, median, 95th percentile and maximum
+        """
+        with self.__lock:
+            metrics = dict(self.__counts)
+            metrics["cached"] = len(self.cache)
+            metrics["in_flight"] = len(self.__in_flight)
+            metrics["latency"] = dict((k, v.summary()) for k, v in self.__latency.items())
+        return metrics
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+from collections import namedtuple
+from . import reader
+
+
+# makespan: latest completion time (inf if the schedule deadlocks on Phi); start/completion: per task (None if the
+# task could not be processed)
+Schedule = namedtuple("Schedule", ["makespan", "start", "completion"])
+
+
+class Simulator(object):
+    r"""
+    crane movement simulator to evaluate schedules on one instance. The instance data is compiled once into flat,
+    1-based arrays so that a schedule is evaluated in O(n + \|Phi\|). A schedule gives, for every QC, the sequence of
+    tasks it processes. A QC becomes available at its ready time `r` at its initial bay `l0`, needs `t` per bay to
+    travel, and a task can only start when all its predecessors in Phi are completed. With handling efficiencies `e`,
+    task i takes p_i / e_k on QC k (see ``reader.ProcessingTimes``). Example:
+    ::
+
+        sim = Simulator(instance)
+        sim.makespan([[1, 2, 3], [4, 5]])
+        schedule = sim.evaluate([[1, 2, 3], [4, 5]])
+
+    Non-simultaneity and crane interference are not modelled here, see ``feasibility`` for checking them.
+
+    :param instance: an Instance object or a dict of instance data
+    """
+
+    def __init__(self, instance):
+        super(Simulator, self).__init__()
+        d = reader.as_data(instance)
+        self.__n = d["n"]
+        self.__q = d["q"]
+        self.__p = reader.ProcessingTimes([0] + list(d["p"]), d.get("e") or [1] * self.__q)
+        self.__l = [0] + list(d["l"])
+        self.__r = list(d["r"])
+        self.__l0 = list(d["l0"])
+        self.__t = list(d["t"])
+
+        # successors in CSR form and number of predecessors, both indexed by task
+        successors = [[] for _ in range(self.__n + 1)]
+        self.__n_predecessors = [0] * (self.__n + 1)
+        for i, j in d["Phi"]:
+            successors[i].append(j)
+            self.__n_predecessors[j] += 1
+        self.__succ_ptr = [0]
+        self.__succ = []
+        for s in successors:
+            self.__succ.extend(s)
+            self.__succ_ptr.append(len(self.__succ))
+
+    def _check(self, sequences):
+        if len(sequences) != self.__q:
+            raise QCSPGenException("- %d task sequences are given for %d QCs" % (len(sequences), self.__q))
+        seen = [False] * (self.__n + 1)
+        for seq in sequences:
+            for i in seq:
+                if not 1 <= i <= self.__n:
+                    raise QCSPGenException("- task %r is out of range [1, %d]" % (i, self.__n))
+                if seen[i]:
+                    raise QCSPGenException("- task %d is assigned more than once" % i)
+                seen[i] = True
+        if not all(seen[1:]):
+            raise QCSPGenException("- tasks %r are not assigned" % [i for i in range(1, self.__n + 1) if not seen[i]])
+
+    def _run(self, sequences, start=None):
+        l, t = self.__l, self.__t
+        succ_ptr, succ = self.__succ_ptr, self.__succ
+        missing = self.__n_predecessors[:]
+        ready = [0] * (self.__n + 1)
+        waiting = [-1] * (self.__n + 1)
+        clock = self.__r[:]
+        here = self.__l0[:]
+        position = [0] * len(sequences)
+        stack = list(range(len(sequences)))
+        makespan = 0
+        done = 0
+
+        while stack:
+            k = stack.pop()
+            seq = sequences[k]
+            c, h, tk, x, p = clock[k], here[k], t[k], position[k], self.__p[k]
+            while x < len(seq):
+                i = seq[x]
+                if missing[i]:
+                    waiting[i] = k
+                    break
+                s = c + tk * abs(l[i] - h)
+                if ready[i] > s:
+                    s = ready[i]
+                if start is not None:
+                    start[i] = s
+                c = s + p[i]
+                h = l[i]
+                for y in range(succ_ptr[i], succ_ptr[i+1]):
+                    j = succ[y]
+                    if c > ready[j]:
+                        ready[j] = c
+                    missing[j] -= 1
+                    if not missing[j] and waiting[j] >= 0:
+                        stack.append(waiting[j])
+                x += 1
+            if x > position[k]:
+                done += x - position[k]
+                if c > makespan:
+                    makespan = c
+            clock[k], here[k], position[k] = c, h, x
+
+        if done < sum(len(seq) for seq in sequences):
+            return float("inf")
+        return makespan
+
+    def makespan(self, sequences):
+        """
+        to compute the makespan of a schedule without any further output, as fast as possible. The sequences are not
+        checked, use ``evaluate()`` for that.
+
+        :param sequences: a list of q task sequences, one per QC, with 1-based task indices
+        :return: the makespan, inf if the sequences contradict Phi
+        """
+        return self._run(sequences)
+
+    def evaluate(self, sequences):
+        """
+        to simulate a schedule
+
+        :param sequences: a list of q task sequences, one per QC, with 1-based task indices
+        :exception: QCSPGenException if not every task is assigned to exactly one QC
+        :return: a Schedule tuple
+        """
+        self._check(sequences)
+        start = [None] * (self.__n + 1)
+        makespan = self._run(sequences, start)
+        completion = [None] * (self.__n + 1)
+        for k, seq in enumerate(sequences):
+            p = self.__p[k]
+            for i in seq:
+                if start[i] is not None:
+                    completion[i] = start[i] + p[i]
+        return Schedule(makespan, start[1:], completion[1:])
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+from .task import Task
+from .vessel import Vessel
+from . import compat
+import csv
+import functools
+import io
+import multiprocessing
+import os
+import sys
+
+
+# the handling sequence of a bay: discharge deck, discharge hold, load hold, load deck
+STAGES = (("D", "deck"), ("D", "hold"), ("L", "hold"), ("L", "deck"))
+# default csv column names of the container moves
+COLUMNS = {"bay": "bay", "tier": "tier", "move": "move"}
+# first letter of the move type -> moves: restows are discharged and loaded again
+MOVES = {"D": ("D",), "L": ("L",), "R": ("D", "L")}
+
+
+def _open(filename):
+    if sys.version_info[0] < 3:
+        return open(filename, "rb")
+    return io.open(filename, newline="", encoding="utf-8-sig")
+
+
+def read_moves(filename, columns=None, deck_tier=80, iso_bays=True, delimiter=","):
+    """
+    to stream the container moves of a stowage/discharge list, one csv row per container, e.g.,
+    ::
+
+        bay,row,tier,move
+        03,02,84,D
+        06,01,06,L
+
+    Only one row is held in memory at a time, so files of any size can be read.
+
+    :param filename: the csv file name, the first line holds the column names
+    :param columns: dict mapping 'bay', 'tier' and 'move' to the csv column names, see ``COLUMNS``
+    :param deck_tier: the lowest tier on deck, lower tiers are in the hold (ISO numbering: hold 02-20, deck 80+)
+    :param iso_bays: if True, ISO bay numbers are converted to vessel bays, i.e., bay 01 is 1, bay 03 is 2 and a 40'
+        bay, e.g., 02, is the bay of its fore 20' bay. Otherwise, the bay numbers are used as is.
+    :param delimiter: the csv delimiter
+    :exception: QCSPGenException if a row cannot be read
+    :return: generator of (bay, 'deck' or 'hold', 'D' or 'L') tuples
+    """
+    names = dict(COLUMNS, **(columns or {}))
+    with _open(filename) as f:
+        rows = csv.reader(f, delimiter=str(delimiter))
+        header = next(rows, None) or []
+        try:
+            bay, tier, move = (header.index(names[key]) for key in ("bay", "tier", "move"))
+        except ValueError:
+            raise QCSPGenException("- %s: the columns %s are not all in the header %s" %
+                                   (filename, [names[key] for key in ("bay", "tier", "move")], header))
+        for line, row in enumerate(rows, 2):
+            if not row:
+                continue
+            try:
+                x = int(row[bay])
+                area = "deck" if int(row[tier]) >= deck_tier else "hold"
+                kinds = MOVES[row[move].strip()[:1].upper()]
+            except (IndexError, ValueError, KeyError):
+                raise QCSPGenException("- %s:%d: cannot read the move %r" % (filename, line, row))
+            if iso_bays:
+                x = (x + 1) // 2
+            if x < 1:
+                raise QCSPGenException("- %s:%d: bay %s is not a vessel bay" % (filename, line, row[bay]))
+            for kind in kinds:
+                yield x, area, kind
+
+
+def count_groups(moves):
+    """
+    to count the moves of every container group, i.e., the moves of a bay with the same area and move type
+
+    :param moves: iterable of (bay, area, move) tuples, e.g., ``read_moves()``
+    :return: dict (bay, stage) -> number of moves, stage is the position in ``STAGES``
+    """
+    stage = dict(((kind, area), k) for k, (kind, area) in enumerate(STAGES))
+    groups = {}
+    for x, area, kind in moves:
+        key = (x, stage[(kind, area)])
+        groups[key] = groups.get(key, 0) + 1
+    return groups
+
+
+def build_vessel(groups, b=None, c=None, max_group=None):
+    """
+    to build a vessel from counted container groups. Every group is a task whose processing time is its number of
+    moves (groups larger than `max_group` are split into tasks of nearly equal size). The tasks stay in their bays
+    and Phi follows the handling sequence ``STAGES`` of every bay: each task of a stage precedes each task of the next
+    non-empty stage.
+
+    :param groups: dict (bay, stage) -> number of moves, see ``count_groups()``
+    :param b: number of bays, default is the largest bay with moves
+    :param c: capacity per bay, default is the largest bay workload
+    :param max_group: the maximal number of moves per task, default is no limit
+    :exception: QCSPGenException
+    :return: a Vessel
+    """
+    if not groups:
+        raise QCSPGenException("- no container moves to import")
+    tasks, stages = [], []
+    for (x, stage), moves in sorted(groups.items()):
+        parts = -(-moves // max_group) if max_group else 1
+        for k in range(parts):
+            t = Task()
+            t.processing_time = moves // parts + (1 if k < moves % parts else 0)
+            t.location = x
+            tasks.append(t)
+            stages.append((x, stage))
+
+    workload = {}
+    for (x, _), moves in groups.items():
+        workload[x] = workload.get(x, 0) + moves
+    b = b or max(workload)
+    c = c or max(workload.values())
+    # d = g = 0: no random pairs, the generator is only passed so that the shared one is not consumed
+    v = Vessel(existing_tasks=tasks, loc="fixed", n=len(tasks), b=b, c=c, f=float(sum(workload.values())) / (b * c),
+               d=0.0, g=0.0, rng=compat.Random(0))
+
+    by_stage = {}
+    for t, key in zip(tasks, stages):
+        by_stage.setdefault(key, []).append(t.index)
+    for x in sorted(set(x for x, _ in by_stage)):
+        sequence = [by_stage[(x, stage)] for stage in range(len(STAGES)) if (x, stage) in by_stage]
+        for before, after in zip(sequence, sequence[1:]):
+            v.precedence.extend((i, j) for i in before for j in after)
+    v.precedence.sort()
+    return v
+
+
+def import_file(filename, b=None, c=None, max_group=None, **options):
+    """
+    to build a vessel from a stowage/discharge list in one streaming pass, see ``read_moves()`` and ``build_vessel()``.
+    Example:
+    ::
+
+        v = stowage.import_file("call_0815.csv", max_group=40)
+        ins = Instance(1, v, Quay(4, t=1, ready_time=0))
+
+    :param filename: the csv file name
+    :param b: number of bays, default is the largest bay with moves
+    :param c: capacity per bay, default is the largest bay workload
+    :param max_group: the maximal number of moves per task, default is no limit
+    :param options: the options of ``read_moves()``
+    :exception: QCSPGenException
+    :return: a Vessel
+    """
+    return build_vessel(count_groups(read_moves(filename, **options)), b, c, max_group)
+
+
+def import_corpus(paths, processes=None, **options):
+    """
+    to build the vessels of many port calls with a process pool, one csv file per port call
+
+    :param paths: a csv file/directory name or a list of them, directories are searched recursively
+    :param processes: the number of worker processes, default is the number of CPUs
+    :param options: the options of ``import_file()``
+    :exception: QCSPGenException
+    :return: dict filename -> Vessel
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, f) for f in names if f.lower().endswith(".csv"))
+        else:
+            files.append(path)
+    files.sort()
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        vessels = pool.map(functools.partial(import_file, **options), files)
+    finally:
+        pool.close()
+        pool.join()
+    return dict(zip(files, vessels))
+
+
+if __name__ == "__main__":
+    pass
@@ -2,7 +2,14 @@
 # -*- coding: utf-8 -*-
 
 
-import checker
+from .qcspgen_exception import QCSPGenException
+from . import checker
+
+
+# validation rules of the task attributes, shared by Task and PooledTask
+INDEX_RULE = checker.Rule("task index", "int", "(0,inf)")
+LOCATION_RULE = checker.Rule("task location", "int", "(0,inf)")
+PROCESSING_TIME_RULE = checker.Rule("task processing time", "float", "[0,inf)")
 
 
 class Task(object):
@@ -22,6 +29,9 @@ class Task(object):
         t.processing_time = 2.0
 
     """
+    # no per task __dict__, vessels hold many tasks
+    __slots__ = ("__location", "__index", "__processing_time")
+
     def __init__(self):
         super(Task, self).__init__()
         self.__location = -1
@@ -56,40 +66,198 @@ class Task(object):
         return self.__processing_time
 
     @index.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(value=INDEX_RULE)
     def index(self, value):
         """
         setter for index
 
-        :param value: prefix:``task index`` with type:``int`` in range:``(0,inf)``
+        :param value: task index, int in (0, inf)
         """
         self.__index = value
 
     @location.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(value=LOCATION_RULE)
     def location(self, value):
         """
         setter for location
 
-        :param value: prefix:``task location`` with type:``int`` in range:``(0,inf)``
+        :param value: task location, int in (0, inf)
         """
         self.__location = value
 
     @processing_time.setter
-    @checker.func_arg_check
+    @checker.func_arg_check(p=PROCESSING_TIME_RULE)
     def processing_time(self, p):
         """
         setter for processing time
 
-        :param p: prefix:``task processing time`` with type:``float`` in range:``[0, inf)``
+        :param p: task processing time, int or float in [0, inf)
         """
         self.__processing_time = p
 
+    def place(self, location):
+        """
+        to set the location without argument checking, for callers that validated the location already, e.g.,
+        ``Bay.extend()``
+
+        :param location: task location
+        :return: None
+        """
+        self.__location = location
+
     def __str__(self):
         return "Task {s.index} (p={s.processing_time:.1f}, l={s.location:d})".format(s=self)
 
     __repr__ = __str__
 
 
+class TaskPool(object):
+    """
+    immutable pool of task processing times that can be shared by many vessels. Each vessel distributing the pool
+    keeps its own location and index arrays and sees the pool through ``PooledTask`` views, so that the tasks are
+    never copied, example:
+    ::
+
+        pool = TaskPool.from_tasks(Vessel(b=20, c=600, f=0.5, d=1.0, g=0.0, n=200, loc="uni").tasks)
+        vessels = [Vessel(task_pool=pool, b=20, c=600, f=0.5, d=1.0, g=0.0, loc="cl2") for _ in range(100)]
+
+    :param processing_times: processing times of the tasks
+    """
+    def __init__(self, processing_times):
+        super(TaskPool, self).__init__()
+        for p in processing_times:
+            message = PROCESSING_TIME_RULE.check(p)
+            if message:
+                raise QCSPGenException(message)
+        self.__processing_times = tuple(processing_times)
+
+    @staticmethod
+    def from_tasks(tasks):
+        """
+        to create a pool from the processing times of a list of tasks
+
+        :param tasks: a list of tasks
+        :return: a task pool
+        """
+        return TaskPool([t.processing_time for t in tasks])
+
+    @property
+    def processing_times(self):
+        """
+        getter for processing times
+
+        :return: tuple of processing times
+        """
+        return self.__processing_times
+
+    @property
+    def size(self):
+        """
+        getter for the number of tasks
+
+        :return: the number of tasks in the pool
+        """
+        return len(self.__processing_times)
+
+    def views(self, locations, indices):
+        """
+        to create task views of the pool which store their locations and indices in the given arrays
+
+        :param locations: a per vessel array of task locations with one entry per pool task
+        :param indices: a per vessel array of task indices with one entry per pool task
+        :return: a list of PooledTask objects
+        """
+        arrays = (self.__processing_times, locations, indices)
+        return [PooledTask(arrays, k) for k in range(self.size)]
+
+    def __len__(self):
+        return self.size
+
+    def __deepcopy__(self, memo):
+        # the pool is immutable, vessel copies keep sharing it
+        return self
+
+    def __str__(self):
+        return "TaskPool of {} tasks".format(self.size)
+
+    __repr__ = __str__
+
+
+class PooledTask(Task):
+    """
+    view of the k-th task of a TaskPool, whose processing time is read from the pool and whose location and index
+    live in arrays owned by a vessel. A view only holds its position and a reference to the arrays, which all the views
+    of a vessel share, see ``TaskPool.views()``.
+
+    :param arrays: the tuple (pool processing times, array of task locations, array of task indices)
+    :param k: position of the task in the pool
+    """
+    __slots__ = ("__arrays", "__k")
+
+    def __init__(self, arrays, k):
+        self.__arrays = arrays
+        self.__k = k
+
+    @property
+    def index(self):
+        """
+        getter for index
+
+        :return: task index
+        """
+        return self.__arrays[2][self.__k]
+
+    @property
+    def location(self):
+        """
+        getter for location
+
+        :return: task location
+        """
+        return self.__arrays[1][self.__k]
+
+    @property
+    def processing_time(self):
+        """
+        getter for processing time, read from the pool
+
+        :return: task processing time
+        """
+        return self.__arrays[0][self.__k]
+
+    @index.setter
+    @checker.func_arg_check(value=INDEX_RULE)
+    def index(self, value):
+        """
+        setter for index
+
+        :param value: task index, int in (0, inf)
+        """
+        self.__arrays[2][self.__k] = value
+
+    @location.setter
+    @checker.func_arg_check(value=LOCATION_RULE)
+    def location(self, value):
+        """
+        setter for location
+
+        :param value: task location, int in (0, inf)
+        """
+        self.__arrays[1][self.__k] = value
+
+    def place(self, location):
+        """
+        to set the location without argument checking, see ``Task.place()``
+
+        :param location: task location
+        :return: None
+        """
+        self.__arrays[1][self.__k] = location
+
+    @processing_time.setter
+    def processing_time(self, p):
+        raise QCSPGenException("- processing time of a pooled task is shared and cannot be changed")
+
+
 if __name__ == "__main__":
     pass
@@ -34,10 +34,32 @@ l0 = {l0};
 // travel time t, safety margin s
 t = {t};
 s = {s};
-
+{cranes}{ranges}{separation}
 // - end of file -
 """
 
+# optional heterogeneous crane data of the OPL template
+OPL_CRANES = """
+// handling efficiencies e (processing time of task i on crane k: p[i] / e[k]), due dates due (-1: none)
+e = {e};
+due = {due};
+"""
+
+# optional crane reachability of the OPL template
+OPL_RANGES = """
+// crane_range[k] = [first, last]: the bays crane k can serve, eligible[i] = [first, last]: the cranes task i can be
+// served by (empty if first > last)
+crane_range = {crane_range};
+eligible = {eligible};
+"""
+
+# optional crane separation table of the OPL template
+OPL_SEPARATION = """
+// distance in bays cranes k < k' have to move apart between task i on k and a later task j on k':
+// separation[k'-k][l[i]-l[j]+b], the separation time is this distance times min(t[k], t[k'])
+separation = {separation};
+"""
+
 JSON_TEMPLATE = """
 {{
     "header" : "Type: Instance for the quay crane scheduling problem. Generated by qcspgen.py, author: Chen Jiang Hang. Based on QCSPgen, author: Frank Meisel",
@@ -51,9 +73,23 @@ JSON_TEMPLATE = """
     "r" : {r},
     "l0" : {l0},
     "t" : {t},
-    "s" : {s}
+    "s" : {s}{cranes}{ranges}{separation}
 }}
 """
 
+# optional heterogeneous crane data of the JSON template
+JSON_CRANES = """,
+    "e" : {e},
+    "due" : {due}"""
+
+# optional crane reachability of the JSON template
+JSON_RANGES = """,
+    "crane_range" : {crane_range},
+    "eligible" : {eligible}"""
+
+# optional crane separation table of the JSON template
+JSON_SEPARATION = """,
+    "separation" : {separation}"""
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,175 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+import functools
+import multiprocessing
+from . import reader
+
+
+# kind: a short violation code, e.g., 'phi_cycle'; message: human readable details
+Violation = namedtuple("Violation", ["kind", "message"])
+
+
+def _check_sizes(d):
+    violations = []
+    for key, size in (("p", d["n"]), ("l", d["n"]), ("r", d["q"]), ("l0", d["q"]), ("t", d["q"]), ("e", d["q"]),
+                      ("due", d["q"]), ("crane_range", d["q"]), ("eligible", d["n"]), ("separation", d["q"] - 1)):
+        if key in d and len(d[key]) != size:
+            violations.append(Violation("size", "len(%s)=%d but should be %d" % (key, len(d[key]), size)))
+    for key in ("Phi", "Psi", "crane_range", "eligible"):
+        for k, pair in enumerate(d.get(key) or []):
+            if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+                violations.append(Violation("size", "%s[%d]=%r is not a pair" % (key, k, pair)))
+    return violations
+
+
+def _check_tasks(d, capacity):
+    violations = []
+    workload = [0] * (d["b"] + 1)
+    previous = 1
+    for i, (p, l) in enumerate(zip(d["p"], d["l"])):
+        if not 1 <= l <= d["b"]:
+            violations.append(Violation("location", "task %d is located in bay %r out of [1, %d]" % (i+1, l, d["b"])))
+            continue
+        if l < previous:
+            violations.append(Violation("order", "task %d (bay %d) is indexed after a task in bay %d" %
+                                        (i+1, l, previous)))
+        previous = max(previous, l)
+        if p < 0:
+            violations.append(Violation("processing_time", "task %d has negative processing time %r" % (i+1, p)))
+        workload[l] += p
+
+    if capacity is not None:
+        for bay, w in enumerate(workload):
+            if w > capacity:
+                violations.append(Violation("capacity", "bay %d holds %r > capacity %r" % (bay, w, capacity)))
+    return violations
+
+
+def _check_pairs(d, key):
+    violations = []
+    valid = []
+    for i, j in d[key]:
+        if not (1 <= i <= d["n"] and 1 <= j <= d["n"]) or i == j:
+            violations.append(Violation(key.lower() + "_range", "pair (%r, %r) is not a pair of distinct tasks" %
+                                        (i, j)))
+        else:
+            valid.append((i, j))
+    return violations, valid
+
+
+def _check_precedence(d, phi):
+    violations = []
+    successors = [[] for _ in range(d["n"] + 1)]
+    in_degree = [0] * (d["n"] + 1)
+    for i, j in phi:
+        if d["l"][i-1] != d["l"][j-1]:
+            violations.append(Violation("phi_bay", "pair (%d, %d) links bays %r and %r" %
+                                        (i, j, d["l"][i-1], d["l"][j-1])))
+        successors[i].append(j)
+        in_degree[j] += 1
+
+    # Kahn's algorithm, any task left over lies on a cycle
+    stack = [i for i in range(1, d["n"] + 1) if in_degree[i] == 0]
+    visited = 0
+    while stack:
+        i = stack.pop()
+        visited += 1
+        for j in successors[i]:
+            in_degree[j] -= 1
+            if in_degree[j] == 0:
+                stack.append(j)
+    if visited < d["n"]:
+        cyclic = [i for i in range(1, d["n"] + 1) if in_degree[i] > 0]
+        violations.append(Violation("phi_cycle", "tasks %r are on a precedence cycle" % cyclic))
+    return violations
+
+
+def _check_non_simultaneity(d, psi):
+    return [Violation("psi_bay", "pair (%d, %d) lies within bay %r" % (i, j, d["l"][i-1]))
+            for i, j in psi if d["l"][i-1] == d["l"][j-1]]
+
+
+def _check_initial_locations(d):
+    violations = []
+    for k in range(1, d["q"]):
+        if d["l0"][k] - d["l0"][k-1] <= d["s"]:
+            violations.append(Violation("safety_margin", "QC %d at %r and QC %d at %r violate safety margin %r" %
+                                        (k, d["l0"][k-1], k+1, d["l0"][k], d["s"])))
+    return violations
+
+
+def validate(instance, capacity=None):
+    r"""
+    to check the structural invariants of an instance in O(n + \|Phi\| + \|Psi\|):
+
+    * tasks are located in bays 1..b and indexed by increasing bay locations
+    * the workload of a bay does not exceed `capacity` (only checked if supplied, instance files do not store it)
+    * Phi is acyclic and intra-bay, Psi only pairs tasks of different bays
+    * initial QC locations respect the safety margin
+
+    :param instance: an Instance object or a dict of instance data
+    :param capacity: capacity per bay
+    :return: a list of Violation tuples, empty if the instance is valid
+    """
+    d = reader.as_data(instance)
+    violations = _check_sizes(d)
+    if violations:
+        return violations
+
+    violations.extend(_check_tasks(d, capacity))
+    if any(v.kind == "location" for v in violations):
+        return violations
+
+    phi_violations, phi = _check_pairs(d, "Phi")
+    psi_violations, psi = _check_pairs(d, "Psi")
+    violations.extend(phi_violations)
+    violations.extend(psi_violations)
+    violations.extend(_check_precedence(d, phi))
+    violations.extend(_check_non_simultaneity(d, psi))
+    violations.extend(_check_initial_locations(d))
+    return violations
+
+
+def validate_file(filename, capacity=None):
+    """
+    to read and validate an instance file
+
+    :param filename: the instance file name
+    :param capacity: capacity per bay
+    :return: (filename, a list of Violation tuples)
+    """
+    try:
+        return filename, validate(reader.read(filename), capacity)
+    except reader.FILE_ERRORS as e:
+        return filename, [Violation("read", getattr(e, "message", None) or str(e))]
+
+
+def validate_corpus(paths, capacity=None, processes=None):
+    """
+    to validate all instance files of the given files/directories with a process pool
+
+    :param paths: a file/directory name or a list of them
+    :param capacity: capacity per bay
+    :param processes: the number of worker processes, default is the number of CPUs
+    :return: dict filename -> a list of Violation tuples
+    """
+    files = reader.find(paths)
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = pool.map(functools.partial(validate_file, capacity=capacity), files,
+                           chunksize=max(1, len(files) // (4 * (processes or multiprocessing.cpu_count()))))
+    finally:
+        pool.close()
+        pool.join()
+    return dict(results)
+
+
+if __name__ == "__main__":
+    import sys
+    report = validate_corpus(sys.argv[1:] or ".")
+    for name in sorted(report):
+        for v in report[name]:
+            print("%s: [%s] %s" % (name, v.kind, v.message))
+    print("%d files checked, %d invalid" % (len(report), sum(1 for v in report.values() if v)))
@@ -1,11 +1,16 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from task import Task
-from bay import Bay
-from aggregator import Aggregator
-import random
-import checker
+from .qcspgen_exception import QCSPGenException
+from .task import Task
+from .bay import Bay
+from .aggregator import Aggregator
+from .relation import Relation
+from . import precedence
+from array import array
+from . import checker
+from . import compat
+from . import sampling
 
 
 class _Parameter(object):
@@ -13,30 +18,43 @@ class _Parameter(object):
     parameter class to hold all vessel related parameters
     """
 
-    @checker.func_arg_check
+    @checker.func_arg_check(n=checker.Rule("number of tasks", "int", "(0,inf)"),
+                            b=checker.Rule("number of bays", "int", "(0,inf)"),
+                            c=checker.Rule("capacity per bay", "int", "(0,inf)"),
+                            f=checker.Rule("handling rate", "float", "[0,1]"),
+                            loc=checker.Rule("task bay distribution pattern", "str"),
+                            d=checker.Rule("precedent density", "int, float", "[0,1]"),
+                            g=checker.Rule("non-simultaneity density", "int, float", "[0,1]"),
+                            std=checker.Rule("standard deviation for task distribution", "int, float", "[0,inf)"),
+                            sampler=checker.Rule("bay sampler", "str", "(rejection, inverse_cdf)"))
     def __init__(self, **kwargs):
         """
-        :param n: prefix:``number of tasks``, type:``int``, range:``(0, inf)``
-        :param b: prefix:``number of bays``, type:``int``, range:``(0, inf)``
-        :param c: prefix:``capacity per bay``, type:``int``, range:``(0, inf)``
-        :param f: prefix:``handling rate``, type:``float``, range:``[0, 1]``
-        :param loc: prefix:``task bay distribution pattern``, type:``str``, range:``(uni, cl1, cl2)``
-        :param d: prefix:``precedent density``, type:``int, float``, range:``[0, 1]``
-        :param g: prefix:``non-simultaneity density``, type:``int, float``, range:``[0, 1]``
-        :param std: prefix:``standard deviation for task distribution``, type:``int, float``, range:``[0, int)``
+        :param n: number of tasks, int in (0, inf)
+        :param b: number of bays, int in (0, inf)
+        :param c: capacity per bay, int in (0, inf)
+        :param f: handling rate, int or float in [0, 1]
+        :param loc: task bay distribution pattern, one of uni, cl1, cl2, fixed or a registered one, see \
+        ``sampling.register_distribution``
+        :param d: precedent density, int or float in [0, 1]
+        :param g: non-simultaneity density, int or float in [0, 1]
+        :param std: standard deviation for task distribution, int or float in [0, inf)
+        :param sampler: bay sampler, one of rejection, inverse_cdf
         :param means: means for task distribution
+        :param rng: the random number generator drawing the means
         """
 
         self.task_size = kwargs["n"]
         self.bay_size = kwargs["b"]
         self.capacity = kwargs["c"]
         self.handling_rate = kwargs["f"]
-        self.pattern = kwargs["loc"].lower()
+        self.pattern = checker.verify_is_in(kwargs["loc"].lower(),
+                                            Vessel.BAY_DISTRIBUTION_PATTERN + tuple(sampling.distributions()))
         self.p_density = kwargs["d"]
         self.ns_density = kwargs["g"]
         self.std = kwargs["std"] * self.bay_size
-        self.mean1, self.mean2 = Vessel.set_mean(self.bay_size, self.pattern) if kwargs["means"] is None else \
-            kwargs["means"]
+        self.sampler = kwargs["sampler"]
+        self.mean1, self.mean2 = kwargs["means"] if kwargs["means"] is not None else \
+            Vessel.set_mean(self.bay_size, self.pattern, kwargs["rng"])
 
 
 class Vessel(Aggregator):
@@ -45,7 +63,7 @@ class Vessel(Aggregator):
     vessel object, please refer to *A unified approach for the evaluation of quay crane scheduling models and algorithms
     *, published in **Computer & Operations Research**
 
-    :param std: to determine the standard deviation for task distribution. The applied standard deviation is std\*the \
+    :param std: to determine the standard deviation for task distribution. The applied standard deviation is std\\*the \
     of number of bays. The default std is set to 0.25.
 
     :param means: the means for task distribution. The default means is None. In this case, `set_mean` function will be\
@@ -57,25 +75,45 @@ class Vessel(Aggregator):
     :param existing_task: if the parameter is not None but a list of task elements, then the constructed vessel will\
     use the supplied tasks instead of generating a set of new tasks.
 
+    :param task_pool: if the parameter is not None but a TaskPool, then the constructed vessel will distribute the\
+    tasks of the pool without copying them. The vessel keeps the task locations and indices in the arrays\
+    `task_locations` and `task_indices` (in pool order), so that many vessels can share one pool. In this case, n\
+    defaults to the pool size, and `existing_tasks` cannot be given.
+
+    :param rng: a ``compat.Random`` object used for all random draws of the vessel, by default the shared generator\
+    of the random module, seeded by ``Instance.seed`` or ``random.seed``, is used. With an own generator per vessel,\
+    vessels can be built concurrently, e.g., in a thread pool, and the result only depends on the generator's seed.
+
+    :param sampler: how the bays of *cl1* and *cl2* tasks are drawn: *rejection* (default) redraws a gaussian sample\
+    until it falls on the vessel, as the benchmark corpus was generated; *inverse_cdf* draws every bay with one uniform\
+    number from the exact bay probabilities (see ``bay_sampler``), so the time per task does not depend on how many\
+    samples would be rejected. Both draw from the same distribution but give different instances for a seed.
+
     :param n: number of container groups (tasks).
     :param b: number of bays.
     :param c: capacity per bay.
     :param f: handling rate
-    :param loc: task bay distribution pattern
+    :param loc: task bay distribution pattern, *uni*, *cl1*, *cl2*, *fixed* or a pattern registered by\
+    ``sampling.register_distribution``, e.g., an empirical per bay weight profile. The bays of a registered pattern are\
+    drawn in O(1) per task from an alias table built once per vessel, whatever the sampler. With *fixed*, the\
+    `existing_tasks` stay in the bays given by their locations and are indexed in the given order, e.g., for vessels\
+    imported from stowage data (see ``stowage``).
     :param d: precedent density
     :param g: non-simultaneity density
     """
 
-    BAY_DISTRIBUTION_PATTERN = ("uni", "cl1", "cl2")
+    BAY_DISTRIBUTION_PATTERN = ("uni", "cl1", "cl2", "fixed")
+    BAY_SAMPLER = ("rejection", "inverse_cdf")
+    PRECEDENCE_FORM = ("raw", "reduced", "closed")
 
     @staticmethod
-    @checker.func_arg_check
+    @checker.func_arg_check(density=checker.Rule("density", "int, float", "[0,inf)"))
     def calculate_pij(i, j, density):
         """
         calculation of probability pij
         :param i: index i
         :param j: index j
-        :param density: prefix:``density``, type:``int, float``, range:``[0, inf)``
+        :param density: density, int or float in [0, inf)
         :return: pij
         """
         import math
@@ -85,48 +123,63 @@ class Vessel(Aggregator):
         return density*part/(1-density*(1-part))
 
     @staticmethod
-    def set_mean(size, pattern):
+    def set_mean(size, pattern, rng=compat.shared_random):
         """
         to set the means for task distribution
 
         :param size: the size of a vessel
         :param pattern: task distribution pattern (uni, cl1, cl2)
+        :param rng: the random number generator, by default the generator seeded by ``Instance.seed``
         :return: means tuple
         """
         if pattern == "uni":
             return -1, -1
         elif pattern == "cl1":
-            return random.randint(1, size), -1
+            return rng.randint(1, size), -1
         elif pattern == "cl2":
-            mean1 = random.randint(1, size)
-            if mean1 > self.bay_size/2:
-                mean2 = mean1 - size/2
+            mean1 = rng.randint(1, size)
+            if mean1 > size // 2:
+                mean2 = mean1 - size // 2
             else:
-                mean2 = mean1 + size/2
+                mean2 = mean1 + size // 2
             return mean1, mean2
         else:
             return -1, -1
 
     @staticmethod
-    def sample_gauss(size, mean, std):
+    def sample_gauss(size, mean, std, rng=compat.shared_random):
         """
         sampling from a gaussian distribution
 
         :param size: the size of a vessel
         :param mean: mean of the gaussian distribution
         :param std: std of the gaussian distribution
+        :param rng: the random number generator, by default the generator seeded by ``Instance.seed``
         :return: a sample
         """
         while True:
-            sample = int(random.gauss(mean, std))
+            sample = int(rng.gauss(mean, std))
             if 1 <= sample <= size:
                 return sample
 
-    def __init__(self, std=0.25, means=None, existing_tasks=None, **kwargs):
+    def __init__(self, std=0.25, means=None, existing_tasks=None, task_pool=None, rng=None, sampler="rejection",
+                 **kwargs):
         super(Vessel, self).__init__(Bay)
-        
+        self.__rng = rng
+
+        # per vessel location/index arrays for the tasks of a shared pool
+        self.task_locations = None
+        self.task_indices = None
+        if task_pool is not None:
+            if existing_tasks is not None:
+                raise QCSPGenException("- either existing_tasks or task_pool can be given, not both")
+            self.task_locations = array('l', [-1] * task_pool.size)
+            self.task_indices = array('l', [-1] * task_pool.size)
+            existing_tasks = task_pool.views(self.task_locations, self.task_indices)
+            kwargs.setdefault("n", task_pool.size)
+
         # initialize/process parameters
-        self.parameter = _Parameter(std=std, means=means, **kwargs)
+        self.parameter = _Parameter(std=std, means=means, rng=self.rng, sampler=sampler, **kwargs)
         
         # generate bays
         self.generate_bays()
@@ -141,6 +194,16 @@ class Vessel(Aggregator):
         self.generate_precedence(self.parameter.p_density)
         self.generate_non_simultaneity(self.parameter.ns_density)
     
+    @property
+    def rng(self):
+        """
+        getter for the random number generator
+
+        :return: the vessel's own generator, or the shared generator of the random module (seeded by ``Instance.seed``
+            or ``random.seed``) if none was given
+        """
+        return self.__rng or compat.shared_random
+
     @property
     def bays(self):
         return self.aggregation
@@ -158,8 +221,7 @@ class Vessel(Aggregator):
         generate bays
         :return: None
         """
-        for i in range(self.parameter.bay_size):
-            self.append(Bay(self.parameter.capacity, i + 1))
+        self.extend(Bay(self.parameter.capacity, i + 1) for i in range(self.parameter.bay_size))
 
     def generate_tasks(self, existing_tasks):
         """
@@ -195,7 +257,7 @@ class Vessel(Aggregator):
                     i = ti.index
                     if j > i:
                         p_ij = Vessel.calculate_pij(i, j, density)
-                        if random.random() < p_ij:
+                        if self.rng.random() < p_ij:
                             self.precedence.append((i, j))
 
     def generate_non_simultaneity(self, density):
@@ -210,23 +272,67 @@ class Vessel(Aggregator):
                     i = ti.index
                     j = tj.index
                     p_ij = Vessel.calculate_pij(i, j, density)
-                    if random.random() < p_ij:
+                    if self.rng.random() < p_ij:
                         self.non_simultaneity.append((i, j))
 
+    def precedence_set(self, form="raw"):
+        """
+        to get the precedence set Phi in a given form
+
+        * `raw`: the arcs as generated by ``generate_precedence()``
+        * `reduced`: the transitive reduction, i.e., no arc is implied by the others
+        * `closed`: the transitive closure, i.e., all the transitive arcs are added
+
+        :param form: one of ``PRECEDENCE_FORM``
+        :exception: QCSPGenException
+        :return: a list of (i, j) pairs
+        """
+        checker.verify_is_in(form, Vessel.PRECEDENCE_FORM)
+        if form == "reduced":
+            return precedence.transitive_reduction(self.precedence)
+        elif form == "closed":
+            return precedence.transitive_closure(self.precedence)
+        return self.precedence
+
+    def precedence_arc_count(self):
+        """
+        to count the arcs of the precedence set Phi in each of its forms
+
+        :return: dict form -> number of arcs
+        """
+        return dict((form, len(self.precedence_set(form))) for form in Vessel.PRECEDENCE_FORM)
+
+    def precedence_relation(self, form="raw"):
+        """
+        to get the precedence set Phi as a compressed relation with O(1) membership
+
+        :param form: one of ``PRECEDENCE_FORM``
+        :return: a Relation object
+        """
+        return Relation(self.task_size, self.precedence_set(form))
+
+    def non_simultaneity_relation(self):
+        """
+        to get the non-simultaneity set Psi as a compressed symmetric relation with O(1) membership
+
+        :return: a Relation object
+        """
+        return Relation(self.task_size, self.non_simultaneity, symmetric=True)
+
     def clone(self):
         """
-        deep copy of the vessel
+        deep copy of the vessel, the copy shares the random number generator of the vessel
         :return: a copy of the vessel
         """
         import copy
-        return copy.deepcopy(self)
+        return copy.deepcopy(self, {id(self.__rng): self.__rng})
 
     @checker.func_arg_check
     def aggregate(self, ns_density=None):
         """
         to aggregate cluster-level tasks into bay-level tasks
 
-        :param ns_density: prefix:`noon-simultaneity density``, type:``float``, range:``[0, 1]``
+        :param ns_density: prefix:``non-simultaneity density``, type:``float``, range:``[0, 1]``
         :return: None
         """
         if ns_density is None:
@@ -247,7 +353,7 @@ class Vessel(Aggregator):
             t.processing_time = b.aggregate_task_processing_time
             t.index = b.index
             b.empty()
-            b.append(t)
+            b.extend([t])
             v.tasks.append(t)
 
         # generate non-simultaneity set
@@ -258,10 +364,10 @@ class Vessel(Aggregator):
     def _create_tasks(self, n):
         # w = fbc
         handling_volume = int(self.parameter.handling_rate * self.bay_size * self.parameter.capacity)
-        cut_points = [(i+1)*self.parameter.capacity for i in range(handling_volume/self.parameter.capacity)]
+        cut_points = [(i+1)*self.parameter.capacity for i in range(handling_volume // self.parameter.capacity)]
         cut_points.append(handling_volume)
         while len(cut_points) < n:
-            cut = random.randint(1, handling_volume - 1)
+            cut = self.rng.randint(1, handling_volume - 1)
             if cut not in cut_points:
                 cut_points.append(cut)
         cut_points.insert(0, 0)
@@ -274,61 +380,132 @@ class Vessel(Aggregator):
             self.tasks.append(t)
 
     def _distribute_tasks(self, pattern):
+        if pattern == "fixed":
+            self._place_tasks()
+            return
         self.tasks.sort(key=lambda x: x.processing_time, reverse=True)
 
-        for t in self.tasks:
-            bay_selected = getattr(self, "%s_distribution" % pattern)()
-            bay = self.bays[bay_selected - 1]
-            if bay.remaining_capacity >= t.processing_time:
-                bay.append(t)
-            else:
+        # select the bays on plain capacities first, then move the tasks into their bays in one batch per bay
+        remaining = [b.remaining_capacity for b in self.bays]
+        selected = [[] for _ in self.bays]
+        for t, bay_selected in zip(self.tasks, self.sample_bays(len(self.tasks))):
+            p = t.processing_time
+            x = bay_selected - 1
+            if remaining[x] < p:
                 # search the neighboring bays
+                x = None
                 left = right = True
                 step = 1
                 while step <= self.bay_size:
                     if left and bay_selected + step <= self.bay_size:
-                        bay_left = self.bays[bay_selected - 1 + step]
-                        if bay_left.remaining_capacity >= t.processing_time:
-                            bay_left.append(t)
+                        if remaining[bay_selected - 1 + step] >= p:
+                            x = bay_selected - 1 + step
                             break
                     else:
                         left = False
 
                     if right and bay_selected - step > 0:
-                        bay_right = self.bays[bay_selected - 1 - step]
-                        if bay_right.remaining_capacity >= t.processing_time:
-                            bay_right.append(t)
+                        if remaining[bay_selected - 1 - step] >= p:
+                            x = bay_selected - 1 - step
                             break
                     else:
                         right = False
 
                     step += 1
+                if x is None:
+                    continue
+            remaining[x] -= p
+            selected[x].append(t)
+
+        for bay, tasks in zip(self.bays, selected):
+            bay.extend(tasks)
+
+    def _place_tasks(self):
+        # the tasks keep their locations, in their given order
+        selected = [[] for _ in self.bays]
+        for t in self.tasks:
+            if not 1 <= t.location <= self.bay_size:
+                raise QCSPGenException("- task location %r is not a bay of the vessel (1..%d)" %
+                                       (t.location, self.bay_size))
+            selected[t.location - 1].append(t)
+        for bay, tasks in zip(self.bays, selected):
+            bay.extend(tasks)
 
     def _index_tasks(self):
         # tasks are lexicographically indexed by increasing bay locations
         index = 0
         for b in self.bays:
             tasks = b.tasks
-            order = range(len(tasks))
-            random.shuffle(order)
+            order = list(range(len(tasks)))
+            if self.parameter.pattern != "fixed":
+                self.rng.shuffle(order)
             for i, t in enumerate(tasks):
                 t.index = order[i] + index + 1
             index += len(tasks)
 
         self.tasks.sort(key=lambda x: x.index)
 
+    def sample_bays(self, n):
+        """
+        to draw the bays of n tasks in one batch according to the task distribution pattern and the bay sampler. With
+        the rejection sampler, the draws of the built-in patterns are the same as n calls of the pattern's
+        ``*_distribution`` method. Registered patterns are drawn by their own sampler.
+
+        :param n: the number of tasks
+        :exception: QCSPGenException if the sampler of a registered pattern draws other than n bays in 1..b
+        :return: a list of n bays
+        """
+        pattern = self.parameter.pattern
+        if pattern not in Vessel.BAY_DISTRIBUTION_PATTERN:
+            bays = list(sampling.distribution_sampler(pattern, self).sample_batch(self.rng, n))
+            if len(bays) != n:
+                raise QCSPGenException("- task bay distribution pattern %s drew %d bays for %d tasks" %
+                                       (pattern, len(bays), n))
+            invalid = sorted(set(x for x in bays if not (1 <= x <= self.bay_size and x == int(x))))
+            if invalid:
+                raise QCSPGenException("- task bay distribution pattern %s drew bays %r out of [1, %d]" %
+                                       (pattern, invalid, self.bay_size))
+            return [int(x) for x in bays]
+        if pattern != "uni" and self.parameter.sampler == "inverse_cdf":
+            return self.bay_sampler().sample_batch(self.rng, n)
+        draw = {"uni": self.uni_distribution, "cl1": self.cl1_distribution, "cl2": self.cl2_distribution}[pattern]
+        return [draw() for _ in range(n)]
+
+    def bay_sampler(self):
+        """
+        to build the exact sampler of the task bay distribution: for *cl1* the truncated discrete normal distribution
+        of ``sample_gauss``, for *cl2* the even mixture of the ones around both means, for *uni* the uniform one, and
+        for a registered pattern its own sampler, see ``sampling.distribution_sampler()``
+
+        :exception: QCSPGenException for the *fixed* pattern, whose tasks are not drawn
+        :return: a sampling.InverseCDFSampler over the bays, or the sampler of the registered pattern
+        """
+        pattern = self.parameter.pattern
+        if pattern == "fixed":
+            raise QCSPGenException("- tasks of the fixed pattern keep their locations and have no bay sampler")
+        if pattern not in Vessel.BAY_DISTRIBUTION_PATTERN:
+            return sampling.distribution_sampler(pattern, self)
+        if pattern == "uni":
+            return sampling.InverseCDFSampler([1.0] * self.bay_size)
+        weights = sampling.truncated_normal_weights(self.bay_size, self.parameter.mean1, self.parameter.std)
+        if pattern == "cl2":
+            weights = [(w1 + w2) / 2 for w1, w2 in
+                       zip(weights, sampling.truncated_normal_weights(self.bay_size, self.parameter.mean2,
+                                                                      self.parameter.std))]
+        return sampling.InverseCDFSampler(weights)
+
     def uni_distribution(self):
-        return random.randint(1, self.bay_size)
+        return self.rng.randint(1, self.bay_size)
 
     def cl1_distribution(self):
         mean = self.parameter.mean1
         std = self.parameter.std
-        return Vessel.sample_gauss(self.bay_size, mean, std)
+        return Vessel.sample_gauss(self.bay_size, mean, std, self.rng)
 
     def cl2_distribution(self):
-        mean = random.choice([self.parameter.mean1, self.parameter.mean2])
+        mean = self.rng.choice([self.parameter.mean1, self.parameter.mean2])
         std = self.parameter.std
-        return Vessel.sample_gauss(self.bay_size, mean, std)
+        return Vessel.sample_gauss(self.bay_size, mean, std, self.rng)
 
     def __str__(self):
         return "A vessel: %s" % ([str(b) for b in self.bays])
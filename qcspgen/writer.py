@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from .qcspgen_exception import QCSPGenException
+import os
+import threading
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class AsyncWriter(object):
+    """
+    pipelined file writer: serialized instances are queued and written by background threads, so that generation
+    does not wait for slow (e.g., network) storage. A file is first written to a temporary name in the same directory
+    and renamed when complete, so readers never see partial files. The queue is bounded: ``submit()`` blocks while
+    `max_pending` files are waiting, which throttles generation to the storage speed. Example:
+    ::
+
+        with AsyncWriter(max_pending=32, threads=2) as w:
+            for params, sd, text in Instance.iter_generate(grid, range(1, 11), style="json", workers=4):
+                w.submit("QCSP_n{}_{}.json".format(params["n"], sd), text)
+        print(w.statistics)
+
+    :param max_pending: the maximal number of queued files
+    :param threads: the number of writer threads
+    :param fsync: if True, files are synced to disk before they are renamed
+    """
+
+    def __init__(self, max_pending=64, threads=1, fsync=False):
+        super(AsyncWriter, self).__init__()
+        self.__queue = queue.Queue(max_pending)
+        self.__fsync = fsync
+        self.__lock = threading.Lock()
+        self.__error = None
+        self.__closed = False
+        self.__started = time.time()
+        self.__stopped = None
+        self.__files = 0
+        self.__bytes = 0
+        self.__blocked = 0.0
+        self.__threads = [threading.Thread(target=self._run) for _ in range(threads)]
+        for t in self.__threads:
+            t.daemon = True
+            t.start()
+
+    def _run(self):
+        while True:
+            item = self.__queue.get()
+            try:
+                if item is None:
+                    return
+                filename, data = item
+                if self.__error is None:
+                    self._write(filename, data)
+            except (IOError, OSError) as e:
+                with self.__lock:
+                    self.__error = self.__error or e
+            finally:
+                self.__queue.task_done()
+
+    def _write(self, filename, data):
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        temporary = "%s.%d.%d.tmp" % (filename, os.getpid(), threading.current_thread().ident)
+        try:
+            with open(temporary, "wb") as f:
+                f.write(data)
+                if self.__fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            try:
+                replace = os.replace
+            except AttributeError:
+                # python 2: rename does not overwrite on windows
+                if os.name == "nt" and os.path.exists(filename):
+                    os.remove(filename)
+                replace = os.rename
+            replace(temporary, filename)
+        except BaseException:
+            # no partial files are left behind
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        with self.__lock:
+            self.__files += 1
+            self.__bytes += len(data)
+
+    def _raise_error(self):
+        if self.__error is not None:
+            raise QCSPGenException("- writing failed: %s" % self.__error)
+
+    def submit(self, filename, data):
+        """
+        to queue a file to be written, blocking while the queue is full
+
+        :param filename: the output file name
+        :param data: the file content, a string or bytes
+        :exception: QCSPGenException if the writer is closed or a previous write failed
+        :return: None
+        """
+        if self.__closed:
+            raise QCSPGenException("- the writer is closed")
+        self._raise_error()
+        try:
+            self.__queue.put((filename, data), block=False)
+        except queue.Full:
+            waiting = time.time()
+            self.__queue.put((filename, data))
+            with self.__lock:
+                self.__blocked += time.time() - waiting
+
+    def flush(self):
+        """
+        to wait until all the queued files are written
+
+        :exception: QCSPGenException if a write failed
+        :return: None
+        """
+        self.__queue.join()
+        self._raise_error()
+
+    def close(self):
+        """
+        to write all the queued files and to stop the writer threads
+
+        :exception: QCSPGenException if a write failed
+        :return: None
+        """
+        if not self.__closed:
+            self.__closed = True
+            for _ in self.__threads:
+                self.__queue.put(None)
+            for t in self.__threads:
+                t.join()
+            self.__stopped = time.time()
+        self._raise_error()
+
+    @property
+    def pending(self):
+        """
+        getter for the number of queued files
+
+        :return: the number of files waiting to be written
+        """
+        return self.__queue.qsize()
+
+    @property
+    def statistics(self):
+        """
+        getter for writer statistics
+
+        :return: dict with the number of written 'files' and 'bytes', the elapsed 'seconds', 'bytes_per_second', \
+        the number of 'pending' files and 'blocked_seconds', the time ``submit()`` waited for a free queue slot
+        """
+        with self.__lock:
+            seconds = (self.__stopped or time.time()) - self.__started
+            return {"files": self.__files, "bytes": self.__bytes, "seconds": seconds,
+                    "bytes_per_second": self.__bytes / seconds if seconds > 0 else 0.0,
+                    "pending": self.pending, "blocked_seconds": self.__blocked}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        try:
+            self.close()
+        except QCSPGenException:
+            # an exception raised in the with block is not replaced by a failed write
+            if exc_type is None:
+                raise
+
+    def __str__(self):
+        return "AsyncWriter: {}".format(self.statistics)
+
+    __repr__ = __str__
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,21 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from setuptools import setup
+
+setup(
+    name="qcspgen",
+    version="0.2",
+    description="A python version of QCSPgen, a benchmark instance generator for the quay crane scheduling problem",
+    author="Chen Jiang Hang",
+    license="MIT",
+    packages=["qcspgen"],
+    python_requires=">=2.7",
+    entry_points={
+        "console_scripts": ["qcspgen = qcspgen.cli:main"],
+    },
+    classifiers=[
+        "Programming Language :: Python :: 2.7",
+        "Programming Language :: Python :: 3",
+    ],
+)
@@ -19,7 +19,7 @@ import os
 # add these directories to sys.path here. If the directory is relative to the
 # documentation root, use os.path.abspath to make it absolute, like shown here.
 #sys.path.insert(0, os.path.abspath('.'))
-sys.path.insert(0, "/Users/voydge/Personal/EPFL/Research/My Papers/QCSPGen/code/qcspgen/")
+sys.path.insert(0, os.path.abspath('..'))
 
 # -- General configuration ------------------------------------------------
 
@@ -57,9 +57,9 @@ author = u'Chen Jiang Hang'
 # built documents.
 #
 # The short X.Y version.
-version = u'0.1'
+version = u'0.2'
 # The full version, including alpha/beta/rc tags.
-release = u'0.1'
+release = u'0.2'
 
 # The language for content autogenerated by Sphinx. Refer to documentation
 # for a list of supported languages.
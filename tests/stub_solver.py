@@ -0,0 +1,22 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+stub solver for the harness tests: reads an instance from the file given as argument or from stdin, and prints the
+total processing time as its objective. The instance's first processing time selects a behavior: 0 sleeps until it
+is killed, 1 fails with exit code 3, anything else succeeds.
+"""
+
+import json
+import sys
+import time
+
+
+if __name__ == "__main__":
+    text = open(sys.argv[1]).read() if len(sys.argv) > 1 else sys.stdin.read()
+    d = json.loads(text)
+    if d["p"][0] == 0:
+        time.sleep(60)
+    print("incumbent makespan: 999")
+    print("Objective = %d" % sum(d["p"]))
+    sys.exit(3 if d["p"][0] == 1 else 0)
@@ -0,0 +1,35 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+from qcspgen import QCSPGenException, analysis
+
+
+class MonteCarloTest(unittest.TestCase):
+
+    def test_study(self):
+        for loc, means in (("uni", None), ("cl1", None), ("cl2", (3, 8))):
+            study = analysis.monte_carlo(n=30, b=10, c=200, f=0.5, loc=loc, replications=200, means=means, seed=1,
+                                         processes=1)
+            self.assertEqual(study["replications"], 200)
+            # every task fits on the vessel
+            self.assertAlmostEqual(sum(study["count"]["mean"]), 30)
+            self.assertAlmostEqual(sum(study["workload"]["mean"]), 1000)
+            for histogram in study["workload"]["histogram"]:
+                self.assertEqual(sum(histogram), 200)
+            self.assertEqual(study, analysis.monte_carlo(n=30, b=10, c=200, f=0.5, loc=loc, replications=200,
+                                                         means=means, seed=1, processes=1))
+
+    def test_rules(self):
+        with self.assertRaises(QCSPGenException):
+            analysis.monte_carlo(n=30, b=10, c=200, f=0.5, loc="gauss", replications=10)
+        with self.assertRaises(QCSPGenException):
+            analysis.monte_carlo(n=30, b=10, c=200, f=0.5, loc="uni", replications=0)
+        with self.assertRaises(QCSPGenException):
+            analysis.monte_carlo(n=30, b=10, c=200, f=0.5, loc="uni", replications=10, confidence=1.0)
+        with self.assertRaises(QCSPGenException):
+            analysis.monte_carlo(n=3000, b=10, c=200, f=0.5, loc="uni", replications=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from qcspgen import Instance, bounds
+
+
+def instance(**kwargs):
+    d = dict(n=3, b=10, p=[4, 2, 3], l=[2, 2, 8], Phi=[(1, 3)], Psi=[], q=2, r=[0, 0], l0=[1, 9], t=[1, 1], s=1)
+    d.update(kwargs)
+    return d
+
+
+class BoundsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_lower_bounds(self):
+        self.assertEqual(bounds.lower_bounds(instance()), {"workload": 4.5, "bay": 6, "bay_travel": 7,
+                                                           "critical_path": 8, "lower_bound": 8})
+        # the QCs are available from time 2 and 6 on
+        self.assertEqual(bounds.lower_bounds(instance(r=[2, 6]))["workload"], 8.5)
+
+    def test_invalid_file(self):
+        filename = os.path.join(self.directory, "QCSP.json")
+        with open(filename, "w") as f:
+            json.dump(instance(l=[2, 2, 11]), f)
+        self.assertEqual(list(bounds._file_bounds(filename)[1]), ["error"])
+
+    def test_catalog(self):
+        instances = [Instance.from_parameters(seed=k, n=10, b=10, c=200, f=0.5, d=1.0, g=0.0, loc="uni", q=2, t=1,
+                                              ready_time=0, safety_margin=1) for k in range(3)]
+        with bounds.Catalog(self.directory) as catalog:
+            for k, x in enumerate(instances):
+                x.generate(self.directory, "QCSP_%d.json" % k, style="json", lower_bounds=catalog)
+            self.assertFalse(os.path.exists(os.path.join(self.directory, bounds.CATALOG)))
+        instances[0].generate(self.directory, "QCSP_3.json", style="json", lower_bounds=True)
+        catalog = bounds.read_catalog(self.directory)
+        self.assertEqual(sorted(catalog), ["QCSP_%d.json" % k for k in range(4)])
+        self.assertEqual(catalog["QCSP_1.json"], instances[1].lower_bounds())
+        self.assertEqual(bounds.annotate(self.directory, processes=1)[os.path.join(self.directory, "QCSP_2.json")],
+                         catalog["QCSP_2.json"])
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted(["QCSP_%d.json" % k for k in range(4)] +
+                                                                    [bounds.CATALOG]))
+
+
+if __name__ == "__main__":
+    unittest.main()
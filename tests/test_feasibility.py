@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+from qcspgen import feasibility
+
+
+def instance(**kwargs):
+    d = dict(n=2, b=10, p=[1, 1], l=[10, 2], Phi=[], Psi=[], q=2, r=[0, 0], l0=[1, 3], t=[1, 1], s=1)
+    d.update(kwargs)
+    return d
+
+
+def kinds(violations):
+    return sorted(v.kind for v in violations)
+
+
+class FeasibilityTest(unittest.TestCase):
+
+    def test_crossing(self):
+        # QC 1 completes bay 10 at 10, QC 2 can only be back at bay 2 when both moved 10 bays: QC 2 passes bay 12
+        self.assertEqual(kinds(feasibility.check(instance(), [1, 2], [9, 11])), ["interference"])
+        self.assertEqual(feasibility.check(instance(), [1, 2], [9, 20]), [])
+
+    def test_slowest_crane(self):
+        # the QCs move apart as fast as the slower one
+        d = instance(t=[1, 2])
+        self.assertEqual(kinds(feasibility.check(d, [1, 2], [18, 30])), ["interference"])
+        self.assertEqual(feasibility.check(d, [1, 2], [18, 39]), [])
+
+    def test_initial_location(self):
+        # QC 2 waits at bay 3 until its ready time 5, so QC 1 cannot pass it before
+        d = instance(n=1, p=[1], l=[10], r=[0, 5])
+        self.assertEqual(kinds(feasibility.check(d, [1], [9])), ["interference"])
+        self.assertEqual(feasibility.check(d, [1], [14]), [])
+
+    def test_chain(self):
+        # QC 2 has no task, but it keeps QC 1 and QC 3 two safety distances apart
+        d = instance(n=2, p=[1, 1], l=[8, 3], q=3, r=[0, 0, 0], l0=[1, 3, 5], t=[1, 1, 1])
+        self.assertEqual(kinds(feasibility.check(d, [1, 3], [7, 9])), ["interference"])
+        self.assertEqual(feasibility.check(d, [1, 3], [7, 17]), [])
+
+    def test_safety_margin(self):
+        d = instance(l=[4, 5], l0=[1, 6])
+        self.assertEqual(kinds(feasibility.check(d, [1, 2], [3, 3])), ["interference"])
+        self.assertEqual(kinds(feasibility.check(d, [1, 2], [3, 4])), ["interference"])
+        self.assertEqual(feasibility.check(d, [1, 2], [3, 5]), [])
+        self.assertEqual(feasibility.check(instance(l=[4, 6], l0=[1, 6]), [1, 2], [3, 3]), [])
+
+    def test_tasks(self):
+        d = instance(l=[2, 8], Phi=[(1, 2)], Psi=[(1, 2)], l0=[1, 7])
+        self.assertEqual(feasibility.check(d, [1, 2], [1, 2]), [])
+        self.assertEqual(kinds(feasibility.check(d, [1, 2], [1, 1])), ["non_simultaneity", "precedence"])
+        self.assertEqual(kinds(feasibility.check(d, [1, 2], [0, 2])), ["ready_time"])
+        self.assertEqual(kinds(feasibility.check(d, [1, 2], [1, 2], [1.5, 3])), ["processing_time"])
+        self.assertEqual(kinds(feasibility.check(d, [1, 3], [1, 2])), ["assignment"])
+
+    def test_efficiency(self):
+        d = instance(l=[2, 8], l0=[1, 7], e=[1, 3], p=[1, 1])
+        self.assertEqual(feasibility.check(d, [1, 2], [1, 1], [2, 1 + 1.0 / 3]), [])
+        self.assertEqual(feasibility.check(d, [1, 2], [1, 1]), [])
+
+    def test_travel(self):
+        d = instance(l=[2, 8], l0=[1, 9])
+        self.assertEqual(kinds(feasibility.check(d, [1, 1], [1, 5])), ["travel"])
+        self.assertEqual(feasibility.check(d, [1, 1], [1, 8]), [])
+
+    def test_reach(self):
+        # on the quay -1..12, QC 2 cannot serve bay 1 and QC 1 cannot serve bay 10 with 3 QCs and s=4
+        d = instance(l=[1, 10], q=3, r=[0, 0, 0], l0=[1, 6, 11], t=[1, 1, 1], s=4)
+        self.assertEqual(kinds(feasibility.check(d, [2, 3], [10, 1])), ["reach"])
+        self.assertEqual(feasibility.check(d, [1, 3], [0, 2]), [])
+
+    def test_zero_processing_time(self):
+        # the QC still has to visit the bay
+        d = instance(p=[0, 1])
+        self.assertEqual(kinds(feasibility.check(d, [1, 2], [9, 10])), ["interference"])
+        self.assertEqual(feasibility.check(d, [1, 2], [9, 19]), [])
+
+    def test_sequences(self):
+        self.assertEqual(feasibility.check_sequences(instance(), [[1], [2]], [9, 20]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
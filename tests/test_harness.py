@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from qcspgen import harness, QCSPGenException
+
+
+STUB = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_solver.py")]
+
+
+class HarnessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.results = os.path.join(self.directory, "results.csv")
+        self.corpus = os.path.join(self.directory, "corpus")
+        os.mkdir(self.corpus)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _instance(self, name, p):
+        filename = os.path.join(self.corpus, name)
+        with open(filename, "w") as f:
+            json.dump({"n": len(p), "p": p}, f)
+        return filename
+
+    def test_modes(self):
+        filename = self._instance("a.json", [2, 3, 4])
+        for command in (STUB, STUB + [harness.PLACEHOLDER], " ".join(STUB)):
+            row = harness.run_solver(command, filename)
+            self.assertEqual(row["status"], "ok")
+            self.assertEqual(row["exit_code"], 0)
+            # the last match counts
+            self.assertEqual(row["objective"], 9.0)
+
+    def test_failed_and_error(self):
+        row = harness.run_solver(STUB, self._instance("a.json", [1, 3]))
+        self.assertEqual((row["status"], row["exit_code"], row["objective"]), ("failed", 3, 4.0))
+        row = harness.run_solver(["qcspgen-no-such-solver"], self._instance("b.json", [2]))
+        self.assertEqual((row["status"], row["exit_code"]), ("error", None))
+
+    def test_timeout(self):
+        row = harness.run_solver(STUB, self._instance("a.json", [0, 3]), timeout=0.5)
+        self.assertEqual(row["status"], "timeout")
+        self.assertIsNone(row["objective"])
+        self.assertLess(row["wall_time"], 30)
+
+    def test_resume(self):
+        for k in range(4):
+            self._instance("%d.json" % k, [2, k])
+        rows = harness.run_corpus(STUB, self.corpus, results=self.results, processes=2)
+        self.assertEqual(sorted(row["objective"] for row in rows.values()), [2.0, 3.0, 4.0, 5.0])
+
+        # a new instance and a removed row are run, the others are skipped
+        self._instance("4.json", [2, 4])
+        with open(self.results) as f:
+            lines = f.readlines()
+        with open(self.results, "w") as f:
+            f.writelines(line for line in lines if not line.startswith(os.path.join(self.corpus, "0.json")))
+        with open(self.results) as f:
+            kept = f.read()
+        rows = harness.run_corpus(STUB, self.corpus, results=self.results, processes=2)
+        with open(self.results) as f:
+            text = f.read()
+        self.assertTrue(text.startswith(kept))
+        self.assertEqual(len(text.splitlines()), 6)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(harness.read_results(self.results), rows)
+
+    def test_missing_path(self):
+        self.assertRaises(QCSPGenException, harness.run_corpus, STUB, os.path.join(self.directory, "missing"),
+                          results=self.results)
+        self.assertFalse(os.path.exists(self.results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from qcspgen import Instance, bounds, feasibility, heuristic
+
+
+class HeuristicTest(unittest.TestCase):
+
+    def test_feasible_schedules(self):
+        for seed in range(20):
+            instance = Instance.from_parameters(seed=seed, n=20, b=10, c=200, f=0.5, d=1.0, g=0.0,
+                                                loc="cl2" if seed % 2 else "uni", q=2 + seed % 3, t=1,
+                                                ready_time=[0, 3, 5, 1][:2 + seed % 3], safety_margin=1)
+            solution = heuristic.solve(instance)
+            self.assertEqual(feasibility.check(instance, solution["crane"], solution["start"],
+                                               solution["completion"]), [])
+            self.assertEqual(feasibility.check_sequences(instance, solution["sequences"], solution["start"]), [])
+            self.assertEqual(solution["makespan"], max(solution["completion"]))
+            self.assertGreaterEqual(solution["makespan"], bounds.lower_bounds(instance)["lower_bound"])
+
+    def test_invalid_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, "QCSP.json")
+            with open(filename, "w") as f:
+                json.dump(dict(n=1, b=10, p=[1], l=[11], Phi=[], Psi=[], q=1, r=[0], l0=[1], t=[1], s=1), f)
+            self.assertEqual(heuristic.solve_file(filename), (filename, None))
+            self.assertEqual(os.listdir(directory), ["QCSP.json"])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
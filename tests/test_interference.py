@@ -0,0 +1,50 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+from qcspgen import Instance, heuristic, interference, reader
+
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "benchmarks")
+
+
+def corpus():
+    return [reader.read(f) for f in reader.find(BENCHMARKS)]
+
+
+class ReachabilityTest(unittest.TestCase):
+
+    def test_quay_extent(self):
+        self.assertEqual(interference.quay_extent(15), (-2, 18))
+        self.assertEqual(interference.quay_extent(15, [2, 6, 14, 21]), (-2, 21))
+
+    def test_cranes_outside_the_vessel(self):
+        # QCSP_Set_G_31, whose last QC starts beyond the vessel
+        self.assertEqual(interference.crane_ranges(15, 4, 3, [2, 6, 14, 21]), [(1, 9), (2, 13), (6, 15), (10, 15)])
+        eligible = interference.eligible_cranes(range(1, 16), 15, 4, 3, [2, 6, 14, 21])
+        self.assertEqual(eligible[3], (1, 2))
+        self.assertEqual(eligible[7], (1, 3))
+        self.assertEqual(eligible[11], (2, 4))
+
+    def test_instance(self):
+        instance = Instance.from_parameters(seed=3, n=20, b=10, c=200, f=0.5, d=1.0, g=0.0, loc="uni", q=3, t=1,
+                                            ready_time=0, safety_margin=1)
+        d = instance.data()
+        self.assertEqual(instance.reachability()["eligible"],
+                         interference.eligible_cranes(d["l"], d["b"], d["q"], d["s"], d["l0"]))
+
+    def test_corpus_is_reachable(self):
+        for d in corpus():
+            for first, last in interference.eligible_cranes(d["l"], d["b"], d["q"], d["s"], d["l0"]):
+                self.assertLessEqual(first, last)
+
+    def test_heuristic_stays_in_range(self):
+        for d in corpus():
+            eligible = interference.eligible_cranes(d["l"], d["b"], d["q"], d["s"], d["l0"])
+            for (first, last), k in zip(eligible, heuristic.solve(d)["crane"]):
+                self.assertTrue(first <= k <= last)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import threading
+import unittest
+from qcspgen import Instance, sampling
+
+
+GRID = [
+    {"n": [10, 25], "b": 10, "c": 200, "f": 0.5, "d": [0.8, 1.0], "g": 0.2, "loc": ["uni", "cl1", "cl2"], "q": [2, 3],
+     "t": 1, "ready_time": 0, "safety_margin": 1},
+    {"n": 30, "b": 15, "c": 400, "f": 0.4, "d": 1.0, "g": 0.1, "loc": "uni", "q": 2, "t": (1, 2),
+     "ready_time": (0, 5), "safety_margin": 2},
+    {"n": 20, "b": 12, "c": 300, "f": 0.5, "d": 1.0, "g": 0.0, "loc": "reentrancy_profile", "q": 3, "t": 1,
+     "ready_time": 0, "safety_margin": 1},
+]
+SEEDS = range(1, 6)
+
+
+class ReentrancyTest(unittest.TestCase):
+    """
+    stress test that instance generation is reentrant: every (parameter set, seed) instance of a grid is built once in
+    this thread and then again by each of `THREADS` concurrent threads. Every instance has its own random number
+    generator and QC indices are local to a quay, so the outputs must be identical.
+    """
+
+    THREADS = 8
+
+    def setUp(self):
+        # the pattern registry is process-wide, patterns are registered before the threads start
+        sampling.register_distribution("reentrancy_profile", [5, 1, 1, 3, 1, 1, 4])
+
+    def tearDown(self):
+        sampling.unregister_distribution("reentrancy_profile")
+
+    def test_threads(self):
+        jobs = [(params, seed) for params, seed, _ in Instance.iter_generate(GRID, SEEDS)]
+        expected = [text for _, _, text in Instance.iter_generate(GRID, SEEDS, style="json")]
+        results = [[None] * len(jobs) for _ in range(self.THREADS)]
+        start = threading.Event()
+
+        def run(k):
+            start.wait()
+            # each thread works through all the jobs, starting at a different offset
+            for x in range(len(jobs)):
+                y = (x + k * len(jobs) // self.THREADS) % len(jobs)
+                params, seed = jobs[y]
+                results[k][y] = Instance.from_parameters(seed=seed, **params).dumps("json")
+
+        threads = [threading.Thread(target=run, args=(k,)) for k in range(self.THREADS)]
+        for t in threads:
+            t.start()
+        start.set()
+        for t in threads:
+            t.join()
+        for k in range(self.THREADS):
+            self.assertEqual(results[k], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
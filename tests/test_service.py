@@ -0,0 +1,60 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from qcspgen import service
+
+
+PARAMS = {"n": 10, "b": 10, "c": 200, "f": 0.5, "d": 1.0, "g": 0.0, "loc": "uni", "q": 2, "t": 1, "ready_time": 0,
+          "safety_margin": 1, "seed": 1}
+
+
+class ServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.service = service.InstanceService(port=0, cache_dir=self.directory, workers=1, timeout=30)
+
+    def tearDown(self):
+        # serve_forever() closes the server and the pool when it is stopped
+        thread = threading.Thread(target=self.service.serve_forever)
+        thread.start()
+        self.service.shutdown()
+        thread.join()
+        shutil.rmtree(self.directory)
+
+    def test_instance(self):
+        status, _, text = self.service.handle("/instance", dict(PARAMS))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(text)["n"], 10)
+        # the same instance by value, served from the cache
+        self.assertEqual(self.service.handle("/instance", dict(PARAMS, seed=1.0, t=1.0)), (status, _, text))
+        self.assertEqual(self.service.metrics()["hits"], 1)
+
+    def test_invalid(self):
+        # more tasks than the handling volume f*b*c, which the vessel would try to cut forever
+        self.assertEqual(self.service.handle("/instance", dict(PARAMS, n=2000, c=200))[0], 400)
+        self.assertEqual(self.service.handle("/instance", dict(PARAMS, q=0))[0], 400)
+        self.assertEqual(self.service.handle("/benchmark/A/1000", {})[0], 404)
+        self.assertEqual(self.service.metrics()["in_flight"], 0)
+
+    def test_failed_write(self):
+        cache = service.DiskCache(os.path.join(self.directory, "other"))
+        cache.put("key", "text")
+        self.assertEqual(cache.get("key"), "text")
+        # a directory in place of the cache file makes the rename fail
+        filename = os.path.join(cache.directory, os.listdir(cache.directory)[0])
+        os.remove(filename)
+        os.makedirs(os.path.join(filename, "x"))
+        with self.assertRaises(OSError):
+            cache.put("key", "other text")
+        self.assertEqual(os.listdir(cache.directory), [os.path.basename(filename)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+from qcspgen import QCSPGenException, TaskPool, Vessel
+
+
+class TaskPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = TaskPool.from_tasks(Vessel(b=10, c=200, f=0.5, d=1.0, g=0.0, n=30, loc="uni").tasks)
+
+    def test_shared_pool(self):
+        vessels = [Vessel(task_pool=self.pool, b=10, c=200, f=0.5, d=1.0, g=0.0, loc=loc) for loc in ("cl1", "cl2")]
+        for v in vessels:
+            self.assertEqual(v.task_size, self.pool.size)
+            self.assertEqual(sorted(t.processing_time for t in v.tasks), sorted(self.pool.processing_times))
+            self.assertEqual(sorted(t.index for t in v.tasks), list(range(1, self.pool.size + 1)))
+            # the views keep their state in the arrays of the vessel, not in the objects
+            self.assertFalse(hasattr(v.tasks[0], "__dict__"))
+            self.assertEqual(sorted(v.task_locations), sorted(t.location for t in v.tasks))
+        with self.assertRaises(QCSPGenException):
+            vessels[0].tasks[0].processing_time = 1
+
+    def test_pool_and_tasks(self):
+        tasks = Vessel(b=10, c=200, f=0.5, d=1.0, g=0.0, n=30, loc="uni").tasks
+        with self.assertRaises(QCSPGenException):
+            Vessel(task_pool=self.pool, existing_tasks=tasks, b=10, c=200, f=0.5, d=1.0, g=0.0, loc="uni")
+
+
+if __name__ == "__main__":
+    unittest.main()
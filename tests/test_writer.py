@@ -0,0 +1,43 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from qcspgen import QCSPGenException
+from qcspgen.writer import AsyncWriter
+
+
+class WriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        with AsyncWriter(max_pending=2, threads=2) as w:
+            for k in range(10):
+                w.submit(os.path.join(self.directory, "%d.json" % k), "instance %d" % k)
+        self.assertEqual(w.statistics["files"], 10)
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted("%d.json" % k for k in range(10)))
+        with open(os.path.join(self.directory, "3.json")) as f:
+            self.assertEqual(f.read(), "instance 3")
+
+    def test_failed_rename(self):
+        # a directory in place of the output file makes the rename fail
+        os.makedirs(os.path.join(self.directory, "a.json", "x"))
+        w = AsyncWriter()
+        w.submit(os.path.join(self.directory, "a.json"), "instance")
+        with self.assertRaises(QCSPGenException):
+            w.close()
+        self.assertEqual(os.listdir(self.directory), ["a.json"])
+
+    def test_error_in_with_block(self):
+        os.makedirs(os.path.join(self.directory, "a.json", "x"))
+        with self.assertRaises(KeyError):
+            with AsyncWriter() as w:
+                w.submit(os.path.join(self.directory, "a.json"), "instance")
+                raise KeyError("generation failed")